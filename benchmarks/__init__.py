@@ -0,0 +1 @@
+"""Performance benchmarks for WB_Anki."""
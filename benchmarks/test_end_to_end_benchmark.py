@@ -0,0 +1,189 @@
+"""End-to-end benchmarks against the fake AnkiConnect server.
+
+Run with ``make bench`` or ``pytest benchmarks``. Input sizes can be changed with the
+WB_ANKI_BENCH_PAIRS environment variable, e.g. ``WB_ANKI_BENCH_PAIRS=1000,10000``.
+"""
+
+import asyncio
+import itertools
+import os
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from wb_anki.anki_client import AnkiConnectClient
+from wb_anki.async_client import AsyncAnkiConnectClient
+from wb_anki.cli import main, process_word_pairs, process_word_pairs_async
+from wb_anki.config import Config
+from wb_anki.fake_anki import FakeAnkiConnect
+from wb_anki.proxy import ProxyServer, RequestCoalescer
+from wb_anki.results import ResultStore
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [int(size) for size in os.getenv("WB_ANKI_BENCH_PAIRS", "1000,10000,100000").split(",")]
+deck_numbers = itertools.count()
+
+
+def word_pairs(count: int, prefix: str = "word") -> list:
+    """Generate unique word pairs."""
+    return [(f"{prefix} {i}", f"ord {i}") for i in range(count)]
+
+
+def fresh_deck() -> str:
+    """Get a deck name not used by any previous round."""
+    return f"Bench {next(deck_numbers)}"
+
+
+def fresh_round(size: int) -> tuple:
+    """Set up a round with a fresh deck and fronts no previous round added.
+
+    Anki rejects a front already in the collection whatever its deck, so every round needs
+    its own fronts to add all of its pairs.
+    """
+    deck_name = fresh_deck()
+    return (deck_name, word_pairs(size, deck_name)), {}
+
+
+def allocated_bytes(build) -> int:
+    """Measure the memory still allocated by the object ``build`` returns."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return allocated
+
+
+def record_run(benchmark, anki: FakeAnkiConnect, pairs: int, rounds: int) -> None:
+    """Attach pairs/sec and per-run request counts to the benchmark report."""
+    benchmark.extra_info["pairs"] = pairs
+    benchmark.extra_info["pairs_per_sec"] = round(pairs / benchmark.stats.stats.mean)
+    benchmark.extra_info["requests_per_run"] = {
+        action: count // rounds for action, count in sorted(anki.request_counts.items())
+    }
+
+
+@pytest.fixture
+def anki():
+    with FakeAnkiConnect() as server:
+        yield server
+
+
+@pytest.mark.benchmark(group="process_word_pairs")
+@pytest.mark.parametrize("size", SIZES)
+def test_process_word_pairs(benchmark, anki, size):
+    """Process unique pairs with the synchronous client."""
+
+    def run(deck_name: str, pairs: list):
+        with AnkiConnectClient(anki.url) as client:
+            client.create_deck(deck_name)
+            return process_word_pairs(client, pairs, deck_name)
+
+    stats, _ = benchmark.pedantic(run, setup=lambda: fresh_round(size), rounds=3, iterations=1)
+
+    assert stats["added"] == size
+    record_run(benchmark, anki, size, rounds=3)
+
+
+@pytest.mark.benchmark(group="latency")
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_process_word_pairs_with_latency(benchmark, concurrency):
+    """Process pairs against a server with 5 ms latency, serially and concurrently."""
+    size = min(SIZES)
+
+    async def run_async(anki_url: str, deck_name: str, pairs: list) -> tuple:
+        async with AsyncAnkiConnectClient(anki_url, concurrency) as client:
+            return await process_word_pairs_async(client, pairs, deck_name, batch_size=50)
+
+    with FakeAnkiConnect(latency=0.005, jitter=0.001, seed=1) as anki:
+
+        def run(deck_name: str, pairs: list):
+            with AnkiConnectClient(anki.url) as client:
+                client.create_deck(deck_name)
+                if concurrency == 1:
+                    return process_word_pairs(client, pairs, deck_name, batch_size=50)
+            return asyncio.run(run_async(anki.url, deck_name, pairs))
+
+        stats, _ = benchmark.pedantic(run, setup=lambda: fresh_round(size), rounds=3, iterations=1)
+
+    assert stats["added"] == size
+    record_run(benchmark, anki, size, rounds=3)
+
+
+@pytest.mark.benchmark(group="cli")
+def test_cli_main(benchmark, anki, tmp_path):
+    """Run the whole CLI on an input file."""
+    size = min(SIZES)
+    path = tmp_path / "words.txt"
+
+    def setup() -> tuple:
+        (deck_name, pairs), _ = fresh_round(size)
+        path.write_text("".join(f"{front} - {back}\n" for front, back in pairs), encoding="utf-8")
+        return (deck_name,), {}
+
+    def run(deck_name: str):
+        return CliRunner().invoke(main, ["--deck-name", deck_name, "--file", str(path), "--anki-url", anki.url])
+
+    with patch.object(Config, "CACHE_DIR", str(tmp_path / "cache")):
+        result = benchmark.pedantic(run, setup=setup, rounds=3, iterations=1)
+
+    assert result.exit_code == 0, result.output
+    record_run(benchmark, anki, size, rounds=3)
+
+
+@pytest.mark.benchmark(group="memory")
+@pytest.mark.parametrize("size", SIZES)
+def test_result_memory_per_pair(benchmark, size):
+    """Record the results of unique pairs, reporting the bytes each pair costs on top of its strings."""
+    pairs = word_pairs(size)
+
+    def build():
+        return ResultStore((front, back, "added") for front, back in pairs)
+
+    results = benchmark.pedantic(build, rounds=3, iterations=1)
+
+    assert len(results) == size
+    benchmark.extra_info["pairs"] = size
+    benchmark.extra_info["bytes_per_pair"] = round(allocated_bytes(build) / size, 1)
+    benchmark.extra_info["tuple_list_bytes_per_pair"] = round(
+        allocated_bytes(lambda: [(front, back, "added") for front, back in pairs]) / size, 1
+    )
+
+
+@pytest.mark.benchmark(group="proxy")
+@pytest.mark.parametrize("via_proxy", [False, True], ids=["direct", "proxy"])
+@pytest.mark.parametrize("producers", [1, 8])
+def test_concurrent_producers(benchmark, producers, via_proxy):
+    """Add single notes from several producers to a server handling one request per 5 ms, directly or through serve."""
+    notes_per_producer = 25
+
+    with FakeAnkiConnect(latency=0.001, service_time=0.005, seed=1) as anki, AnkiConnectClient(anki.url) as upstream:
+        proxy = ProxyServer(RequestCoalescer(upstream), port=0)
+        threading.Thread(target=proxy.serve_forever, daemon=True).start()
+        url = proxy.url if via_proxy else anki.url
+
+        def produce(deck_name: str, worker: int) -> int:
+            with AnkiConnectClient(url) as client:
+                fronts = (f"{deck_name} word {worker} {i}" for i in range(notes_per_producer))
+                return sum(client.add_note(deck_name, front, "ord") for front in fronts)
+
+        def run():
+            deck_name = fresh_deck()
+            anki.seed(deck_name, [])
+            with ThreadPoolExecutor(max_workers=producers) as pool:
+                return sum(pool.map(lambda worker: produce(deck_name, worker), range(producers)))
+
+        added = benchmark.pedantic(run, rounds=3, iterations=1)
+        proxy.shutdown()
+        proxy.close()
+
+    assert added == producers * notes_per_producer
+    record_run(benchmark, anki, added, rounds=3)
@@ -0,0 +1,111 @@
+"""Benchmarks for the word parser module.
+
+Run with ``make bench`` or ``pytest benchmarks``. The input size can be changed
+with the WB_ANKI_BENCH_LINES environment variable.
+"""
+
+import os
+import random
+
+import pytest
+
+from wb_anki.parser import ParseSummary, iter_input, iter_table_rows, iter_word_pairs
+
+pytest.importorskip("pytest_benchmark")
+
+LINES = int(os.getenv("WB_ANKI_BENCH_LINES", "1000000"))
+DELIMITERS = [" - ", " -- ", " – ", " — ", "\t"]
+
+
+def synthetic_lines(count: int, invalid_ratio: float = 0.0) -> list:
+    """Generate word pair lines with mixed delimiters and some invalid lines."""
+    rng = random.Random(42)
+    lines = []
+    for i in range(count):
+        if rng.random() < invalid_ratio:
+            lines.append(f"invalid line {i}\n")
+        else:
+            lines.append(f"word number {i}{rng.choice(DELIMITERS)}översättning {i}\n")
+    return lines
+
+
+def synthetic_table(count: int, delimiter: str, tagged: bool) -> list:
+    """Generate TSV or CSV rows under a header, with quoted backs and optionally tags."""
+    header = delimiter.join(["word", "translation", "tags"] if tagged else ["word", "translation"])
+    lines = [f"{header}\n"]
+    for i in range(count):
+        row = f'word number {i}{delimiter}"översättning{delimiter} {i}"'
+        lines.append(f"{row}{delimiter}tag{i % 10}\n" if tagged else f"{row}\n")
+    return lines
+
+
+def record_throughput(benchmark, lines: int) -> None:
+    """Attach a lines/sec figure to the benchmark report."""
+    benchmark.extra_info["lines"] = lines
+    benchmark.extra_info["lines_per_sec"] = round(lines / benchmark.stats.stats.mean)
+
+
+@pytest.fixture(scope="module")
+def clean_lines():
+    return synthetic_lines(LINES)
+
+
+@pytest.fixture(scope="module")
+def dirty_lines():
+    return synthetic_lines(LINES, invalid_ratio=0.1)
+
+
+@pytest.fixture(scope="module")
+def input_file(tmp_path_factory, clean_lines):
+    path = tmp_path_factory.mktemp("bench") / "words.txt"
+    path.write_text("".join(clean_lines), encoding="utf-8")
+    return str(path)
+
+
+def consume(lines) -> int:
+    """Parse all lines and return the number of pairs."""
+    return sum(1 for _ in iter_word_pairs(lines, ParseSummary()))
+
+
+@pytest.mark.benchmark(group="parse")
+def test_parse_mixed_delimiters(benchmark, clean_lines):
+    """Parse clean input with mixed delimiters."""
+    pairs = benchmark.pedantic(consume, args=(clean_lines,), rounds=3, iterations=1)
+
+    assert pairs == LINES
+    record_throughput(benchmark, LINES)
+
+
+@pytest.mark.benchmark(group="parse")
+def test_parse_dirty_input(benchmark, dirty_lines):
+    """Parse input where one line in ten is invalid."""
+    pairs = benchmark.pedantic(consume, args=(dirty_lines,), rounds=3, iterations=1)
+
+    assert 0 < pairs < LINES
+    record_throughput(benchmark, LINES)
+
+
+@pytest.mark.benchmark(group="read")
+@pytest.mark.parametrize("use_mmap", [False, True], ids=["buffered", "mmap"])
+def test_read_and_parse_file(benchmark, input_file, use_mmap):
+    """Read and parse a file with buffered reads or a memory map."""
+    pairs = benchmark.pedantic(lambda: consume(iter_input(input_file, use_mmap)), rounds=3, iterations=1)
+
+    assert pairs == LINES
+    record_throughput(benchmark, LINES)
+
+
+@pytest.mark.benchmark(group="table")
+@pytest.mark.parametrize("input_format", ["tsv", "csv"])
+@pytest.mark.parametrize("tagged", [False, True], ids=["pairs", "tagged"])
+def test_parse_table(benchmark, input_format, tagged):
+    """Parse TSV or CSV rows with quoted fields, with and without a tags column."""
+    lines = synthetic_table(LINES, "\t" if input_format == "tsv" else ",", tagged)
+
+    def consume_rows() -> int:
+        return sum(1 for _ in iter_table_rows(lines, input_format, ParseSummary()))
+
+    rows = benchmark.pedantic(consume_rows, rounds=3, iterations=1)
+
+    assert rows == LINES
+    record_throughput(benchmark, LINES)
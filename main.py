@@ -6,7 +6,7 @@ Main entry point for the WB_Anki application.
 
 import sys
 
-from wb_anki.cli import main
+from wb_anki.cli import cli
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(cli())
@@ -0,0 +1,11 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from wb_anki.scheduler import RetryPolicy
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Retry transient failures without sleeping between attempts."""
+    monkeypatch.setattr(RetryPolicy, "delay", lambda self, attempt: 0.0)
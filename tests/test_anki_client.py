@@ -5,7 +5,8 @@ from unittest.mock import Mock, patch
 import httpx
 import pytest
 
-from wb_anki.anki_client import AnkiConnectClient
+from wb_anki.anki_client import AnkiConnectClient, AnkiConnectError, AnkiTransientError, DeckRegistry, RequestBatch
+from wb_anki.fake_anki import FakeAnkiConnect
 
 
 class TestAnkiConnectClient:
@@ -118,7 +119,7 @@ class TestAnkiConnectClient:
     def test_deck_exists_true(self, mock_client_class):
         """Test deck exists returns True when deck is found."""
         mock_response = Mock()
-        mock_response.json.return_value = {"result": ["Default", "Swedish"], "error": None}
+        mock_response.json.return_value = {"result": {"Default": 1, "Swedish": 2}, "error": None}
         mock_response.raise_for_status.return_value = None
 
         mock_client = Mock()
@@ -134,7 +135,7 @@ class TestAnkiConnectClient:
     def test_deck_exists_false(self, mock_client_class):
         """Test deck exists returns False when deck is not found."""
         mock_response = Mock()
-        mock_response.json.return_value = {"result": ["Default"], "error": None}
+        mock_response.json.return_value = {"result": {"Default": 1}, "error": None}
         mock_response.raise_for_status.return_value = None
 
         mock_client = Mock()
@@ -177,3 +178,329 @@ class TestAnkiConnectClient:
             result = client.card_exists("Swedish", "hello")
 
         assert result is False
+
+    @patch("httpx.Client")
+    def test_get_existing_fronts(self, mock_client_class):
+        """Test fetching normalized fronts with paged notesInfo requests."""
+        find_response = Mock()
+        find_response.json.return_value = {"result": [1, 2, 3], "error": None}
+        first_page = Mock()
+        first_page.json.return_value = {
+            "result": [{"fields": {"Front": {"value": "Hello"}}}, {"fields": {"Front": {"value": " good  bye "}}}],
+            "error": None,
+        }
+        second_page = Mock()
+        second_page.json.return_value = {"result": [{"fields": {"Back": {"value": "hej"}}}], "error": None}
+
+        mock_client = Mock()
+        mock_client.post.side_effect = [find_response, first_page, second_page]
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            result = client.get_existing_fronts("Swedish", chunk_size=2)
+
+        assert result == {"hello", "good bye"}
+        payloads = [call.kwargs["json"] for call in mock_client.post.call_args_list]
+        assert payloads[0]["params"] == {"query": 'deck:"Swedish"'}
+        assert payloads[1]["params"] == {"notes": [1, 2]}
+        assert payloads[2]["params"] == {"notes": [3]}
+
+    @patch("httpx.Client")
+    def test_get_existing_fronts_empty_deck(self, mock_client_class):
+        """Test that an empty deck needs only the findNotes request."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"result": [], "error": None}
+
+        mock_client = Mock()
+        mock_client.post.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            result = client.get_existing_fronts("Swedish")
+
+        assert result == set()
+        mock_client.post.assert_called_once()
+
+    @patch("httpx.Client")
+    def test_add_notes_maps_results_to_pairs(self, mock_client_class):
+        """Test that addNotes results are mapped back to the original pairs."""
+        can_add_response = Mock()
+        can_add_response.json.return_value = {"result": [True, False, True], "error": None}
+        add_response = Mock()
+        add_response.json.return_value = {"result": [111, None], "error": None}
+
+        mock_client = Mock()
+        mock_client.post.side_effect = [can_add_response, add_response]
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            result = client.add_notes("Swedish", [("a", "1"), ("b", "2"), ("c", "3")], chunk_size=10)
+
+        assert result == [True, False, False]
+        add_payload = mock_client.post.call_args_list[1].kwargs["json"]
+        assert add_payload["action"] == "addNotes"
+        assert [note["fields"]["Front"] for note in add_payload["params"]["notes"]] == ["a", "c"]
+
+    @patch("httpx.Client")
+    def test_add_notes_with_extras(self, mock_client_class):
+        """Test that the extra fields and tags registered for a front are added to its note."""
+        response = Mock()
+        response.json.side_effect = [{"result": [True, True], "error": None}, {"result": [1, 2], "error": None}]
+        mock_client = Mock()
+        mock_client.post.return_value = response
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            client.note_extras["run"] = ({"Example": "Jag springer", "Front": "ignored"}, ["verb"])
+            client.add_notes("Swedish", [("run", "springa"), ("hello", "hej")])
+
+        run, hello = mock_client.post.call_args_list[1].kwargs["json"]["params"]["notes"]
+        assert run["fields"] == {"Example": "Jag springer", "Front": "run", "Back": "springa"}
+        assert run["tags"] == ["wb_anki", "verb"]
+        assert hello["fields"] == {"Front": "hello", "Back": "hej"} and hello["tags"] == ["wb_anki"]
+
+    @patch("httpx.Client")
+    def test_add_notes_chunks(self, mock_client_class):
+        """Test that notes are submitted in chunks of the requested size."""
+        can_add_response = Mock()
+        can_add_response.json.side_effect = [{"result": [True, True], "error": None}, {"result": [True], "error": None}]
+        add_response = Mock()
+        add_response.json.side_effect = [{"result": [1, 2], "error": None}, {"result": [3], "error": None}]
+
+        mock_client = Mock()
+        mock_client.post.side_effect = [can_add_response, add_response, can_add_response, add_response]
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            result = client.add_notes("Swedish", [("a", "1"), ("b", "2"), ("c", "3")], chunk_size=2)
+
+        assert result == [True, True, True]
+        assert mock_client.post.call_count == 4
+
+    @patch("httpx.Client")
+    def test_add_notes_request_error(self, mock_client_class):
+        """Test that a failed chunk is reported as not added."""
+        mock_client = Mock()
+        mock_client.post.side_effect = httpx.RequestError("Connection failed")
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            result = client.add_notes("Swedish", [("a", "1"), ("b", "2")])
+
+        assert result == [False, False]
+
+    @patch("httpx.Client")
+    def test_retries_idempotent_action(self, mock_client_class):
+        """Test that idempotent actions are retried after transient failures."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"result": ["Default"], "error": None}
+
+        mock_client = Mock()
+        mock_client.post.side_effect = [httpx.ReadTimeout("busy"), mock_response]
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            assert client.get_deck_names() == ["Default"]
+
+        assert mock_client.post.call_count == 2
+
+    @patch("httpx.Client")
+    def test_does_not_retry_api_errors_or_add_note(self, mock_client_class):
+        """Test that API errors and non-idempotent actions are not retried."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"result": None, "error": "collection is not available"}
+
+        mock_client = Mock()
+        mock_client.post.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            with pytest.raises(AnkiConnectError, match="collection is not available"):
+                client.get_deck_names()
+            mock_client.post.side_effect = httpx.ReadTimeout("busy")
+            with pytest.raises(AnkiTransientError):
+                client._make_request("addNote", {"note": {}})
+
+        assert mock_client.post.call_count == 2
+
+    @patch("httpx.Client")
+    def test_add_notes_recovers_from_timeout(self, mock_client_class):
+        """Test that notes added by a timed-out addNotes are not submitted again."""
+        can_add_response = Mock()
+        can_add_response.json.side_effect = [
+            {"result": [True, True], "error": None},
+            {"result": [False, True], "error": None},
+        ]
+        add_response = Mock()
+        add_response.json.return_value = {"result": [2], "error": None}
+
+        mock_client = Mock()
+        mock_client.post.side_effect = [can_add_response, httpx.ReadTimeout("busy"), can_add_response, add_response]
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            result = client.add_notes("Swedish", [("a", "1"), ("b", "2")])
+
+        assert result == [True, True]
+        retry_payload = mock_client.post.call_args_list[3].kwargs["json"]
+        assert [note["fields"]["Front"] for note in retry_payload["params"]["notes"]] == ["b"]
+
+    @patch("httpx.Client")
+    def test_batch_sends_single_multi_request(self, mock_client_class):
+        """Test that queued actions are flushed as one multi request."""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "result": [{"result": ["Default"], "error": None}, {"result": [1, 2], "error": None}],
+            "error": None,
+        }
+
+        mock_client = Mock()
+        mock_client.post.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            with client.batch() as batch:
+                decks = batch.add("deckNames")
+                notes = batch.add("findNotes", {"query": 'deck:"Swedish"'})
+
+        mock_client.post.assert_called_once()
+        payload = mock_client.post.call_args.kwargs["json"]
+        assert payload["action"] == "multi"
+        assert payload["params"]["actions"] == [
+            {"action": "deckNames", "version": 6, "params": {}},
+            {"action": "findNotes", "version": 6, "params": {"query": 'deck:"Swedish"'}},
+        ]
+        assert decks.result() == ["Default"]
+        assert notes.result() == [1, 2]
+
+    @patch("httpx.Client")
+    def test_batch_unpacks_per_action_errors(self, mock_client_class):
+        """Test that a failing action does not affect the others in the batch."""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "result": [{"result": None, "error": "deck was not found"}, {"result": 42, "error": None}],
+            "error": None,
+        }
+
+        mock_client = Mock()
+        mock_client.post.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            with client.batch() as batch:
+                failed = batch.add("changeDeck", {"cards": [1], "deck": "Missing"})
+                created = batch.add("createDeck", {"deck": "Swedish"})
+
+        with pytest.raises(Exception, match="deck was not found"):
+            failed.result()
+        assert created.result() == 42
+
+    @patch("httpx.Client")
+    def test_batch_result_before_flush(self, mock_client_class):
+        """Test that reading a result before the batch is flushed raises."""
+        with AnkiConnectClient() as client:
+            batch = RequestBatch(client)
+            pending = batch.add("deckNames")
+
+            with pytest.raises(RuntimeError, match="has not been flushed"):
+                pending.result()
+
+    @patch("httpx.Client")
+    def test_empty_batch_sends_nothing(self, mock_client_class):
+        """Test that an empty batch does not make a request."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+
+        with AnkiConnectClient() as client:
+            with client.batch():
+                pass
+
+        mock_client.post.assert_not_called()
+
+
+class TestDeckRegistry:
+    """Test cases for DeckRegistry class and the client's cached deck lookups."""
+
+    def test_ttl(self):
+        """Test that the registry expires after its TTL."""
+        registry = DeckRegistry(ttl=60)
+        assert registry.is_fresh() is False
+
+        registry.update({"Default": 1})
+        assert registry.is_fresh() is True
+
+        with patch("wb_anki.anki_client.time.monotonic", return_value=registry.fetched_at + 61):
+            assert registry.is_fresh() is False
+
+    def test_nested_deck_with_unknown_parent_invalidates(self):
+        """Test that creating a nested deck under an unknown parent marks the registry stale."""
+        registry = DeckRegistry()
+        registry.update({"Default": 1, "Swedish": 2})
+
+        registry.add("Swedish::Verbs", 3)
+        assert registry.is_fresh() is True
+
+        registry.add("Spanish::Verbs", 4)
+        assert registry.is_fresh() is False
+
+    def test_deck_lookups_are_cached(self):
+        """Test that repeated deck checks and creations reuse one deckNamesAndIds request."""
+        with FakeAnkiConnect() as anki:
+            with AnkiConnectClient(anki.url) as client:
+                assert client.deck_exists("Default") is True
+                assert client.deck_exists("Swedish") is False
+                assert client.create_deck("Swedish") is True
+                assert client.deck_exists("Swedish") is True
+
+        assert anki.request_counts["deckNamesAndIds"] == 1
+
+    def test_create_decks_in_one_request(self):
+        """Test that missing decks are created in a single multi request."""
+        with FakeAnkiConnect() as anki:
+            with AnkiConnectClient(anki.url) as client:
+                client.get_deck_ids()
+                created = client.create_decks(["Default", "Swedish", "Spanish", "Swedish"])
+
+                assert created == {"Default": True, "Swedish": True, "Spanish": True}
+                assert client.deck_exists("Spanish") is True
+
+        assert anki.request_counts["multi"] == 1
+        assert anki.action_counts["createDeck"] == 2
+        assert set(anki.decks) == {"Default", "Swedish", "Spanish"}
+
+
+class TestNoteChanges:
+    """Test cases for reading, updating and deleting existing notes."""
+
+    def test_get_deck_notes(self):
+        """Test that every note of a deck is returned with its normalized fields."""
+        with FakeAnkiConnect() as anki:
+            anki.seed("Swedish", [("hello", "hej  då")])
+            with AnkiConnectClient(anki.url) as client:
+                ((note_id, front, back),) = client.get_deck_notes("Swedish")
+
+        assert note_id in anki.notes
+        assert (front, back) == ("hello", "hej då")
+
+    def test_update_backs_in_one_request(self):
+        """Test that a chunk of updates is sent as a single multi request, failing per note."""
+        with FakeAnkiConnect() as anki:
+            anki.seed("Swedish", [("hello", "hej"), ("thanks", "tack")])
+            note_ids = list(anki.notes)
+            with AnkiConnectClient(anki.url) as client:
+                updated = client.update_backs([(note_ids[0], "hallå"), (-1, "x"), (note_ids[1], "tack så mycket")])
+
+        assert updated == [True, False, True]
+        assert anki.request_counts["multi"] == 1
+        assert [note["fields"]["Back"] for note in anki.notes.values()] == ["hallå", "tack så mycket"]
+
+    def test_delete_notes(self):
+        """Test that notes are deleted with a single request."""
+        with FakeAnkiConnect() as anki:
+            anki.seed("Swedish", [("hello", "hej"), ("thanks", "tack")])
+            with AnkiConnectClient(anki.url) as client:
+                assert client.delete_notes(list(anki.notes)) is True
+                assert client.delete_notes([]) is True
+
+        assert anki.notes == {}
+        assert anki.request_counts["deleteNotes"] == 1
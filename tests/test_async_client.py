@@ -0,0 +1,109 @@
+"""Tests for the asynchronous AnkiConnect client module."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+
+from wb_anki.async_client import AsyncAnkiConnectClient
+
+
+def make_response(result):
+    """Build a mocked AnkiConnect response."""
+    response = Mock()
+    response.json.return_value = {"result": result, "error": None}
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestAsyncAnkiConnectClient:
+    """Test cases for AsyncAnkiConnectClient class."""
+
+    def test_init_custom_url_and_concurrency(self):
+        """Test client initialization with custom URL and concurrency."""
+        with patch("httpx.AsyncClient"):
+            client = AsyncAnkiConnectClient("http://custom:9999", concurrency=4)
+
+        assert client.anki_url == "http://custom:9999"
+        assert client.concurrency == 4
+
+    @patch("httpx.AsyncClient")
+    def test_context_manager_closes_client(self, mock_client_class):
+        """Test async context manager functionality."""
+        mock_client = Mock()
+        mock_client.aclose = AsyncMock()
+        mock_client_class.return_value = mock_client
+
+        async def run():
+            async with AsyncAnkiConnectClient() as client:
+                assert client is not None
+
+        asyncio.run(run())
+        mock_client.aclose.assert_awaited_once()
+
+    @patch("httpx.AsyncClient")
+    def test_make_request_connection_error(self, mock_client_class):
+        """Test API request with connection error."""
+        mock_client = Mock()
+        mock_client.post = AsyncMock(side_effect=httpx.RequestError("Connection failed"))
+        mock_client_class.return_value = mock_client
+
+        client = AsyncAnkiConnectClient()
+        with pytest.raises(Exception, match="Error connecting to Anki"):
+            asyncio.run(client._make_request("deckNames"))
+
+    @patch("httpx.AsyncClient")
+    def test_deck_exists(self, mock_client_class):
+        """Test deck exists returns True when deck is found."""
+        mock_client = Mock()
+        mock_client.post = AsyncMock(return_value=make_response({"Default": 1, "Swedish": 2}))
+        mock_client_class.return_value = mock_client
+
+        client = AsyncAnkiConnectClient()
+        assert asyncio.run(client.deck_exists("Swedish")) is True
+
+    @patch("httpx.AsyncClient")
+    def test_add_notes_keeps_input_order(self, mock_client_class):
+        """Test that concurrently submitted chunks are returned in input order."""
+
+        async def post(url, json):
+            notes = json["params"]["notes"]
+            if json["action"] == "canAddNotes":
+                # Let the first chunk finish last
+                await asyncio.sleep(0.01 if notes[0]["fields"]["Front"] == "a" else 0)
+                return make_response([note["fields"]["Front"] != "b" for note in notes])
+            return make_response([1] * len(notes))
+
+        mock_client = Mock()
+        mock_client.post = AsyncMock(side_effect=post)
+        mock_client_class.return_value = mock_client
+
+        client = AsyncAnkiConnectClient(concurrency=2)
+        result = asyncio.run(client.add_notes("Swedish", [("a", "1"), ("b", "2"), ("c", "3")], chunk_size=2))
+
+        assert result == [True, False, True]
+
+    @patch("httpx.AsyncClient")
+    def test_concurrency_limit(self, mock_client_class):
+        """Test that no more than ``concurrency`` requests are in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def post(url, json):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            return make_response([{"fields": {"Front": {"value": str(json["params"]["notes"][0])}}}])
+
+        mock_client = Mock()
+        mock_client.post = AsyncMock(side_effect=post)
+        mock_client_class.return_value = mock_client
+
+        client = AsyncAnkiConnectClient(concurrency=2)
+        fronts = asyncio.run(client.get_existing_fronts("Swedish", chunk_size=1, note_ids=[1, 2, 3, 4, 5]))
+
+        assert fronts == {"1", "2", "3", "4", "5"}
+        assert peak == 2
@@ -0,0 +1,112 @@
+"""Tests for the deck index cache module."""
+
+import time
+from unittest.mock import Mock, patch
+
+from wb_anki.cache import DeckIndexCache, default_cache_path
+
+
+def make_note(note_id, front, mod=0):
+    """Build a notesInfo entry."""
+    return {"noteId": note_id, "fields": {"Front": {"value": front}, "Back": {"value": "x"}}, "mod": mod}
+
+
+def make_client(notes, edited_ids=()):
+    """Build a mocked client serving the given notes."""
+    client = Mock()
+    client.NOTES_INFO_CHUNK_SIZE = 500
+    by_id = {note["noteId"]: note for note in notes}
+
+    def find_notes(query):
+        return list(edited_ids) if "edited:" in query else list(by_id)
+
+    client.find_notes.side_effect = find_notes
+    client.notes_info.side_effect = lambda ids: [by_id[note_id] for note_id in ids]
+    return client
+
+
+class TestDeckIndexCache:
+    """Test cases for DeckIndexCache class."""
+
+    def test_default_cache_path_uses_xdg(self, tmp_path):
+        """Test that the cache lives under XDG_CACHE_HOME."""
+        with patch.dict("os.environ", {"XDG_CACHE_HOME": str(tmp_path)}):
+            assert default_cache_path() == tmp_path / "wb_anki" / "deck_index.sqlite3"
+
+    def test_first_refresh_walks_deck(self, tmp_path):
+        """Test that the first refresh fetches every note of the deck."""
+        client = make_client([make_note(1, "Hello"), make_note(2, "goodbye")])
+
+        with DeckIndexCache("http://anki", tmp_path / "index.sqlite3") as cache:
+            fronts = cache.refresh(client, "Swedish")
+
+        assert fronts == {"hello", "goodbye"}
+        client.notes_info.assert_called_once_with([1, 2])
+
+    def test_fronts_casefolded_on_read(self, tmp_path):
+        """Test that cached fronts keep their case and are casefolded only when read."""
+        client = make_client([make_note(1, "Hello  World")])
+
+        with DeckIndexCache("http://anki", tmp_path / "index.sqlite3") as cache:
+            cache.refresh(client, "Swedish")
+
+            assert cache.fronts("Swedish") == {"hello world"}
+            assert cache.fronts("Swedish", casefold=False) == {"Hello World"}
+
+    def test_notes_keep_backs(self, tmp_path):
+        """Test that cached notes carry their normalized back."""
+        note = make_note(1, "Hello")
+        note["fields"]["Back"]["value"] = "hej  då"
+
+        with DeckIndexCache("http://anki", tmp_path / "index.sqlite3") as cache:
+            cache.refresh(make_client([note]), "Swedish")
+
+            assert cache.notes("Swedish") == [(1, "Hello", "hej då")]
+
+    def test_incremental_refresh_fetches_only_changes(self, tmp_path):
+        """Test that later refreshes only fetch new and edited notes and drop deleted ones."""
+        path = tmp_path / "index.sqlite3"
+        with DeckIndexCache("http://anki", path) as cache:
+            cache.refresh(make_client([make_note(1, "a"), make_note(2, "b"), make_note(3, "c")]), "D")
+
+        client = make_client([make_note(1, "a"), make_note(2, "b edited"), make_note(4, "d")], edited_ids=[2])
+        with DeckIndexCache("http://anki", path) as cache:
+            fronts = cache.refresh(client, "D")
+
+        assert fronts == {"a", "b edited", "d"}
+        client.notes_info.assert_called_once_with([2, 4])
+
+    def test_refresh_uses_known_note_ids(self, tmp_path):
+        """Test that known note IDs save the full findNotes request."""
+        client = make_client([make_note(1, "a")])
+
+        with DeckIndexCache("http://anki", tmp_path / "index.sqlite3") as cache:
+            cache.refresh(client, "D", note_ids=[1])
+
+        client.find_notes.assert_not_called()
+
+    def test_invalidate_forces_full_walk(self, tmp_path):
+        """Test that an invalidated deck is walked again."""
+        with DeckIndexCache("http://anki", tmp_path / "index.sqlite3") as cache:
+            cache.refresh(make_client([make_note(1, "a")]), "D")
+            cache.invalidate("D")
+
+            assert cache.last_synced("D") is None
+            assert cache.fronts("D") == set()
+
+    def test_indexes_are_separated_per_url(self, tmp_path):
+        """Test that different Anki instances do not share an index."""
+        path = tmp_path / "index.sqlite3"
+        with DeckIndexCache("http://one", path) as cache:
+            cache.refresh(make_client([make_note(1, "a")]), "D")
+
+        with DeckIndexCache("http://two", path) as cache:
+            assert cache.last_synced("D") is None
+
+    def test_last_synced(self, tmp_path):
+        """Test that a refresh records the sync time."""
+        before = time.time()
+        with DeckIndexCache("http://anki", tmp_path / "index.sqlite3") as cache:
+            cache.refresh(make_client([]), "D")
+
+            assert cache.last_synced("D") >= before
@@ -0,0 +1,701 @@
+"""Tests for the CLI module."""
+
+import asyncio
+import json
+import subprocess
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from wb_anki.cli import (
+    WATCH_RETRIES,
+    cli,
+    main,
+    merge_parsed_files,
+    process_word_pairs,
+    process_word_pairs_async,
+)
+from wb_anki.config import Config
+from wb_anki.fake_anki import FakeAnkiConnect, FakeAnkiError
+from wb_anki.journal import ImportJournal
+from wb_anki.parser import ParseSummary
+
+# Modules the CLI must not import before they are needed
+DEFERRED_MODULES = {"httpx", "asyncio", "sqlite3", "dotenv", "multiprocessing", "rich.table", "rich.progress"}
+
+# Upper bound on the time to import the CLI module, in microseconds
+IMPORT_BUDGET_US = 150_000
+
+# Journal options of an import run with the default --casefold, --on-duplicate and --format
+DEFAULT_STREAM_OPTIONS = {"casefold": True, "on_duplicate": "first", "route_decks": False, "format": "pairs"}
+
+
+@pytest.fixture
+def anki(tmp_path):
+    with patch.object(Config, "CACHE_DIR", str(tmp_path / "cache")):
+        with FakeAnkiConnect() as server:
+            yield server
+
+
+class TestProcessWordPairs:
+    """Test cases for process_word_pairs function."""
+
+    def test_existing_fronts_fetched_once(self):
+        """Test that duplicates are detected against a single deck snapshot."""
+        client = Mock()
+        client.get_existing_fronts.return_value = {"hello"}
+        client.add_notes.return_value = [True]
+
+        stats, results = process_word_pairs(client, [("Hello", "hej"), ("goodbye", "hej då")], "Swedish")
+
+        client.get_existing_fronts.assert_called_once_with("Swedish", casefold=True)
+        client.card_exists.assert_not_called()
+        client.add_notes.assert_called_once_with("Swedish", [("goodbye", "hej då")], 100)
+        assert stats == {"added": 1, "exists": 1, "error": 0}
+        assert list(results) == [("Hello", "hej", "exists"), ("goodbye", "hej då", "added")]
+
+    def test_added_fronts_count_as_existing(self):
+        """Test that a front repeated in the input is only added once."""
+        client = Mock()
+        client.get_existing_fronts.return_value = set()
+        client.add_notes.return_value = [True]
+
+        stats, _ = process_word_pairs(client, [("hello", "hej"), ("hello", "hallå")], "Swedish")
+
+        client.add_notes.assert_called_once_with("Swedish", [("hello", "hej")], 100)
+        assert stats == {"added": 1, "exists": 1, "error": 0}
+
+    def test_failed_add_is_error(self):
+        """Test that a failed addNote is reported as an error."""
+        client = Mock()
+        client.get_existing_fronts.return_value = set()
+        client.add_notes.return_value = [False]
+
+        stats, results = process_word_pairs(client, [("hello", "hej")], "Swedish")
+
+        assert stats == {"added": 0, "exists": 0, "error": 1}
+        assert list(results) == [("hello", "hej", "error")]
+
+    def test_only_added_fronts_join_snapshot(self):
+        """Test that a shared snapshot gains the fronts that were added, not those that failed."""
+        client = Mock()
+        client.add_notes.return_value = [True, False]
+        existing_fronts = {"b"}
+
+        process_word_pairs(client, [("a", "1"), ("b", "2"), ("C", "3")], "Swedish", existing_fronts=existing_fronts)
+
+        assert existing_fronts == {"a", "b"}
+
+    def test_batches_keep_input_order(self):
+        """Test that batched results map back to the original pairs."""
+        client = Mock()
+        client.get_existing_fronts.return_value = {"b"}
+        client.add_notes.side_effect = [[True, False], [True]]
+
+        pairs = [("a", "1"), ("b", "2"), ("c", "3"), ("d", "4")]
+        stats, results = process_word_pairs(client, pairs, "Swedish", batch_size=2)
+
+        assert client.add_notes.call_count == 2
+        assert list(results) == [("a", "1", "added"), ("b", "2", "exists"), ("c", "3", "error"), ("d", "4", "added")]
+        assert stats == {"added": 2, "exists": 1, "error": 1}
+
+    def test_batch_exception_marks_chunk_as_error(self):
+        """Test that a failing batch marks all of its pairs as errors."""
+        client = Mock()
+        client.get_existing_fronts.return_value = set()
+        client.add_notes.side_effect = Exception("boom")
+
+        stats, _ = process_word_pairs(client, [("a", "1"), ("b", "2")], "Swedish")
+
+        assert stats == {"added": 0, "exists": 0, "error": 2}
+
+    def test_accepts_lazy_input(self):
+        """Test that pairs can be streamed from a generator."""
+        client = Mock()
+        client.get_existing_fronts.return_value = set()
+        client.add_notes.side_effect = lambda deck_name, pairs, chunk_size: [True] * len(pairs)
+
+        pairs = ((f"word{i}", f"ord{i}") for i in range(25))
+        stats, results = process_word_pairs(client, pairs, "Swedish", batch_size=10)
+
+        assert client.add_notes.call_count == 3
+        assert [front for front, _, _ in results] == [f"word{i}" for i in range(25)]
+        assert stats == {"added": 25, "exists": 0, "error": 0}
+
+    def test_input_errors_propagate(self):
+        """Test that errors raised while reading input reach the caller."""
+
+        def pairs():
+            yield ("hello", "hej")
+            raise OSError("disk gone")
+
+        client = Mock()
+        client.get_existing_fronts.return_value = set()
+        client.add_notes.return_value = [True]
+
+        with pytest.raises(OSError, match="disk gone"):
+            process_word_pairs(client, pairs(), "Swedish")
+
+
+class TestProcessWordPairsAsync:
+    """Test cases for process_word_pairs_async function."""
+
+    def test_results_in_input_order(self):
+        """Test that concurrent batches are reported in input order."""
+
+        async def add_notes(deck_name, pairs, chunk_size):
+            # Let the first batch finish last
+            await asyncio.sleep(0.01 if pairs[0][0] == "a" else 0)
+            return [front != "c" for front, _ in pairs]
+
+        client = Mock(concurrency=2)
+        client.get_existing_fronts = AsyncMock(return_value={"b"})
+        client.add_notes = AsyncMock(side_effect=add_notes)
+
+        pairs = [("a", "1"), ("b", "2"), ("c", "3"), ("d", "4"), ("e", "5")]
+        stats, results = asyncio.run(process_word_pairs_async(client, pairs, "Swedish", batch_size=2))
+
+        assert client.add_notes.await_count == 2
+        assert list(results) == [
+            ("a", "1", "added"),
+            ("b", "2", "exists"),
+            ("c", "3", "error"),
+            ("d", "4", "added"),
+            ("e", "5", "added"),
+        ]
+        assert stats == {"added": 3, "exists": 1, "error": 1}
+
+    def test_only_added_fronts_join_snapshot(self):
+        """Test that a shared snapshot gains the fronts that were added, not those that failed."""
+        client = Mock(concurrency=1)
+        client.add_notes = AsyncMock(return_value=[True, False])
+        existing_fronts = {"b"}
+
+        asyncio.run(
+            process_word_pairs_async(
+                client, [("a", "1"), ("a", "x"), ("c", "3")], "Swedish", existing_fronts=existing_fronts
+            )
+        )
+
+        client.add_notes.assert_awaited_once_with("Swedish", [("a", "1"), ("c", "3")], 100)
+        assert existing_fronts == {"a", "b"}
+
+
+class TestMergeParsedFiles:
+    """Test cases for merge_parsed_files function."""
+
+    def test_drops_repeated_fronts_across_files(self):
+        """Test that fronts seen in an earlier file are dropped and counted per file."""
+        skipped = ParseSummary()
+        skipped.skip(3, "invalid format 'x'", invalid_format=True)
+        parsed = [
+            ("a.txt", [("hello", "hej"), ("bye", "hej då")], ParseSummary()),
+            ("b.txt", [("Hello", "hallå"), ("thanks", "tack")], skipped),
+        ]
+        file_stats = {}
+
+        pairs = list(merge_parsed_files(parsed, file_stats))
+
+        assert pairs == [("hello", "hej"), ("bye", "hej då"), ("thanks", "tack")]
+        assert file_stats == {
+            "a.txt": {"pairs": 2, "duplicates": 0, "skipped": 0},
+            "b.txt": {"pairs": 2, "duplicates": 1, "skipped": 1},
+        }
+
+
+class TestMain:
+    """End-to-end tests of the CLI against a fake AnkiConnect server."""
+
+    def test_import_from_file(self, anki, tmp_path):
+        """Test importing a file into a new deck."""
+        path = tmp_path / "words.txt"
+        path.write_text("hello - hej\ngoodbye - hej då\n", encoding="utf-8")
+
+        result = CliRunner().invoke(main, ["--deck-name", "Swedish", "--file", str(path), "--anki-url", anki.url])
+
+        assert result.exit_code == 0, result.output
+        assert "2 added, 0 already existed, 0 failed" in result.output
+        assert "Swedish" in anki.decks
+
+    def test_import_from_stdin_skips_existing(self, anki):
+        """Test that cards already in the deck are reported as existing."""
+        anki.seed("Swedish", [("hello", "hej")])
+
+        result = CliRunner().invoke(
+            main, ["--deck-name", "Swedish", "--anki-url", anki.url], input="hello - hej\nthanks - tack\n"
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "1 added, 1 already existed, 0 failed" in result.output
+
+    def test_import_directory(self, anki, tmp_path):
+        """Test importing every file of a directory with per-file stats."""
+        corpus = tmp_path / "corpus"
+        corpus.mkdir()
+        (corpus / "a.txt").write_text("hello - hej\n", encoding="utf-8")
+        (corpus / "b.txt").write_text("hello - hej\nthanks - tack\n", encoding="utf-8")
+
+        result = CliRunner().invoke(main, ["--deck-name", "Swedish", "--dir", str(corpus), "--anki-url", anki.url])
+
+        assert result.exit_code == 0, result.output
+        assert "2 added, 0 already existed, 0 failed" in result.output
+        assert "Input Files" in result.output
+
+    def test_repeated_input_reaches_anki_once(self, anki):
+        """Test that repeated fronts are collapsed before any addNotes request."""
+        lines = "hello - hej\n" * 30 + "Hello  - hallå\n"
+
+        result = CliRunner().invoke(
+            main,
+            ["--deck-name", "Swedish", "--anki-url", anki.url, "--on-duplicate", "merge"],
+            input=lines,
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "1 added, 0 already existed, 0 failed" in result.output
+        assert "Collapsed 30 repeated fronts" in result.output
+        (note,) = anki.notes.values()
+        assert note["fields"] == {"Front": "hello", "Back": "hej; hallå"}
+
+    def test_csv_report(self, anki, tmp_path):
+        """Test that --report csv streams every result to the report file."""
+        anki.seed("Swedish", [("hello", "hej")])
+        report_path = tmp_path / "report.csv"
+
+        result = CliRunner().invoke(
+            main,
+            ["--deck-name", "Swedish", "--anki-url", anki.url, "--report", "csv", "--report-file", str(report_path)],
+            input="hello - hej\nthanks - tack\n",
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Processing Results" not in result.output
+        assert report_path.read_text(encoding="utf-8").splitlines() == [
+            "front,back,status",
+            "hello,hej,exists",
+            "thanks,tack,added",
+        ]
+
+    def test_file_report_requires_path(self, anki):
+        """Test that --report json without --report-file is rejected."""
+        result = CliRunner().invoke(
+            main, ["--deck-name", "Swedish", "--anki-url", anki.url, "--report", "json"], input="a - b\n"
+        )
+
+        assert result.exit_code != 0
+        assert "requires --report-file" in result.output
+
+    def test_resume_skips_committed_pairs(self, anki, tmp_path):
+        """Test that --resume only submits pairs after the journal's committed prefix."""
+        words = tmp_path / "words.txt"
+        words.write_text("".join(f"word{i} - ord{i}\n" for i in range(10)), encoding="utf-8")
+        with ImportJournal.open("Swedish", [str(words)], options=DEFAULT_STREAM_OPTIONS) as journal:
+            journal.commit(["added"] * 4)
+
+        result = CliRunner().invoke(
+            main, ["--deck-name", "Swedish", "--file", str(words), "--anki-url", anki.url, "--resume"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Resuming after 4 pairs" in result.output
+        assert "6 added, 0 already existed, 0 failed" in result.output
+        assert len(anki.notes) == 6
+        assert not journal.path.exists()
+
+    def test_resume_with_other_options_starts_over(self, anki, tmp_path):
+        """Test that --resume ignores a journal recorded with options producing another pair stream."""
+        words = tmp_path / "words.txt"
+        words.write_text("".join(f"word{i} - ord{i}\n" for i in range(10)), encoding="utf-8")
+        with ImportJournal.open("Swedish", [str(words)], options=DEFAULT_STREAM_OPTIONS) as journal:
+            journal.commit(["added"] * 4)
+
+        result = CliRunner().invoke(
+            main,
+            ["--deck-name", "Swedish", "--file", str(words), "--anki-url", anki.url, "--resume", "--no-casefold"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Resuming" not in result.output
+        assert len(anki.notes) == 10
+
+    def test_failed_import_keeps_journal(self, anki, tmp_path):
+        """Test that an import with failed pairs keeps its journal for --resume."""
+        words = tmp_path / "words.txt"
+        words.write_text("hello - hej\nthanks - tack\n", encoding="utf-8")
+
+        with patch("wb_anki.anki_client.AnkiConnectClient.add_notes", return_value=[True, False]):
+            result = CliRunner().invoke(main, ["--deck-name", "Swedish", "--file", str(words), "--anki-url", anki.url])
+
+        assert result.exit_code != 0
+        with ImportJournal.open("Swedish", [str(words)], resume=True, options=DEFAULT_STREAM_OPTIONS) as journal:
+            assert journal.offset == 1
+
+    def test_resume_requires_files(self, anki):
+        """Test that --resume is rejected for stdin input."""
+        result = CliRunner().invoke(
+            main, ["--deck-name", "Swedish", "--anki-url", anki.url, "--resume"], input="a - b\n"
+        )
+
+        assert result.exit_code != 0
+        assert "--resume requires input" in result.output
+
+    def test_concurrent_import(self, anki):
+        """Test importing with several requests in flight."""
+        lines = "".join(f"word{i} - ord{i}\n" for i in range(50))
+
+        result = CliRunner().invoke(
+            main,
+            [
+                "--deck-name",
+                "Swedish",
+                "--anki-url",
+                anki.url,
+                "--batch-size",
+                "10",
+                "--concurrency",
+                "4",
+                "--no-adaptive",
+            ],
+            input=lines,
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "50 added, 0 already existed, 0 failed" in result.output
+        assert anki.request_counts["addNotes"] == 5
+
+    def test_adaptive_batches_grow(self, anki):
+        """Test that fast responses grow the batch size beyond --batch-size."""
+        lines = "".join(f"word{i} - ord{i}\n" for i in range(1000))
+
+        result = CliRunner().invoke(
+            main, ["--deck-name", "Swedish", "--anki-url", anki.url, "--batch-size", "10"], input=lines
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "1000 added, 0 already existed, 0 failed" in result.output
+        assert anki.request_counts["addNotes"] < 50
+
+    def test_metrics_and_profile(self, anki, tmp_path):
+        """Test that metrics and a profile are written after the run."""
+        metrics_path = tmp_path / "metrics.json"
+        profile_path = tmp_path / "run.prof"
+
+        result = CliRunner().invoke(
+            main,
+            [
+                "--deck-name",
+                "Swedish",
+                "--anki-url",
+                anki.url,
+                "--metrics-json",
+                str(metrics_path),
+                "--profile",
+                str(profile_path),
+            ],
+            input="hello - hej\n",
+        )
+
+        assert result.exit_code == 0, result.output
+        metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+        assert metrics["actions"]["multi"]["count"] == 1
+        assert metrics["actions"]["addNotes"]["count"] == 1
+        assert {"deck_check", "parse", "snapshot", "process", "render"} <= set(metrics["phases_ms"])
+        assert profile_path.stat().st_size > 0
+
+    def test_route_decks(self, anki, tmp_path):
+        """Test that --route-decks adds each pair to its line's deck, creating decks in one request."""
+        anki.seed("Swedish", [("hello", "hej")])
+        metrics_path = tmp_path / "metrics.json"
+        lines = "hello - hej\n[Swedish::Verbs] run - springa\nSpanish\thola\thej\n[Spanish] hola - hej igen\n"
+
+        result = CliRunner().invoke(
+            main,
+            ["--deck-name", "Swedish", "--anki-url", anki.url, "--route-decks", "--metrics-json", str(metrics_path)],
+            input=lines,
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "2 added, 1 already existed, 0 failed" in result.output
+        assert "Created deck: Swedish::Verbs" in result.output
+        decks = {note["deckName"]: note["fields"]["Front"] for note in anki.notes.values()}
+        assert decks == {"Swedish": "hello", "Swedish::Verbs": "run", "Spanish": "hola"}
+        metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+        assert "createDeck" not in metrics["actions"]
+        assert metrics["actions"]["multi"]["count"] == 3
+
+    def test_sync_applies_changes(self, anki, tmp_path):
+        """Test that --sync adds, updates and, with --prune, deletes notes to match the input."""
+        anki.seed("Swedish", [("hello", "hej"), ("thanks", "tack"), ("old", "gammal")])
+        metrics_path = tmp_path / "metrics.json"
+        words = tmp_path / "words.txt"
+        words.write_text("hello - hej\nthanks - tack så mycket\nyes - ja\n", encoding="utf-8")
+        args = ["--deck-name", "Swedish", "--anki-url", anki.url, "--file", str(words), "--sync", "--prune"]
+
+        result = CliRunner().invoke(main, [*args, "--metrics-json", str(metrics_path)])
+
+        assert result.exit_code == 0, result.output
+        assert "1 new, 1 changed, 1 unchanged, 1 missing from the input" in result.output
+        assert "1 added, 1 already existed, 0 failed, 1 updated, 1 deleted" in result.output
+        notes = {note["fields"]["Front"]: note["fields"]["Back"] for note in anki.notes.values()}
+        assert notes == {"hello": "hej", "thanks": "tack så mycket", "yes": "ja"}
+        metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+        assert metrics["actions"]["deleteNotes"]["count"] == 1
+
+        result = CliRunner().invoke(main, args)
+        assert "0 new, 0 changed, 3 unchanged, 0 missing from the input" in result.output
+
+    def test_sync_leaves_subdecks_alone(self, anki, tmp_path):
+        """Test that --sync --prune neither deletes nor updates the notes of subdecks."""
+        anki.seed("Swedish", [("hello", "hej"), ("old", "gammal")])
+        anki.seed("Swedish::Verbs", [("run", "springa")])
+        words = tmp_path / "words.txt"
+        words.write_text("hello - hej\n", encoding="utf-8")
+        args = ["--deck-name", "Swedish", "--anki-url", anki.url, "--file", str(words), "--sync", "--prune"]
+
+        result = CliRunner().invoke(main, args)
+
+        assert result.exit_code == 0, result.output
+        assert "0 new, 0 changed, 1 unchanged, 1 missing from the input" in result.output
+        decks = {note["fields"]["Front"]: note["deckName"] for note in anki.notes.values()}
+        assert decks == {"hello": "Swedish", "run": "Swedish::Verbs"}
+
+    def test_file_backend_writes_package(self, tmp_path):
+        """Test that --backend file imports into an .apkg package without AnkiConnect."""
+        package = tmp_path / "swedish.apkg"
+        args = ["--deck-name", "Swedish", "--backend", "file", "--collection", str(package)]
+
+        result = CliRunner().invoke(main, args, input="hello - hej\nthanks - tack\n")
+        assert result.exit_code == 0, result.output
+        assert "2 added, 0 already existed, 0 failed" in result.output
+
+        result = CliRunner().invoke(main, args, input="hello - hej\nyes - ja\n")
+        assert result.exit_code == 0, result.output
+        assert "1 added, 1 already existed, 0 failed" in result.output
+
+    def test_media_uploaded_with_notes(self, anki, tmp_path):
+        """Test that --media-dir uploads referenced files once and rewrites the references."""
+        (tmp_path / "hej.mp3").write_bytes(b"hej audio")
+        words = tmp_path / "words.txt"
+        words.write_text("[sound:hej.mp3] hej - hello\nhej då - [sound:hej.mp3] goodbye\n", encoding="utf-8")
+
+        result = CliRunner().invoke(
+            main,
+            ["--deck-name", "Swedish", "--anki-url", anki.url, "--file", str(words), "--media-dir", str(tmp_path)],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Media: 1 uploaded, 0 already stored, 0 not found, 0 failed" in result.output
+        (name,) = anki.media
+        assert anki.media[name] == b"hej audio"
+        fronts = {note["fields"]["Front"] for note in anki.notes.values()}
+        assert fronts == {f"[sound:{name}] hej", "hej då"}
+        assert anki.action_counts["storeMediaFile"] == 1
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_csv_notes_carry_tags_and_extra_fields(self, anki, tmp_path, concurrency):
+        """Test that --format csv imports header-mapped columns, tags and extra fields, also concurrently."""
+        words = tmp_path / "words.csv"
+        words.write_text(
+            'word,translation,example,tags\nthanks,tack,,\nhello,"hej, hallå",Hej på dig!,greeting\n',
+            encoding="utf-8",
+        )
+
+        result = CliRunner().invoke(
+            main,
+            ["--deck-name", "Swedish", "--anki-url", anki.url, "--file", str(words), "--format", "csv"]
+            + ["--concurrency", str(concurrency)],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "2 added, 0 already existed, 0 failed" in result.output
+        notes = {note["fields"]["Front"]: note for note in anki.notes.values()}
+        assert notes["hello"]["fields"] == {"Front": "hello", "Back": "hej, hallå", "example": "Hej på dig!"}
+        assert notes["hello"]["tags"] == ["wb_anki", "greeting"]
+        assert notes["thanks"]["tags"] == ["wb_anki"]
+
+    def test_csv_extras_follow_normalized_fronts(self, anki, tmp_path):
+        """Test that rows whose front is normalized on the way keep their tags and extra fields."""
+        words = tmp_path / "words.csv"
+        words.write_text(
+            "word,translation,example,tags\ngood  bye,hej då,Hej då!,farewell\ncafe\u0301,kafé,,place\n",
+            encoding="utf-8",
+        )
+
+        result = CliRunner().invoke(
+            main, ["--deck-name", "Swedish", "--anki-url", anki.url, "--file", str(words), "--format", "csv"]
+        )
+
+        assert result.exit_code == 0, result.output
+        notes = {note["fields"]["Front"]: note for note in anki.notes.values()}
+        assert notes["good bye"]["fields"]["example"] == "Hej då!"
+        assert notes["good bye"]["tags"] == ["wb_anki", "farewell"]
+        assert notes["caf\u00e9"]["tags"] == ["wb_anki", "place"]
+
+    def test_tsv_deck_column_routes_concurrently(self, anki, tmp_path):
+        """Test that a deck column routes rows with --route-decks, also with concurrent requests."""
+        words = tmp_path / "words.tsv"
+        words.write_text("deck\tfront\tback\tTags\nSwedish::Verbs\trun\tspringa\tverb\n\thello\thej\t\n")
+
+        result = CliRunner().invoke(
+            main,
+            ["--deck-name", "Swedish", "--anki-url", anki.url, "--file", str(words), "--format", "tsv"]
+            + ["--route-decks", "--concurrency", "2"],
+        )
+
+        assert result.exit_code == 0, result.output
+        notes = {note["fields"]["Front"]: note for note in anki.notes.values()}
+        assert notes["run"]["deckName"] == "Swedish::Verbs" and notes["run"]["tags"] == ["wb_anki", "verb"]
+        assert notes["hello"]["deckName"] == "Swedish"
+
+    def test_file_backend_requires_collection(self):
+        """Test that --backend file without --collection is rejected."""
+        result = CliRunner().invoke(main, ["--deck-name", "Swedish", "--backend", "file"], input="a - b\n")
+
+        assert result.exit_code != 0
+        assert "--backend file requires --collection" in result.output
+
+    def test_prune_requires_sync(self, anki):
+        """Test that --prune without --sync is rejected."""
+        result = CliRunner().invoke(
+            main, ["--deck-name", "Swedish", "--anki-url", anki.url, "--prune"], input="a - b\n"
+        )
+
+        assert result.exit_code != 0
+        assert "--prune requires --sync" in result.output
+
+    def test_missing_deck_without_create(self, anki):
+        """Test that --no-create-deck aborts when the deck is missing."""
+        result = CliRunner().invoke(
+            main, ["--deck-name", "Swedish", "--anki-url", anki.url, "--no-create-deck"], input="hello - hej\n"
+        )
+
+        assert result.exit_code != 0
+        assert "does not exist" in result.output
+
+
+class TestWatch:
+    """Test cases for the watch command and the command group."""
+
+    def test_group_runs_import_by_default(self, anki):
+        """Test that arguments without a subcommand still run an import."""
+        result = CliRunner().invoke(cli, ["--deck-name", "Swedish", "--anki-url", anki.url], input="hello - hej\n")
+
+        assert result.exit_code == 0, result.output
+        assert "1 added, 0 already existed, 0 failed" in result.output
+
+    def test_group_help_lists_commands(self):
+        """Test that the group help lists the import, watch and serve commands."""
+        result = CliRunner().invoke(cli, ["--help"])
+
+        assert result.exit_code == 0
+        assert "import" in result.output
+        assert "watch" in result.output
+        assert "serve" in result.output
+
+    def test_serve_reports_busy_port(self, anki):
+        """Test that serve aborts with a message when its port is taken."""
+        port = anki.url.rsplit(":", 1)[1]
+
+        result = CliRunner().invoke(cli, ["serve", "--anki-url", anki.url, "--port", port])
+
+        assert result.exit_code != 0
+        assert f"cannot listen on 127.0.0.1:{port}" in result.output
+
+    def test_watch_imports_batches_on_one_connection(self, anki, tmp_path):
+        """Test that every batch of lines is imported against the snapshot loaded on start."""
+        anki.seed("Swedish", [("hello", "hej")])
+
+        def fake_watch(inbox, handle, debounce):
+            assert handle(["hello - hej\n", "thanks - tack\n"]) == []
+            assert handle(["Thanks - tack\n", "yes - ja\n", "bad line\n"]) == []
+
+        with patch("wb_anki.cli.watch_inbox", side_effect=fake_watch):
+            result = CliRunner().invoke(
+                cli, ["watch", "--deck-name", "Swedish", "--inbox", str(tmp_path), "--anki-url", anki.url]
+            )
+
+        assert result.exit_code == 0, result.output
+        assert result.output.count("1 added, 1 already existed, 0 failed") == 2
+        assert "Skipped 1 lines" in result.output
+        assert sorted(note["fields"]["Front"] for note in anki.notes.values()) == ["hello", "thanks", "yes"]
+        assert anki.action_counts["deckNamesAndIds"] == 1
+
+    def test_watch_retries_failed_lines(self, anki, tmp_path):
+        """Test that lines whose pairs failed are kept for a retry that then adds them."""
+
+        def fake_watch(inbox, handle, debounce):
+            anki.error_rate = 1.0
+            assert handle(["hello - hej\n"]) == ["hello - hej\n"]
+            anki.error_rate = 0.0
+            assert handle(["hello - hej\n"]) == []
+
+        with patch("wb_anki.cli.watch_inbox", side_effect=fake_watch):
+            result = CliRunner().invoke(
+                cli, ["watch", "--deck-name", "Swedish", "--inbox", str(tmp_path), "--anki-url", anki.url]
+            )
+
+        assert result.exit_code == 0, result.output
+        assert "0 added, 0 already existed, 1 failed" in result.output
+        assert "1 added, 0 already existed, 0 failed" in result.output
+        assert [note["fields"]["Front"] for note in anki.notes.values()] == ["hello"]
+
+    def test_watch_drops_rejected_lines(self, anki, tmp_path):
+        """Test that a pair Anki refuses, such as a front already in another deck, is reported and dropped."""
+        anki.seed("Spanish", [("hello", "hola")])
+        real_add_notes = anki._action_addNotes
+
+        def fake_watch(inbox, handle, debounce):
+            # Only the batch of "thanks" fails for a transient reason
+            with patch.object(anki, "_action_addNotes", side_effect=FakeAnkiError("collection is busy")):
+                assert handle(["hello - hej\n", "thanks - tack\n"]) == ["thanks - tack\n"]
+            with patch.object(anki, "_action_addNotes", side_effect=real_add_notes):
+                assert handle(["thanks - tack\n"]) == []
+
+        with patch("wb_anki.cli.watch_inbox", side_effect=fake_watch):
+            result = CliRunner().invoke(
+                cli, ["watch", "--deck-name", "Swedish", "--inbox", str(tmp_path), "--anki-url", anki.url]
+            )
+
+        assert result.exit_code == 0, result.output
+        assert "Anki rejected 1 pairs as duplicates or invalid: 'hello'" in result.output
+        assert sorted(note["fields"]["Front"] for note in anki.notes.values()) == ["hello", "thanks"]
+
+    def test_watch_gives_up_after_retries(self, anki, tmp_path):
+        """Test that lines failing on every attempt are dropped once they are out of retries."""
+
+        def fake_watch(inbox, handle, debounce):
+            anki.error_rate = 1.0
+            for _ in range(WATCH_RETRIES):
+                assert handle(["hello - hej\n"]) == ["hello - hej\n"]
+            assert handle(["hello - hej\n"]) == []
+
+        with patch("wb_anki.cli.watch_inbox", side_effect=fake_watch):
+            result = CliRunner().invoke(
+                cli, ["watch", "--deck-name", "Swedish", "--inbox", str(tmp_path), "--anki-url", anki.url]
+            )
+
+        assert result.exit_code == 0, result.output
+        assert f"Dropping 1 lines still failing after {WATCH_RETRIES} retries" in result.output
+
+
+class TestStartup:
+    """Startup cost regression tests, run in fresh interpreters."""
+
+    def test_heavy_modules_are_deferred(self):
+        """Test that importing the CLI loads neither the HTTP client, asyncio, sqlite nor the .env file."""
+        code = "import sys, wb_anki.cli; print(' '.join(sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert DEFERRED_MODULES.isdisjoint(result.stdout.split())
+
+    def test_import_time_budget(self):
+        """Test that the CLI module imports within its budget, as measured by -X importtime."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import wb_anki.cli"], capture_output=True, text=True, check=True
+        )
+
+        (line,) = [line for line in result.stderr.splitlines() if line.endswith("| wb_anki.cli")]
+        cumulative_us = int(line.split("|")[1])
+        assert cumulative_us < IMPORT_BUDGET_US
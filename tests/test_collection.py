@@ -0,0 +1,226 @@
+"""Tests for the collection module."""
+
+import hashlib
+import json
+import sqlite3
+import zipfile
+
+import pytest
+
+from wb_anki.anki_client import AnkiConnectClient, AnkiConnectError, build_note, deck_query
+from wb_anki.collection import (
+    FIELD_SEPARATOR,
+    GUID_CHARS,
+    CollectionBackend,
+    create_collection,
+    field_checksum,
+    guid64,
+    strip_html,
+    strip_html_preserving_media_filenames,
+)
+from wb_anki.fake_anki import FakeAnkiConnect
+
+
+@pytest.fixture
+def collection(tmp_path):
+    path = tmp_path / "collection.anki2"
+    create_collection(path)
+    return path
+
+
+def read_rows(path, query):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(query).fetchall()
+    finally:
+        connection.close()
+
+
+class TestChecksums:
+    """Test cases for note checksums and GUIDs."""
+
+    def test_field_checksum_matches_anki(self):
+        """Test that the checksum is the first 8 hex digits of the SHA-1 of the stripped field."""
+        expected = int(hashlib.sha1("dog".encode("utf-8")).hexdigest()[:8], 16)
+
+        assert field_checksum("<b>dog</b>") == expected
+        assert strip_html("fish &amp; <i>chips</i>") == "fish & chips"
+
+    def test_media_field_checksum_matches_anki(self):
+        """Test that media file names are kept in the sort field and checksum, as Anki computes them."""
+        # Anki's checksum of "test", and of the " x.jpg " its sort field holds for an image
+        assert field_checksum("test") == 2840236005
+        assert field_checksum('<img src="x.jpg">') == 403887131
+        assert strip_html_preserving_media_filenames("<img src=foo.jpg>") == " foo.jpg "
+        assert strip_html_preserving_media_filenames("<img src='foo.jpg'><html>") == " foo.jpg "
+        assert strip_html_preserving_media_filenames('<audio data="a.mp3" controls>x</audio>') == " a.mp3 x"
+
+    def test_guid64_uses_base91(self):
+        """Test that GUIDs only use Anki's base91 alphabet and differ between notes."""
+        guids = {guid64() for _ in range(100)}
+
+        assert len(guids) == 100
+        assert all(set(guid) <= set(GUID_CHARS) for guid in guids)
+
+
+class TestCollectionBackend:
+    """Test cases for CollectionBackend."""
+
+    def test_add_notes_writes_both_cards(self, collection):
+        """Test that each note gets a checksum, a GUID and two new cards in its deck."""
+        with CollectionBackend(str(collection)) as client:
+            client.create_deck("Swedish")
+            added = client.add_notes("Swedish", [("hello", "hej"), ("<b>dog</b>", "hund")])
+            deck_id = client.get_deck_ids()["Swedish"]
+
+        assert added == [True, True]
+        notes = read_rows(collection, "SELECT id, guid, flds, sfld, csum, tags FROM notes ORDER BY id")
+        assert [row[2] for row in notes] == [f"hello{FIELD_SEPARATOR}hej", f"<b>dog</b>{FIELD_SEPARATOR}hund"]
+        assert [row[3] for row in notes] == ["hello", "dog"]
+        assert [row[4] for row in notes] == [field_checksum("hello"), field_checksum("dog")]
+        assert len({row[1] for row in notes}) == 2
+        assert notes[0][5] == " wb_anki "
+
+        cards = read_rows(collection, "SELECT nid, did, ord, type, queue, due FROM cards ORDER BY nid, ord")
+        assert cards == [
+            (notes[0][0], deck_id, 0, 0, 0, 1),
+            (notes[0][0], deck_id, 1, 0, 0, 1),
+            (notes[1][0], deck_id, 0, 0, 0, 2),
+            (notes[1][0], deck_id, 1, 0, 0, 2),
+        ]
+        (conf,) = read_rows(collection, "SELECT conf FROM col")[0]
+        assert json.loads(conf)["nextPos"] == 3
+
+    def test_duplicates_rejected(self, collection):
+        """Test that a front already in the deck, in this run or an earlier one, is not added again."""
+        with CollectionBackend(str(collection)) as client:
+            client.create_deck("Swedish")
+            assert client.add_notes("Swedish", [("hello", "hej"), ("hello", "hallå")]) == [True, False]
+
+        with CollectionBackend(str(collection)) as client:
+            assert client.add_notes("Swedish", [("hello", "hej"), ("thanks", "tack")]) == [False, True]
+            assert client.get_existing_fronts("Swedish") == {"hello", "thanks"}
+
+    def test_media_fronts_keep_file_names(self, collection):
+        """Test that fronts holding only an image are told apart by file name, as in Anki."""
+        with CollectionBackend(str(collection)) as client:
+            client.create_deck("Swedish")
+            fronts = ['<img src="x.jpg">', '<img src="y.jpg">', '<img src="x.jpg">']
+            assert client.add_notes("Swedish", [(front, "bild") for front in fronts]) == [True, True, False]
+
+        rows = read_rows(collection, "SELECT sfld, csum FROM notes ORDER BY id")
+        assert rows[0] == (" x.jpg ", 403887131)
+
+    def test_nested_decks_and_queries(self, collection):
+        """Test that parent decks are created and deck queries include subdecks unless excluded."""
+        with CollectionBackend(str(collection)) as client:
+            client.create_deck("Swedish::Verbs")
+            client.add_notes("Swedish::Verbs", [("run", "springa")])
+            client.create_deck("Swedish")
+            client.add_notes("Swedish", [("hello", "hej")])
+
+            assert {"Swedish", "Swedish::Verbs"} <= set(client.get_deck_ids())
+            assert len(client.find_notes('deck:"Swedish"')) == 2
+            assert len(client.find_notes('deck:"Swedish::Verbs"')) == 1
+            assert len(client.find_notes('deck:"Swedish" front:"HELLO"')) == 1
+            assert client.find_notes(deck_query("Swedish", subdecks=False)) == client.find_notes('front:"hello"')
+
+    def test_update_and_delete_notes(self, collection):
+        """Test that backs are updated in place and deleted notes leave graves behind."""
+        with CollectionBackend(str(collection)) as client:
+            client.create_deck("Swedish")
+            client.add_notes("Swedish", [("hello", "hej"), ("old", "gammal")])
+            hello, old = client.find_notes('deck:"Swedish"')
+
+            assert client.update_backs([(hello, "hallå")]) == [True]
+            assert client.delete_notes([old]) is True
+            assert client.get_deck_notes("Swedish") == [(hello, "hello", "hallå")]
+            assert client.add_notes("Swedish", [("old", "gammal")]) == [True]
+
+            client._make_request("updateNoteFields", {"note": {"id": hello, "fields": {"Front": "hi"}}})
+            assert client.add_notes("Swedish", [("hello", "hej"), ("hi", "hej")]) == [True, False]
+
+        graves = read_rows(collection, "SELECT oid, type FROM graves ORDER BY type")
+        assert [kind for _, kind in graves] == [0, 0, 1]
+        assert (old, 1) in graves
+
+    def test_writes_apkg_package(self, tmp_path):
+        """Test that an .apkg path is written as a package and can be added to again."""
+        package = tmp_path / "swedish.apkg"
+        with CollectionBackend(str(package)) as client:
+            client.create_deck("Swedish")
+            client.add_notes("Swedish", [("hello", "hej")])
+        with CollectionBackend(str(package)) as client:
+            client.add_notes("Swedish", [("thanks", "tack")])
+
+        with zipfile.ZipFile(package) as archive:
+            assert sorted(archive.namelist()) == ["collection.anki2", "media"]
+            assert archive.read("media") == b"{}"
+            archive.extract("collection.anki2", tmp_path / "unpacked")
+        rows = read_rows(tmp_path / "unpacked" / "collection.anki2", "SELECT sfld FROM notes ORDER BY id")
+        assert rows == [("hello",), ("thanks",)]
+
+    def test_media_stored_in_package(self, tmp_path):
+        """Test that media files are numbered into the package and kept when it is written again."""
+        package = tmp_path / "swedish.apkg"
+        audio = tmp_path / "hej.mp3"
+        audio.write_bytes(b"hej audio")
+        with CollectionBackend(str(package)) as client:
+            assert client.store_media_file("wb_anki_hej.mp3", str(audio))
+        with CollectionBackend(str(package)) as client:
+            assert client.get_media_file_names("wb_anki_*") == ["wb_anki_hej.mp3"]
+
+        with zipfile.ZipFile(package) as archive:
+            assert json.loads(archive.read("media")) == {"0": "wb_anki_hej.mp3"}
+            assert archive.read("0") == b"hej audio"
+
+    def test_locked_collection_rejected(self, collection):
+        """Test that a collection held open elsewhere, as by Anki, is reported instead of written."""
+        with CollectionBackend(str(collection)):
+            with pytest.raises(AnkiConnectError, match="close it in Anki"):
+                CollectionBackend(str(collection))
+
+    def test_newer_schema_rejected(self, collection):
+        """Test that collections in Anki's newer schemas are refused."""
+        connection = sqlite3.connect(collection)
+        with connection:
+            connection.execute("UPDATE col SET ver = 18")
+        connection.close()
+
+        with pytest.raises(AnkiConnectError, match="schema 18 is not supported"):
+            CollectionBackend(str(collection))
+
+    def test_multi_reports_errors_per_action(self, collection):
+        """Test that a failing action inside a batch does not fail the other actions."""
+        with CollectionBackend(str(collection)) as client:
+            with client.batch() as batch:
+                decks = batch.add("deckNamesAndIds")
+                missing = batch.add("updateNoteFields", {"note": {"id": 1, "fields": {"Back": "x"}}})
+
+            assert "Default" in decks.result()
+            with pytest.raises(Exception, match="note was not found"):
+                missing.result()
+
+
+class TestBackendParity:
+    """Test cases comparing the file backend with AnkiConnect."""
+
+    @staticmethod
+    def import_words(client):
+        client.create_deck("Swedish")
+        client.create_deck("Spanish")
+        first = client.add_notes("Swedish", [("hello", "hej"), ("thanks", "tack")])
+        second = client.add_notes("Spanish", [("hello", "hola"), ("yes", "sí")])
+        deck_note = build_note("Spanish", "thanks", "gracias")
+        deck_note["options"]["duplicateScope"] = "deck"
+        deck_scoped = client._make_request("addNote", {"note": deck_note}).get("result") is not None
+        return first, second, deck_scoped
+
+    def test_duplicates_match_ankiconnect(self, collection):
+        """Test that both backends treat a front in another deck as a duplicate unless scoped to the deck."""
+        with FakeAnkiConnect() as anki, AnkiConnectClient(anki.url) as client:
+            over_http = self.import_words(client)
+        with CollectionBackend(str(collection)) as client:
+            from_file = self.import_words(client)
+
+        assert from_file == over_http == ([True, True], [False, True], True)
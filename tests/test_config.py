@@ -26,11 +26,28 @@ class TestConfig:
         assert Config.ANKI_URL == "http://localhost:8765"
         assert Config.DEFAULT_DECK_NAME == "WB_Anki"
         assert Config.TIMEOUT == 30.0
+        assert Config.BATCH_SIZE == 100
+        assert Config.MAX_BATCH_SIZE == 1000
+        assert Config.CONCURRENCY == 1
+        assert Config.RETRIES == 3
+        assert Config.TARGET_LATENCY == 2.0
+        assert Config.CACHE_DIR == ""
+        assert Config.DECK_CACHE_TTL == 60.0
         assert Config.DEBUG is False
 
     @patch.dict(
         os.environ,
-        {"ANKI_URL": "http://localhost:9999", "DEFAULT_DECK_NAME": "TestDeck", "ANKI_TIMEOUT": "60.0", "DEBUG": "true"},
+        {
+            "ANKI_URL": "http://localhost:9999",
+            "DEFAULT_DECK_NAME": "TestDeck",
+            "ANKI_TIMEOUT": "60.0",
+            "ANKI_BATCH_SIZE": "25",
+            "ANKI_MAX_BATCH_SIZE": "500",
+            "ANKI_CONCURRENCY": "8",
+            "ANKI_RETRIES": "0",
+            "ANKI_TARGET_LATENCY": "0.5",
+            "DEBUG": "true",
+        },
         clear=True,
     )
     def test_environment_variables(self):
@@ -46,6 +63,11 @@ class TestConfig:
         assert Config.ANKI_URL == "http://localhost:9999"
         assert Config.DEFAULT_DECK_NAME == "TestDeck"
         assert Config.TIMEOUT == 60.0
+        assert Config.BATCH_SIZE == 25
+        assert Config.MAX_BATCH_SIZE == 500
+        assert Config.CONCURRENCY == 8
+        assert Config.RETRIES == 0
+        assert Config.TARGET_LATENCY == 0.5
         assert Config.DEBUG is True
 
     def test_validate_success(self):
@@ -64,3 +86,27 @@ class TestConfig:
         """Test validation fails with empty DEFAULT_DECK_NAME."""
         with pytest.raises(ValueError, match="DEFAULT_DECK_NAME must be provided"):
             Config.validate()
+
+    @patch.object(Config, "BATCH_SIZE", 0)
+    def test_validate_invalid_batch_size(self):
+        """Test validation fails with a non-positive ANKI_BATCH_SIZE."""
+        with pytest.raises(ValueError, match="ANKI_BATCH_SIZE must be a positive integer"):
+            Config.validate()
+
+    @patch.object(Config, "CONCURRENCY", 0)
+    def test_validate_invalid_concurrency(self):
+        """Test validation fails with a non-positive ANKI_CONCURRENCY."""
+        with pytest.raises(ValueError, match="ANKI_CONCURRENCY must be a positive integer"):
+            Config.validate()
+
+    @patch.object(Config, "MAX_BATCH_SIZE", 10)
+    def test_validate_max_batch_size_below_batch_size(self):
+        """Test validation fails when ANKI_MAX_BATCH_SIZE is below ANKI_BATCH_SIZE."""
+        with pytest.raises(ValueError, match="ANKI_MAX_BATCH_SIZE must not be smaller"):
+            Config.validate()
+
+    @patch.object(Config, "RETRIES", -1)
+    def test_validate_negative_retries(self):
+        """Test validation fails with a negative ANKI_RETRIES."""
+        with pytest.raises(ValueError, match="ANKI_RETRIES must not be negative"):
+            Config.validate()
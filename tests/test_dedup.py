@@ -0,0 +1,60 @@
+"""Tests for the deduplication module."""
+
+import pytest
+
+from wb_anki.dedup import PairDeduplicator
+
+
+class TestPairDeduplicator:
+    """Test cases for PairDeduplicator class."""
+
+    def test_first_policy_normalizes_and_keeps_first(self):
+        """Test that fronts differing in case, whitespace or Unicode form collapse to the first pair."""
+        decomposed = "cafe\u0301"
+        pairs = [("café", "kafé"), (f"  {decomposed.upper()} ", "kafeet"), ("hello   world", "hej  världen")]
+        dedup = PairDeduplicator()
+
+        result = list(dedup.dedupe(pairs))
+
+        assert result == [("café", "kafé"), ("hello world", "hej världen")]
+        assert dedup.duplicates == 1
+
+    def test_last_policy(self):
+        """Test that the last back wins at the position of the first occurrence."""
+        pairs = [("hello", "hej"), ("bye", "hej då"), ("Hello", "hallå")]
+        dedup = PairDeduplicator("last")
+
+        assert list(dedup.dedupe(pairs)) == [("hello", "hallå"), ("bye", "hej då")]
+        assert dedup.duplicates == 1
+
+    def test_merge_policy(self):
+        """Test that distinct backs are merged."""
+        pairs = [("hello", "hej"), ("hello", "hallå"), ("hello", "hej")]
+        dedup = PairDeduplicator("merge")
+
+        assert list(dedup.dedupe(pairs)) == [("hello", "hej; hallå")]
+        assert dedup.duplicates == 2
+
+    def test_without_casefold(self):
+        """Test that case variants are kept apart when casefolding is disabled."""
+        dedup = PairDeduplicator(casefold=False)
+
+        assert list(dedup.dedupe([("Turkey", "Turkiet"), ("turkey", "kalkon")])) == [
+            ("Turkey", "Turkiet"),
+            ("turkey", "kalkon"),
+        ]
+        assert dedup.duplicates == 0
+
+    def test_first_policy_streams(self):
+        """Test that the first policy yields pairs before the input is exhausted."""
+
+        def pairs():
+            yield "hello", "hej"
+            raise AssertionError("input read too far")
+
+        assert next(PairDeduplicator().dedupe(pairs())) == ("hello", "hej")
+
+    def test_unknown_policy(self):
+        """Test that unknown policies are rejected."""
+        with pytest.raises(ValueError, match="Unknown duplicate policy"):
+            PairDeduplicator("newest")
@@ -0,0 +1,63 @@
+"""Tests for the fake AnkiConnect server module."""
+
+import pytest
+
+from wb_anki.anki_client import AnkiConnectClient
+from wb_anki.fake_anki import FakeAnkiConnect
+
+
+@pytest.fixture
+def anki():
+    with FakeAnkiConnect(seed=1) as server:
+        yield server
+
+
+class TestFakeAnkiConnect:
+    """Test cases for FakeAnkiConnect class."""
+
+    def test_decks(self, anki):
+        """Test deck listing and creation."""
+        with AnkiConnectClient(anki.url) as client:
+            assert client.deck_exists("Swedish") is False
+            assert client.create_deck("Swedish") is True
+            assert client.get_deck_names() == ["Default", "Swedish"]
+
+    def test_add_and_find_notes(self, anki):
+        """Test adding notes and finding them by deck and field."""
+        anki.seed("Swedish", [("hello", "hej")])
+
+        with AnkiConnectClient(anki.url) as client:
+            assert client.add_notes("Swedish", [("goodbye", "hej då"), ("hello", "hallå")]) == [True, False]
+            assert client.card_exists("Swedish", "Goodbye") is True
+            assert client.get_existing_fronts("Swedish") == {"hello", "goodbye"}
+
+        assert anki.request_counts["canAddNotes"] == 1
+        assert anki.request_counts["addNotes"] == 1
+
+    def test_subdecks_match_parent_query(self, anki):
+        """Test that deck queries include subdecks."""
+        anki.seed("Swedish::Verbs", [("run", "springa")])
+
+        with AnkiConnectClient(anki.url) as client:
+            assert len(client.find_notes('deck:"Swedish"')) == 1
+            assert client.find_notes('deck:"Swedish::Nouns"') == []
+
+    def test_multi(self, anki):
+        """Test that multi requests are counted once but dispatch every action."""
+        with AnkiConnectClient(anki.url) as client:
+            with client.batch() as batch:
+                decks = batch.add("deckNames")
+                missing = batch.add("noSuchAction")
+
+        assert decks.result() == ["Default"]
+        with pytest.raises(Exception, match="unsupported action"):
+            missing.result()
+        assert anki.request_counts == {"multi": 1}
+        assert anki.action_counts["deckNames"] == 1
+
+    def test_error_injection(self):
+        """Test that injected errors surface as API errors."""
+        with FakeAnkiConnect(error_rate=1.0) as anki:
+            with AnkiConnectClient(anki.url) as client:
+                with pytest.raises(Exception, match="injected error"):
+                    client.get_deck_names()
@@ -0,0 +1,99 @@
+"""Tests for the checkpoint journal module."""
+
+from wb_anki.journal import ImportJournal, hash_inputs, journal_key
+
+
+def write_input(tmp_path, text="hello - hej\n"):
+    """Write an input file and return its path."""
+    path = tmp_path / "words.txt"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+class TestJournalKey:
+    """Test cases for input hashing and journal keys."""
+
+    def test_key_depends_on_content_and_deck(self, tmp_path):
+        """Test that changing the input or the deck selects another journal."""
+        path = write_input(tmp_path)
+        original = journal_key("Swedish", hash_inputs([path]))
+
+        assert journal_key("Swedish", hash_inputs([path])) == original
+        assert journal_key("Spanish", hash_inputs([path])) != original
+
+        write_input(tmp_path, "hello - hallå\n")
+        assert journal_key("Swedish", hash_inputs([path])) != original
+
+    def test_key_depends_on_options(self, tmp_path):
+        """Test that options shaping the pair stream select another journal."""
+        input_hash = hash_inputs([write_input(tmp_path)])
+        options = {"casefold": True, "on_duplicate": "first"}
+
+        assert journal_key("Swedish", input_hash, options) == journal_key("Swedish", input_hash, dict(options))
+        assert journal_key("Swedish", input_hash, options) != journal_key(
+            "Swedish", input_hash, {**options, "on_duplicate": "last"}
+        )
+
+
+class TestImportJournal:
+    """Test cases for ImportJournal class."""
+
+    def test_resume_restores_committed_prefix(self, tmp_path):
+        """Test that a resumed journal continues after the committed pairs."""
+        path = write_input(tmp_path)
+
+        with ImportJournal.open("Swedish", [path], directory=tmp_path) as journal:
+            journal.commit(["added", "exists"])
+            journal.commit(["added"])
+
+        with ImportJournal.open("Swedish", [path], resume=True, directory=tmp_path) as journal:
+            assert journal.offset == 3
+            assert journal.counts == {"added": 2, "exists": 1}
+            journal.commit(["added"])
+
+        with ImportJournal.open("Swedish", [path], resume=True, directory=tmp_path) as journal:
+            assert journal.offset == 4
+
+    def test_without_resume_starts_over(self, tmp_path):
+        """Test that opening without resume discards an earlier journal."""
+        path = write_input(tmp_path)
+
+        with ImportJournal.open("Swedish", [path], directory=tmp_path) as journal:
+            journal.commit(["added"])
+
+        with ImportJournal.open("Swedish", [path], directory=tmp_path) as journal:
+            assert journal.offset == 0
+
+        with ImportJournal.open("Swedish", [path], resume=True, directory=tmp_path) as journal:
+            assert journal.offset == 0
+
+    def test_error_ends_committed_prefix(self, tmp_path):
+        """Test that pairs after a failed pair are not committed."""
+        path = write_input(tmp_path)
+
+        with ImportJournal.open("Swedish", [path], directory=tmp_path) as journal:
+            journal.commit(["added", "error", "added"])
+            journal.commit(["added"])
+
+        with ImportJournal.open("Swedish", [path], resume=True, directory=tmp_path) as journal:
+            assert journal.offset == 1
+
+    def test_torn_record_is_ignored(self, tmp_path):
+        """Test that a partially written last record is skipped on resume."""
+        path = write_input(tmp_path)
+
+        with ImportJournal.open("Swedish", [path], directory=tmp_path) as journal:
+            journal.commit(["added"])
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"offset": 5, "add')
+
+        with ImportJournal.open("Swedish", [path], resume=True, directory=tmp_path) as journal:
+            assert journal.offset == 1
+
+    def test_finish_deletes_journal(self, tmp_path):
+        """Test that finishing removes the journal file."""
+        journal = ImportJournal.open("Swedish", [write_input(tmp_path)], directory=tmp_path)
+        journal.commit(["added"])
+        journal.finish()
+
+        assert not journal.path.exists()
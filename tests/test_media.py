@@ -0,0 +1,147 @@
+"""Tests for the media module."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from wb_anki.media import MEDIA_PREFIX, MediaUploader, hashed_name, media_references
+
+
+@pytest.fixture
+def media_dir(tmp_path):
+    (tmp_path / "hej.mp3").write_bytes(b"hej audio")
+    (tmp_path / "copy.mp3").write_bytes(b"hej audio")
+    (tmp_path / "dog.JPG").write_bytes(b"dog picture")
+    return tmp_path
+
+
+def make_client(existing=()):
+    client = Mock()
+    client.get_media_file_names.return_value = list(existing)
+    client.store_media_file.return_value = True
+    return client
+
+
+class TestMediaReferences:
+    """Test cases for finding and naming media files."""
+
+    def test_media_references(self):
+        """Test that sound tags and image sources are both found."""
+        text = '[sound:hej.mp3] hej <img class="x" src="dog.jpg"> <IMG SRC=\'cat.png\'>'
+
+        assert media_references(text) == ["hej.mp3", "dog.jpg", "cat.png"]
+
+    def test_hashed_name_depends_on_content(self, media_dir):
+        """Test that identical files get the same name and the extension is kept."""
+        name = hashed_name(str(media_dir / "hej.mp3"))
+
+        assert name == hashed_name(str(media_dir / "copy.mp3"))
+        assert name != hashed_name(str(media_dir / "dog.JPG"))
+        assert name.startswith(MEDIA_PREFIX) and name.endswith(".mp3")
+        assert hashed_name(str(media_dir / "dog.JPG")).endswith(".jpg")
+
+
+class TestMediaUploader:
+    """Test cases for MediaUploader."""
+
+    def test_rewrites_references_and_uploads_once(self, media_dir):
+        """Test that identical files are uploaded once and references point at the stored name."""
+        client = make_client()
+        name = hashed_name(str(media_dir / "hej.mp3"))
+
+        with MediaUploader(client, str(media_dir)) as uploader:
+            pairs = list(
+                uploader.rewrite_pairs(
+                    [("[sound:hej.mp3] hej", "hello"), ("hej igen", "[sound:copy.mp3]"), ("hej", "[sound:hej.mp3]")]
+                )
+            )
+
+        assert pairs == [(f"[sound:{name}] hej", "hello"), ("hej igen", f"[sound:{name}]"), ("hej", f"[sound:{name}]")]
+        client.store_media_file.assert_called_once_with(name, str(media_dir / "hej.mp3"))
+        assert uploader.stats == {"uploaded": 1, "skipped": 1, "missing": 0, "failed": 0}
+
+    def test_skips_files_already_in_anki(self, media_dir):
+        """Test that files Anki already stores are not uploaded again."""
+        client = make_client(existing=[hashed_name(str(media_dir / "dog.JPG"))])
+
+        with MediaUploader(client, str(media_dir)) as uploader:
+            uploader.rewrite('<img src="dog.JPG">')
+
+        client.get_media_file_names.assert_called_once_with(f"{MEDIA_PREFIX}*")
+        client.store_media_file.assert_not_called()
+        assert uploader.stats["skipped"] == 1
+
+    def test_missing_files_left_alone(self, media_dir):
+        """Test that references to files that do not exist locally are kept and counted."""
+        client = make_client()
+
+        with MediaUploader(client, str(media_dir)) as uploader:
+            text = uploader.rewrite('[sound:gone.mp3] <img src="https://example.com/a.png">')
+
+        assert text == '[sound:gone.mp3] <img src="https://example.com/a.png">'
+        assert uploader.stats["missing"] == 2
+        client.get_media_file_names.assert_not_called()
+
+    def test_paths_outside_media_dir_rejected(self, media_dir, tmp_path_factory):
+        """Test that relative and absolute references escaping the media directory are never read."""
+        outside = tmp_path_factory.mktemp("outside")
+        (outside / "secret.txt").write_text("secret")
+        (outside / "key.pem").write_text("key")
+        client = make_client()
+        text = f'<img src="../{outside.name}/secret.txt"> [sound:{outside / "key.pem"}]'
+
+        with MediaUploader(client, str(media_dir)) as uploader:
+            assert uploader.rewrite(text) == text
+
+        client.store_media_file.assert_not_called()
+        assert uploader.stats["missing"] == 2
+
+    def test_listing_failure_uploads_anyway(self, media_dir):
+        """Test that failing to list Anki's media files falls back to uploading instead of failing."""
+        client = make_client()
+        client.get_media_file_names.side_effect = Exception("Error connecting to Anki")
+
+        with MediaUploader(client, str(media_dir)) as uploader:
+            uploader.rewrite("[sound:hej.mp3] [sound:copy.mp3]")
+
+        client.store_media_file.assert_called_once()
+        assert uploader.stats == {"uploaded": 1, "skipped": 1, "missing": 0, "failed": 0}
+
+    def test_failed_uploads_counted(self, media_dir):
+        """Test that uploads that fail are reported."""
+        client = make_client()
+        client.store_media_file.return_value = False
+
+        with MediaUploader(client, str(media_dir)) as uploader:
+            uploader.rewrite("[sound:hej.mp3]")
+
+        assert uploader.stats["failed"] == 1
+
+    def test_uploads_run_in_bounded_pool(self, tmp_path):
+        """Test that uploads run concurrently, never more than the number of workers at once."""
+        for i in range(8):
+            (tmp_path / f"{i}.mp3").write_bytes(str(i).encode())
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def store(name, path):
+            with lock:
+                running.append(name)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(name)
+            return True
+
+        client = make_client()
+        client.store_media_file.side_effect = store
+
+        with MediaUploader(client, str(tmp_path), workers=3) as uploader:
+            for i in range(8):
+                uploader.rewrite(f"[sound:{i}.mp3]")
+
+        assert uploader.stats["uploaded"] == 8
+        assert 1 < max(peak) <= 3
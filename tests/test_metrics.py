@@ -0,0 +1,89 @@
+"""Tests for the metrics module."""
+
+import json
+
+import httpx
+import pytest
+
+from wb_anki.anki_client import AnkiConnectClient
+from wb_anki.fake_anki import FakeAnkiConnect
+from wb_anki.metrics import Metrics, percentile
+
+
+class TestMetrics:
+    """Test cases for Metrics class."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.95) == 95.0
+        assert percentile([], 0.5) == 0.0
+
+    def test_track_request(self):
+        """Test that requests are counted and failures are marked as errors."""
+        metrics = Metrics()
+
+        with metrics.track_request("deckNames"):
+            pass
+        with pytest.raises(ValueError):
+            with metrics.track_request("deckNames"):
+                raise ValueError("boom")
+
+        stats = metrics.to_dict()["actions"]["deckNames"]
+        assert stats["count"] == 2
+        assert stats["errors"] == 1
+
+    def test_phase_and_timed_iter(self):
+        """Test that phase time accumulates across blocks and lazy iteration."""
+        metrics = Metrics()
+
+        with metrics.phase("render"):
+            pass
+        assert list(metrics.timed_iter("parse", iter([1, 2, 3]))) == [1, 2, 3]
+
+        assert set(metrics.to_dict()["phases_ms"]) == {"render", "parse"}
+
+    def test_client_records_bytes(self):
+        """Test that a real client records request and response sizes per action."""
+        metrics = Metrics()
+
+        with FakeAnkiConnect() as anki:
+            with AnkiConnectClient(anki.url, metrics=metrics) as client:
+                client.get_deck_names()
+                client.add_notes("Default", [("hello", "hej")])
+
+        summary = metrics.to_dict()
+        assert summary["requests"] == 3
+        assert summary["actions"]["deckNames"]["bytes_sent"] > 0
+        assert summary["actions"]["addNotes"]["bytes_received"] > 0
+        assert summary["actions"]["canAddNotes"]["latency_ms"]["max"] > 0
+
+    def test_client_records_connection_errors(self):
+        """Test that every attempt of a failing request is counted as an error."""
+        metrics = Metrics()
+
+        def refuse(request):
+            raise httpx.ConnectError("refused")
+
+        transport = httpx.MockTransport(refuse)
+
+        with AnkiConnectClient("http://anki", metrics=metrics) as client:
+            client.client = httpx.Client(transport=transport, event_hooks=metrics.event_hooks())
+            with pytest.raises(Exception, match="Error connecting to Anki"):
+                client.get_deck_names()
+
+        assert metrics.to_dict()["actions"]["deckNames"]["errors"] == client.retry_policy.attempts
+
+    def test_write_json(self, tmp_path):
+        """Test writing the summary to a JSON file."""
+        metrics = Metrics()
+        with metrics.track_request("findNotes"):
+            pass
+
+        path = tmp_path / "metrics.json"
+        metrics.write_json(str(path))
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["actions"]["findNotes"]["count"] == 1
@@ -1,10 +1,25 @@
 """Tests for the word parser module."""
 
+import io
 from unittest.mock import mock_open, patch
 
+import click
 import pytest
 
-from wb_anki.parser import parse_word_pairs, read_input
+from wb_anki.parser import (
+    ParseSummary,
+    TableColumns,
+    collect_input_files,
+    iter_input,
+    iter_routed_pairs,
+    iter_table_rows,
+    iter_word_pairs,
+    parse_file,
+    parse_files,
+    parse_word_pairs,
+    read_input,
+    split_deck,
+)
 
 
 class TestParseWordPairs:
@@ -87,6 +102,201 @@ class TestParseWordPairs:
         assert result == expected
 
 
+class TestIterWordPairs:
+    """Test cases for iter_word_pairs function."""
+
+    def test_yields_lazily(self):
+        """Test that pairs are yielded before the rest of the input is read."""
+
+        def lines():
+            yield "hello - world"
+            raise AssertionError("input read too early")
+
+        pairs = iter_word_pairs(lines())
+
+        assert next(pairs) == ("hello", "world")
+
+    def test_matches_parse_word_pairs(self):
+        """Test that the lazy parser yields the same pairs as parse_word_pairs."""
+        lines = ["hello - world", "invalid", "", "foo\tbar"]
+
+        assert list(iter_word_pairs(lines)) == parse_word_pairs(lines)
+
+    def test_tab_shortcut_keeps_dash_precedence(self):
+        """Test that a dash delimiter before a tab still wins."""
+        lines = ["hello - world\tmore", "plain\ttab", "dash-word\ttranslation"]
+
+        assert parse_word_pairs(lines) == [
+            ("hello", "world\tmore"),
+            ("plain", "tab"),
+            ("dash-word", "translation"),
+        ]
+
+    def test_unicode_dashes(self):
+        """Test that en and em dashes are accepted as delimiters."""
+        assert parse_word_pairs(["hello – hej", "goodbye — hej då"]) == [("hello", "hej"), ("goodbye", "hej då")]
+
+    def test_skipped_lines_are_summarized(self):
+        """Test that skipped lines are collected instead of printed one by one."""
+        summary = ParseSummary()
+        lines = ["hello - world"] + ["bad line"] * 10
+
+        with patch("wb_anki.parser.console") as mock_console:
+            pairs = list(iter_word_pairs(lines, summary))
+            mock_console.print.assert_not_called()
+
+        assert pairs == [("hello", "world")]
+        assert summary.parsed == 1
+        assert summary.invalid_format == 10
+        assert summary.empty_field == 0
+        assert len(summary.examples) == ParseSummary.MAX_EXAMPLES
+
+    def test_summary_printed_once_without_collector(self):
+        """Test that the summary is printed when the input is exhausted."""
+        with patch("wb_anki.parser.console") as mock_console:
+            parse_word_pairs(["bad line"] * 3)
+
+        first_message = mock_console.print.call_args_list[0].args[0]
+        assert "Skipped 3 lines" in first_message
+
+
+class TestRoutedPairs:
+    """Test cases for split_deck and iter_routed_pairs functions."""
+
+    def test_split_deck_prefix(self):
+        """Test that a bracketed prefix names the deck."""
+        assert split_deck("[Swedish::Verbs] run - springa") == ("Swedish::Verbs", " run - springa")
+
+    def test_split_deck_tab_column(self):
+        """Test that the first of three tab-separated columns names the deck."""
+        assert split_deck("Spanish\thola\thej") == ("Spanish", "hola\thej")
+
+    def test_split_deck_without_deck(self):
+        """Test that plain lines and two-column tab lines have no deck."""
+        assert split_deck("hello - hej") == (None, "hello - hej")
+        assert split_deck("hello\thej") == (None, "hello\thej")
+        assert split_deck("[] hello - hej") == (None, "[] hello - hej")
+
+    def test_split_deck_media_tag_kept(self):
+        """Test that a leading media tag is part of the word, not a deck."""
+        assert split_deck("[sound:hej.mp3] hej - hi") == (None, "[sound:hej.mp3] hej - hi")
+        assert list(iter_routed_pairs(["[sound:hej.mp3] hej - hi\n"])) == [(None, "[sound:hej.mp3] hej", "hi")]
+
+    def test_iter_routed_pairs(self):
+        """Test that each pair carries the deck of its own line."""
+        lines = ["[Swedish::Verbs] run - springa", "Spanish\thola\thej", "bad line", "plain - x"]
+        summary = ParseSummary()
+
+        pairs = list(iter_routed_pairs(lines, summary))
+
+        assert pairs == [("Swedish::Verbs", "run", "springa"), ("Spanish", "hola", "hej"), (None, "plain", "x")]
+        assert summary.skipped == 1
+
+
+class TestTableRows:
+    """Test cases for TableColumns and iter_table_rows."""
+
+    def test_csv_with_header(self):
+        """Test that header names map columns to the front, back, tags, deck and extra fields."""
+        lines = [
+            "Deck,Translation,Word,Example,Tags\n",
+            'Swedish::Verbs,springa,run,"Jag springer, du går",verb motion\n',
+            ",hej,hello,,\n",
+        ]
+
+        rows = list(iter_table_rows(lines, "csv"))
+
+        assert rows == [
+            ("Swedish::Verbs", "run", "springa", ({"Example": "Jag springer, du går"}, ["verb", "motion"])),
+            (None, "hello", "hej", None),
+        ]
+
+    def test_tsv_without_header(self):
+        """Test that without a header the columns are front, back and tags, as Anki exports them."""
+        lines = ["hello\thej\n", "thanks\ttack\tpolite greeting\n"]
+
+        rows = list(iter_table_rows(lines, "tsv"))
+
+        assert rows == [(None, "hello", "hej", None), (None, "thanks", "tack", ({}, ["polite", "greeting"]))]
+
+    def test_quoted_fields_span_lines(self):
+        """Test that quoted fields keep delimiters, quotes and line breaks."""
+        lines = ["front,back\n", '"a, b","line one\n', 'line ""two"""\n']
+
+        rows = list(iter_table_rows(lines, "csv"))
+
+        assert rows == [(None, "a, b", 'line one\nline "two"', None)]
+
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_quoted_line_breaks_read_from_file(self, tmp_path, use_mmap):
+        """Test that line breaks inside quoted fields of a file reach the note as written."""
+        path = tmp_path / "words.csv"
+        path.write_bytes('word,translation\r\nhello,"hej\r\nhallå\rtjena"\r\nthanks,tack\r\n'.encode("utf-8"))
+
+        rows = list(iter_table_rows(iter_input(str(path), use_mmap, newline=""), "csv"))
+
+        assert rows == [(None, "hello", "hej\r\nhallå\rtjena", None), (None, "thanks", "tack", None)]
+
+    def test_skipped_rows_counted(self):
+        """Test that short rows and rows with an empty front or back are summarized."""
+        lines = ["word,translation\n", "\n", "lonely\n", " ,hej\n", "hello,hej\n"]
+        summary = ParseSummary()
+
+        rows = list(iter_table_rows(lines, "csv", summary))
+
+        assert rows == [(None, "hello", "hej", None)]
+        assert (summary.parsed, summary.invalid_format, summary.empty_field) == (1, 1, 1)
+        assert [line_num for line_num, _ in summary.examples] == [3, 4]
+
+    def test_invalid_csv_aborts(self):
+        """Test that input the csv reader rejects, such as an oversized field, aborts the parse."""
+        with pytest.raises(click.Abort):
+            list(iter_table_rows(["hello,hej\n", f"a,{'x' * 200_000}\n"], "csv"))
+
+    def test_header_requires_front_and_back(self):
+        """Test that a first row without both a front and a back name is data, not a header."""
+        assert TableColumns.from_header(["word", "tags"]) is None
+        columns = TableColumns.from_header(["Tags", "word", "back"])
+        assert (columns.front, columns.back, columns.tags, columns.fields) == (1, 2, 0, ())
+
+
+class TestIterInput:
+    """Test cases for iter_input function."""
+
+    def test_iter_from_file(self, tmp_path):
+        """Test lazily reading lines from a file."""
+        path = tmp_path / "words.txt"
+        path.write_text("hello - world\nfoo - bar", encoding="utf-8")
+
+        assert list(iter_input(str(path))) == ["hello - world\n", "foo - bar"]
+
+    def test_iter_from_nonexistent_file(self):
+        """Test that a missing file raises click.Abort once iterated."""
+        import click
+
+        with pytest.raises(click.Abort):
+            list(iter_input("nonexistent.txt"))
+
+    def test_iter_from_file_mmap(self, tmp_path):
+        """Test reading lines through a memory map."""
+        path = tmp_path / "words.txt"
+        path.write_text("hello - hej\ngoodbye - hej då\n", encoding="utf-8")
+
+        assert list(iter_input(str(path), use_mmap=True)) == ["hello - hej\n", "goodbye - hej då\n"]
+
+    def test_iter_from_empty_file_mmap(self, tmp_path):
+        """Test that an empty file yields no lines through a memory map."""
+        path = tmp_path / "empty.txt"
+        path.write_text("", encoding="utf-8")
+
+        assert list(iter_input(str(path), use_mmap=True)) == []
+
+    def test_iter_from_stdin(self):
+        """Test lazily reading from stdin."""
+        with patch("sys.stdin", io.StringIO("hello - world\n")):
+            assert list(iter_input(None)) == ["hello - world\n"]
+
+
 class TestReadInput:
     """Test cases for read_input function."""
 
@@ -117,3 +327,48 @@ class TestReadInput:
         expected = ["hello - world\n", "foo - bar\n"]
         assert result == expected
         mock_stdin.assert_called_once_with("stdin")
+
+
+class TestParseFiles:
+    """Test cases for multi-file parsing."""
+
+    def test_parse_file(self, tmp_path):
+        """Test parsing a whole file with a summary of skipped lines."""
+        path = tmp_path / "words.txt"
+        path.write_text("hello - hej\ninvalid\ngoodbye - hej då\n", encoding="utf-8")
+
+        pairs, summary = parse_file(str(path))
+
+        assert pairs == [("hello", "hej"), ("goodbye", "hej då")]
+        assert summary.skipped == 1
+
+    def test_parse_files_keeps_order(self, tmp_path):
+        """Test that files parsed in a process pool are yielded in input order."""
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"words{i}.txt"
+            path.write_text(f"word{i} - ord{i}\n", encoding="utf-8")
+            paths.append(str(path))
+
+        results = list(parse_files(paths, workers=2))
+
+        assert [path for path, _, _ in results] == paths
+        assert [pairs for _, pairs, _ in results] == [[(f"word{i}", f"ord{i}")] for i in range(5)]
+
+    def test_collect_input_files(self, tmp_path):
+        """Test combining explicit files with directory matches."""
+        (tmp_path / "b.txt").write_text("", encoding="utf-8")
+        (tmp_path / "a.txt").write_text("", encoding="utf-8")
+        (tmp_path / "notes.md").write_text("", encoding="utf-8")
+        explicit = str(tmp_path / "b.txt")
+
+        result = collect_input_files([explicit], str(tmp_path), "*.txt")
+
+        assert result == [explicit, str(tmp_path / "a.txt")]
+
+    def test_collect_input_files_recursive(self, tmp_path):
+        """Test recursive directory patterns."""
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "nested" / "words.txt").write_text("", encoding="utf-8")
+
+        assert collect_input_files([], str(tmp_path), "**/*.txt") == [str(tmp_path / "nested" / "words.txt")]
@@ -0,0 +1,59 @@
+"""Tests for the progress module."""
+
+import io
+import time
+
+from rich.console import Console
+
+from wb_anki.progress import ProgressReporter, format_duration
+
+
+def make_console(terminal):
+    """Build a console writing to a buffer."""
+    return Console(file=io.StringIO(), force_terminal=terminal, width=120)
+
+
+class TestFormatDuration:
+    """Test cases for format_duration function."""
+
+    def test_minutes_and_hours(self):
+        """Test formatting short and long durations."""
+        assert format_duration(75) == "1:15"
+        assert format_duration(3725) == "1:02:05"
+
+
+class TestProgressReporter:
+    """Test cases for ProgressReporter class."""
+
+    def test_log_lines_when_not_a_terminal(self):
+        """Test that non-terminal output gets periodic plain lines and a final line."""
+        console = make_console(terminal=False)
+
+        with ProgressReporter("Importing", total=10, console=console, log_interval=0.05) as progress:
+            progress.advance(4)
+            time.sleep(0.3)
+            progress.advance(6)
+
+        output = console.file.getvalue()
+        assert "Importing 4/10 pairs (" in output
+        assert "ETA" in output
+        assert output.splitlines()[-1].startswith("Processed 10 pairs in 0:00")
+
+    def test_live_display_on_terminal(self):
+        """Test that a terminal gets the live display with throughput."""
+        console = make_console(terminal=True)
+
+        with ProgressReporter("Importing", total=5, console=console, refresh_interval=0.01) as progress:
+            progress.advance(5)
+            time.sleep(0.05)
+
+        output = console.file.getvalue()
+        assert "5/5" in output
+        assert "pairs/s" in output
+
+    def test_eta(self):
+        """Test that the ETA is only known with a total."""
+        with ProgressReporter("Importing", console=make_console(terminal=False)) as progress:
+            progress.advance(3)
+            assert progress.eta() is None
+            assert progress.log_line().startswith("Importing 3 pairs (")
@@ -0,0 +1,159 @@
+"""Tests for the proxy module."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from wb_anki.anki_client import AnkiConnectClient, build_note
+from wb_anki.fake_anki import FakeAnkiConnect, FakeAnkiError
+from wb_anki.proxy import ProxyServer, RequestCoalescer
+
+
+@pytest.fixture
+def anki():
+    with FakeAnkiConnect(latency=0.01) as server:
+        server.seed("Swedish", [("hello", "hej")])
+        yield server
+
+
+@pytest.fixture
+def proxy(anki):
+    with AnkiConnectClient(anki.url) as client:
+        with ProxyServer(RequestCoalescer(client, window=0.02), port=0) as server:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            yield server
+            server.shutdown()
+
+
+def submit_concurrently(coalescer, requests):
+    with ThreadPoolExecutor(max_workers=len(requests)) as pool:
+        return list(pool.map(lambda request: coalescer.submit(*request), requests))
+
+
+class TestRequestCoalescer:
+    """Test cases for RequestCoalescer."""
+
+    def test_add_notes_coalesced(self, anki):
+        """Test that concurrent addNote calls reach Anki as one addNotes action with results fanned out."""
+        requests = [("addNote", {"note": build_note("Swedish", f"word {i}", f"ord {i}")}) for i in range(20)]
+        requests.append(("addNote", {"note": build_note("Swedish", "hello", "hallå")}))
+
+        with AnkiConnectClient(anki.url) as client:
+            coalescer = RequestCoalescer(client, window=0.05)
+            responses = submit_concurrently(coalescer, requests)
+            coalescer.close()
+
+        assert all(isinstance(response["result"], int) and response["error"] is None for response in responses[:20])
+        assert responses[20]["result"] is None and "duplicate" in responses[20]["error"]
+        assert anki.action_counts["addNotes"] < 5
+        assert coalescer.counts["requests"] == 21
+        assert coalescer.counts["upstream_requests"] == anki.request_counts["multi"]
+
+    def test_duplicate_note_fails_alone(self, anki, monkeypatch):
+        """Test that duplicates among coalesced notes fail only their own requests.
+
+        Like current AnkiConnect, the fake adds the valid notes of an addNotes action and
+        then fails the whole action when any note was rejected.
+        """
+        store_all = FakeAnkiConnect._action_addNotes
+
+        def strict_add_notes(server, params):
+            note_ids = store_all(server, params)
+            if None in note_ids:
+                raise FakeAnkiError("cannot create note because it is a duplicate")
+            return note_ids
+
+        monkeypatch.setattr(FakeAnkiConnect, "_action_addNotes", strict_add_notes)
+        requests = [("addNote", {"note": build_note("Swedish", f"word {i}", f"ord {i}")}) for i in range(10)]
+        requests.append(("addNote", {"note": build_note("Swedish", "hello", "hallå")}))
+        requests += [("addNote", {"note": build_note("Swedish", "thanks", "tack")})] * 2
+
+        with AnkiConnectClient(anki.url) as client:
+            coalescer = RequestCoalescer(client, window=0.05)
+            responses = submit_concurrently(coalescer, requests)
+            coalescer.close()
+
+        assert all(isinstance(response["result"], int) for response in responses[:10])
+        assert "duplicate" in responses[10]["error"]
+        thanks = sorted(responses[11:], key=lambda response: response["error"] is not None)
+        assert isinstance(thanks[0]["result"], int) and "duplicate" in thanks[1]["error"]
+        assert len(anki.notes) == 12
+
+    def test_add_note_without_note_rejected(self, anki):
+        """Test that an addNote request without a note is answered without reaching Anki."""
+        with AnkiConnectClient(anki.url) as client:
+            coalescer = RequestCoalescer(client, window=0.01)
+            response = coalescer.submit("addNote", {})
+            coalescer.close()
+
+        assert "requires a note" in response["error"]
+        assert anki.request_counts["multi"] == 0
+
+    def test_identical_queries_sent_once(self, anki):
+        """Test that identical idempotent requests in a batch share one upstream action."""
+        query = ("findNotes", {"query": 'deck:"Swedish"'})
+
+        with AnkiConnectClient(anki.url) as client:
+            coalescer = RequestCoalescer(client, window=0.05)
+            responses = submit_concurrently(coalescer, [query] * 10 + [("deckNames", {})])
+            coalescer.close()
+
+        assert all(response == responses[0] for response in responses[:10])
+        assert len(responses[0]["result"]) == 1
+        assert "Swedish" in responses[10]["result"]
+        assert anki.action_counts["findNotes"] < 10
+
+    def test_errors_returned_per_request(self, anki):
+        """Test that one failing request does not fail the others of its batch."""
+        with AnkiConnectClient(anki.url) as client:
+            coalescer = RequestCoalescer(client, window=0.05)
+            missing, decks = submit_concurrently(coalescer, [("noSuchAction", {}), ("deckNames", {})])
+            coalescer.close()
+
+        assert missing["result"] is None and missing["error"]
+        assert decks["error"] is None
+
+    def test_upstream_failure_fails_batch(self):
+        """Test that every request of a batch gets the error when Anki cannot be reached."""
+        with AnkiConnectClient("http://127.0.0.1:9") as client:
+            client.retry_policy.attempts = 1
+            coalescer = RequestCoalescer(client, window=0.01)
+            responses = submit_concurrently(coalescer, [("deckNames", {}), ("addNote", {"note": {}})])
+            coalescer.close()
+
+        assert all(response["result"] is None and response["error"] for response in responses)
+
+
+class TestProxyServer:
+    """Test cases for ProxyServer."""
+
+    def test_clients_use_proxy_like_ankiconnect(self, anki, proxy):
+        """Test that an unchanged client works through the proxy, including its own multi requests."""
+        with AnkiConnectClient(proxy.url) as client:
+            assert client.deck_exists("Swedish")
+            assert client.add_notes("Swedish", [("thanks", "tack"), ("hello", "hej")]) == [True, False]
+            assert client.add_note("Swedish", "yes", "ja")
+            assert client.get_existing_fronts("Swedish") == {"hello", "thanks", "yes"}
+
+    def test_many_producers_share_upstream_requests(self, anki, proxy):
+        """Test that concurrent producers are served with fewer upstream requests than they send."""
+
+        def produce(worker):
+            with AnkiConnectClient(proxy.url) as client:
+                return [client.add_note("Swedish", f"word {worker} {i}", "ord") for i in range(5)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(produce, range(8)))
+
+        assert all(all(added) for added in results)
+        assert len(anki.notes) == 41
+        assert anki.request_counts["multi"] < 40
+
+    def test_invalid_json_rejected(self, proxy):
+        """Test that a malformed request gets an AnkiConnect-style error."""
+        response = httpx.post(proxy.url, content=b"not json")
+
+        assert response.json()["error"].startswith("invalid request")
@@ -0,0 +1,90 @@
+"""Tests for the report module."""
+
+import csv
+import json
+
+import pytest
+
+from wb_anki.report import SilentReport, TableReport, create_report
+
+
+class TestTableReport:
+    """Test cases for TableReport class."""
+
+    def test_small_reports_show_every_row(self, capsys):
+        """Test that all rows are shown when they fit."""
+        report = TableReport(max_rows=5)
+        report.record("hello", "hej", "added")
+        report.record("bye", "hej då", "exists")
+        report.close()
+
+        output = capsys.readouterr().out
+        assert "Processing Results" in output
+        assert "hello" in output and "bye" in output
+        assert "1 added, 1 already existed, 0 failed" in output
+
+    def test_large_reports_show_only_problems(self, capsys):
+        """Test that only pairs not added are kept once rows exceed the cap."""
+        report = TableReport(max_rows=3)
+        for i in range(100):
+            report.record(f"word{i}", "x", "error" if i == 50 else "added")
+        report.close()
+
+        output = capsys.readouterr().out
+        assert len(report.rows) == 3
+        assert report.problem_rows == [("word50", "x", "error")]
+        assert "Pairs Not Added" in output
+        assert "99 more rows not shown" in output
+
+
+class TestFileReports:
+    """Test cases for the streamed JSON and CSV reports."""
+
+    def test_json_report(self, tmp_path):
+        """Test that the JSON report is a valid array of results."""
+        path = tmp_path / "report.json"
+        report = create_report("json", str(path))
+        report.record("hello", "hej", "added")
+        report.record("café", "kafé", "error")
+        report.close()
+
+        assert json.loads(path.read_text(encoding="utf-8")) == [
+            {"front": "hello", "back": "hej", "status": "added"},
+            {"front": "café", "back": "kafé", "status": "error"},
+        ]
+
+    def test_empty_json_report(self, tmp_path):
+        """Test that a JSON report without rows is an empty array."""
+        path = tmp_path / "report.json"
+        create_report("json", str(path)).close()
+
+        assert json.loads(path.read_text(encoding="utf-8")) == []
+
+    def test_csv_report(self, tmp_path):
+        """Test that the CSV report has a header and one row per result."""
+        path = tmp_path / "report.csv"
+        report = create_report("csv", str(path))
+        report.record("hello, world", "hej", "exists")
+        report.close()
+
+        with open(path, newline="", encoding="utf-8") as f:
+            assert list(csv.reader(f)) == [["front", "back", "status"], ["hello, world", "hej", "exists"]]
+
+    def test_file_modes_require_path(self):
+        """Test that file modes cannot be created without a path."""
+        with pytest.raises(ValueError, match="requires --report-file"):
+            create_report("csv")
+
+
+class TestSilentReport:
+    """Test cases for SilentReport class."""
+
+    def test_prints_nothing(self, capsys):
+        """Test that the silent report only counts results."""
+        report = create_report("none")
+        report.record("hello", "hej", "added")
+        report.close()
+
+        assert isinstance(report, SilentReport)
+        assert report.stats["added"] == 1
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,55 @@
+"""Tests for the results module."""
+
+import sys
+
+import pytest
+
+from wb_anki.results import ResultStore
+
+
+class TestResultStore:
+    """Test cases for ResultStore."""
+
+    def test_rows_round_trip(self):
+        """Test that rows come back in input order with their statuses."""
+        rows = [("hello", "hej", "added"), ("thanks", "tack", "exists"), ("yes", "ja", "error")]
+
+        results = ResultStore(rows)
+
+        assert len(results) == 3
+        assert list(results) == rows
+        assert results.pair(1) == ("thanks", "tack")
+        assert list(results.rows(1, 2)) == [("thanks", "tack", "exists")]
+        assert list(results.status_names(1)) == ["exists", "error"]
+
+    def test_set_status_and_stats(self):
+        """Test that statuses can be changed and are counted per status."""
+        results = ResultStore()
+        first = results.append("hello", "hej", "error")
+        results.append("thanks", "tack", "exists")
+
+        results.set_status(first, "added")
+
+        assert results.stats() == {"added": 1, "exists": 1, "error": 0}
+        assert results.stats(["updated"]) == {"updated": 0}
+
+    def test_strings_are_shared(self):
+        """Test that the store references the pair's strings instead of copying them."""
+        front, back = "".join(["hel", "lo"]), "".join(["h", "ej"])
+        results = ResultStore([(front, back, "added")])
+
+        stored_front, stored_back = results.pair(0)
+
+        assert stored_front is front and stored_back is back
+
+    def test_unknown_status_rejected(self):
+        """Test that only known statuses can be recorded."""
+        with pytest.raises(KeyError):
+            ResultStore().append("hello", "hej", "skipped")
+
+    def test_smaller_than_tuples(self):
+        """Test that the store uses well under half the memory of a list of tuples."""
+        rows = [(f"word {i}", f"ord {i}", "added") for i in range(10_000)]
+        tuples = sys.getsizeof(rows) + sum(sys.getsizeof(row) for row in rows)
+
+        assert ResultStore(rows).nbytes() < tuples / 2
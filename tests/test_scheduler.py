@@ -0,0 +1,107 @@
+"""Tests for scheduler module."""
+
+import asyncio
+
+from wb_anki.scheduler import AdaptiveLimiter, AIMDController, RetryPolicy, is_idempotent
+
+
+class TestIsIdempotent:
+    """Test cases for is_idempotent function."""
+
+    def test_single_actions(self):
+        """Test that reads are idempotent and note creation is not."""
+        assert is_idempotent("findNotes") is True
+        assert is_idempotent("addNotes") is False
+
+    def test_multi(self):
+        """Test that a multi request is idempotent only if all its actions are."""
+        reads = {"actions": [{"action": "deckNames"}, {"action": "findNotes"}]}
+        mixed = {"actions": [{"action": "deckNames"}, {"action": "addNote"}]}
+
+        assert is_idempotent("multi", reads) is True
+        assert is_idempotent("multi", mixed) is False
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy class."""
+
+    def test_delay_is_capped_exponential_jitter(self):
+        """Test that delays stay within the exponential bound and the cap."""
+        policy = RetryPolicy(attempts=5, base_delay=0.5, max_delay=2.0, seed=1)
+        # The test suite disables backoff, so call the real implementation
+        delay = RetryPolicy.__dict__["delay"]
+
+        for attempt in range(6):
+            assert 0 <= delay(policy, attempt) <= min(2.0, 0.5 * 2**attempt)
+
+    def test_default_attempts(self):
+        """Test that attempts default to one more than the configured retries."""
+        assert RetryPolicy().attempts >= 1
+
+
+class TestAIMDController:
+    """Test cases for AIMDController class."""
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """Test growing on fast responses and halving on slow or failed ones."""
+        controller = AIMDController(10, maximum=20, step=5, target_latency=1.0)
+
+        assert controller.record(0.1) == 15
+        assert controller.record(0.1) == 20
+        assert controller.record(0.1) == 20
+        assert controller.record(2.0) == 10
+        assert controller.record(0.1, failed=True) == 5
+
+    def test_minimum(self):
+        """Test that the value never drops below the minimum."""
+        controller = AIMDController(2, minimum=1, target_latency=1.0)
+
+        for _ in range(5):
+            controller.record(0.0, failed=True)
+
+        assert controller.value == 1
+
+    def test_fixed(self):
+        """Test that a fixed controller ignores outcomes."""
+        controller = AIMDController.fixed(7)
+
+        controller.record(0.0)
+        controller.record(10.0, failed=True)
+
+        assert controller.value == 7
+
+
+class TestAdaptiveLimiter:
+    """Test cases for AdaptiveLimiter class."""
+
+    def test_limits_in_flight_requests(self):
+        """Test that no more requests than the current limit run at once."""
+        limiter = AdaptiveLimiter(AIMDController.fixed(2))
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            await limiter.acquire()
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+            await limiter.release(0.01)
+
+        async def run():
+            await asyncio.gather(*(request() for _ in range(6)))
+
+        asyncio.run(run())
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    def test_failures_shrink_limit(self):
+        """Test that failed requests lower the concurrency limit."""
+        limiter = AdaptiveLimiter(AIMDController(4))
+
+        async def run():
+            await limiter.acquire()
+            await limiter.release(0.0, failed=True)
+
+        asyncio.run(run())
+
+        assert limiter.controller.value == 2
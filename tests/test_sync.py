@@ -0,0 +1,84 @@
+"""Tests for the sync module."""
+
+from unittest.mock import Mock
+
+from wb_anki.report import Report
+from wb_anki.sync import apply_sync, diff_deck
+
+DECK_NOTES = [(1, "hello", "hej"), (2, "thanks", "tack"), (3, "old", "gammal"), (4, "Hello", "hallå")]
+
+
+class TestDiffDeck:
+    """Test cases for diff_deck function."""
+
+    def test_three_way_diff(self):
+        """Test that pairs are split into new, changed and unchanged, and absent notes into missing."""
+        plan = diff_deck([("Hello", "hej"), ("thanks", "tack så mycket"), ("yes", "ja")], DECK_NOTES)
+
+        assert plan.new == [("yes", "ja")]
+        assert plan.changed == [(2, "thanks", "tack", "tack så mycket")]
+        assert plan.unchanged == [("Hello", "hej")]
+        assert plan.missing == [(3, "old", "gammal")]
+        assert plan.describe() == "1 new, 1 changed, 1 unchanged, 1 missing from the input"
+
+    def test_without_casefold(self):
+        """Test that fronts differing in case are distinct notes without casefolding."""
+        plan = diff_deck([("Hello", "hallå")], DECK_NOTES, casefold=False)
+
+        assert plan.unchanged == [("Hello", "hallå")]
+        assert [note_id for note_id, _, _ in plan.missing] == [1, 2, 3]
+
+    def test_backs_compared_normalized(self):
+        """Test that whitespace differences in the back are not changes."""
+        plan = diff_deck([("hello", " hej ")], [(1, "hello", "hej")])
+
+        assert plan.changed == []
+        assert plan.unchanged == [("hello", " hej ")]
+
+
+class TestApplySync:
+    """Test cases for apply_sync function."""
+
+    def make_client(self):
+        """Build a mocked client accepting every change."""
+        client = Mock()
+        client.add_notes.return_value = [True]
+        client.update_backs.return_value = [True]
+        client.delete_notes.return_value = True
+        return client
+
+    def test_applies_changes_in_batches(self):
+        """Test that each kind of change is applied with one batched call."""
+        client = self.make_client()
+        plan = diff_deck([("hello", "hallå"), ("yes", "ja"), ("thanks", "tack")], DECK_NOTES[:3])
+        report = Report()
+
+        stats = apply_sync(client, "Swedish", plan, batch_size=50, prune=True, report=report)
+
+        client.add_notes.assert_called_once_with("Swedish", [("yes", "ja")], 50)
+        client.update_backs.assert_called_once_with([(1, "hallå")], 50)
+        client.delete_notes.assert_called_once_with([3])
+        assert stats == {"added": 1, "exists": 1, "updated": 1, "deleted": 1, "error": 0}
+        assert report.stats == stats
+
+    def test_missing_notes_kept_without_prune(self):
+        """Test that notes missing from the input are not deleted unless pruning."""
+        client = self.make_client()
+
+        stats = apply_sync(client, "Swedish", diff_deck([("hello", "hej")], DECK_NOTES[:3]))
+
+        client.add_notes.assert_not_called()
+        client.update_backs.assert_not_called()
+        client.delete_notes.assert_not_called()
+        assert stats["exists"] == 1
+        assert stats["deleted"] == 0
+
+    def test_failed_changes_are_errors(self):
+        """Test that changes rejected by Anki are counted as errors."""
+        client = self.make_client()
+        client.update_backs.return_value = [False]
+        client.delete_notes.return_value = False
+
+        stats = apply_sync(client, "Swedish", diff_deck([("hello", "hallå")], DECK_NOTES[:3]), prune=True)
+
+        assert stats["error"] == 3
@@ -0,0 +1,168 @@
+"""Tests for the watch module."""
+
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from wb_anki.watch import InboxTail, PipeReader, open_inbox, watch_inbox
+
+
+class ListInbox:
+    """Inbox returning prepared groups of lines, one group per read."""
+
+    def __init__(self, *reads):
+        self.reads = list(reads)
+
+    def read(self):
+        return self.reads.pop(0) if self.reads else []
+
+
+class TestInboxTail:
+    """Test cases for InboxTail class."""
+
+    def test_reads_appended_lines(self, tmp_path):
+        """Test that each read returns only lines appended since the last one."""
+        words = tmp_path / "words.txt"
+        words.write_text("hello - hej\n", encoding="utf-8")
+        inbox = InboxTail(str(tmp_path))
+
+        assert inbox.read() == ["hello - hej\n"]
+        assert inbox.read() == []
+
+        with open(words, "a", encoding="utf-8") as f:
+            f.write("thanks - tack\n")
+        assert inbox.read() == ["thanks - tack\n"]
+
+    def test_waits_for_complete_lines(self, tmp_path):
+        """Test that a line without a newline is held back until it is finished."""
+        words = tmp_path / "words.txt"
+        words.write_text("hello - h", encoding="utf-8")
+        inbox = InboxTail(str(tmp_path))
+
+        assert inbox.read() == []
+        with open(words, "a", encoding="utf-8") as f:
+            f.write("ej\n")
+        assert inbox.read() == ["hello - hej\n"]
+
+    def test_truncated_file_is_read_again(self, tmp_path):
+        """Test that a file replaced by a shorter one is read from the start."""
+        words = tmp_path / "words.txt"
+        words.write_text("hello - hej\nthanks - tack\n", encoding="utf-8")
+        inbox = InboxTail(str(tmp_path))
+        inbox.read()
+
+        words.write_text("yes - ja\n", encoding="utf-8")
+        assert inbox.read() == ["yes - ja\n"]
+
+    def test_follows_new_files_matching_pattern(self, tmp_path):
+        """Test that files created later are picked up and other files are ignored."""
+        inbox = InboxTail(str(tmp_path))
+        assert inbox.read() == []
+
+        (tmp_path / "new.txt").write_text("yes - ja\n", encoding="utf-8")
+        (tmp_path / "notes.md").write_text("no - nej\n", encoding="utf-8")
+        assert inbox.read() == ["yes - ja\n"]
+
+
+class TestOpenInbox:
+    """Test cases for open_inbox function."""
+
+    def test_directory(self, tmp_path):
+        """Test that a directory is followed file by file."""
+        assert isinstance(open_inbox(str(tmp_path)), InboxTail)
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="named pipes are not supported")
+    def test_named_pipe(self, tmp_path):
+        """Test that lines written to a named pipe are read."""
+        pipe = tmp_path / "inbox"
+        os.mkfifo(pipe)
+        inbox = open_inbox(str(pipe))
+        assert isinstance(inbox, PipeReader)
+
+        with open(pipe, "w", encoding="utf-8") as f:
+            f.write("hello - hej\n")
+
+        lines = inbox.read()
+        while not lines:
+            lines = inbox.read()
+        assert lines == ["hello - hej\n"]
+
+
+class TestWatchInbox:
+    """Test cases for watch_inbox function."""
+
+    def test_burst_is_handled_once(self):
+        """Test that lines arriving together are handled as one batch after the pause."""
+        batches = []
+        stop = threading.Event()
+
+        def handle(lines):
+            batches.append(lines)
+            stop.set()
+            return []
+
+        clock = iter([0.0, 0.5])
+        with patch("wb_anki.watch.time.monotonic", side_effect=lambda: next(clock, 5.0)):
+            watch_inbox(ListInbox(["a - 1\n"], ["b - 2\n"]), handle, debounce=1, poll_interval=0, stop=stop)
+
+        assert batches == [["a - 1\n", "b - 2\n"]]
+
+    def test_max_pending_handles_without_pause(self):
+        """Test that a full batch is handled while lines keep arriving."""
+        batches = []
+        inbox = ListInbox(["a\n", "b\n"], ["c\n", "d\n"])
+        stop = threading.Event()
+
+        def handle(lines):
+            batches.append(lines)
+            if not inbox.reads:
+                stop.set()
+            return []
+
+        watch_inbox(inbox, handle, debounce=60, poll_interval=0, max_pending=2, stop=stop)
+
+        assert batches == [["a\n", "b\n"], ["c\n", "d\n"]]
+
+    def test_failed_lines_are_kept(self):
+        """Test that the lines the handler keeps are handled again with the next lines."""
+        batches = []
+        stop = threading.Event()
+
+        def handle(lines):
+            batches.append(list(lines))
+            if len(batches) == 2:
+                stop.set()
+            return lines[1:] if len(batches) == 1 else []
+
+        watch_inbox(ListInbox(["a\n", "b\n"], ["c\n"]), handle, debounce=0, poll_interval=0, stop=stop)
+
+        assert batches == [["a\n", "b\n"], ["b\n", "c\n"]]
+
+    def test_kept_lines_wait_for_pause(self):
+        """Test that kept lines do not count towards max_pending, so they are not retried on every poll."""
+        batches = []
+        inbox = ListInbox(["a\n", "b\n"], ["c\n"], ["d\n"])
+        stop = threading.Event()
+
+        def handle(lines):
+            batches.append(list(lines))
+            if not inbox.reads:
+                stop.set()
+                return []
+            return lines
+
+        watch_inbox(inbox, handle, debounce=60, poll_interval=0, max_pending=2, stop=stop)
+
+        assert batches == [["a\n", "b\n"], ["a\n", "b\n", "c\n", "d\n"]]
+
+    def test_pending_lines_handled_on_stop(self):
+        """Test that pending lines are not lost when the watch stops."""
+        batches = []
+        stop = threading.Event()
+        stop.set()
+
+        watch_inbox(ListInbox(["a\n"]), lambda lines: batches.append(lines) or [], debounce=60, stop=stop)
+
+        assert batches == [["a\n"]]
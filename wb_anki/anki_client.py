@@ -1,18 +1,262 @@
 """AnkiConnect client module for interacting with Anki API."""
 
-from typing import Any, Dict, List, Optional
+import base64
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import httpx
 
 from .config import Config
+from .dedup import normalize_front, normalize_text
+from .metrics import Metrics
+from .scheduler import RetryPolicy, is_idempotent
+
+
+class AnkiConnectError(Exception):
+    """Error returned by AnkiConnect or raised while talking to it."""
+
+
+class AnkiTransientError(AnkiConnectError):
+    """Failure that may go away when retried, such as a timeout while Anki is busy or syncing."""
+
+
+def deck_query(deck_name: str, subdecks: bool = True) -> str:
+    """Build the search query matching all notes in a deck, and in its subdecks unless disabled."""
+    if subdecks:
+        return f'deck:"{deck_name}"'
+    return f'deck:"{deck_name}" -deck:"{deck_name}::*"'
+
+
+def build_payload(action: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the JSON payload of an AnkiConnect action."""
+    return {"action": action, "version": 6, "params": params or {}}
+
+
+def parse_response(response: httpx.Response) -> Dict[str, Any]:
+    """Decode an AnkiConnect response, raising on HTTP and API errors."""
+    response.raise_for_status()
+    data = response.json()
+
+    if data.get("error"):
+        raise Exception(data["error"])
+
+    return data  # type: ignore[no-any-return]
+
+
+def translate_error(error: Exception) -> AnkiConnectError:
+    """Map an exception raised while making a request to an AnkiConnect error type."""
+    if isinstance(error, AnkiConnectError):
+        return error
+    if isinstance(error, httpx.RequestError):
+        return AnkiTransientError(f"Error connecting to Anki: {error}")
+    if isinstance(error, httpx.HTTPStatusError) and error.response.status_code >= 500:
+        return AnkiTransientError(f"API Error: {error}")
+    return AnkiConnectError(f"API Error: {error}")
+
+
+def build_note(
+    deck_name: str, front: str, back: str, extras: Optional[Tuple[Dict[str, str], List[str]]] = None
+) -> Dict[str, Any]:
+    """Build the note payload for a bidirectional card.
+
+    ``extras`` holds fields beyond Front and Back, set when the note type has them and
+    ignored otherwise as AnkiConnect does, and tags added next to ``wb_anki``.
+    """
+    fields = {"Front": front, "Back": back}
+    tags = ["wb_anki"]
+    if extras:
+        fields = {**extras[0], **fields}
+        tags.extend(extras[1])
+    return {
+        "deckName": deck_name,
+        "modelName": "Basic (and reversed card)",
+        "fields": fields,
+        "options": {"allowDuplicate": False},
+        "tags": tags,
+    }
+
+
+def note_fronts(notes: List[Dict[str, Any]], casefold: bool = True) -> Set[str]:
+    """Extract the normalized Front values from notesInfo results."""
+    fronts = set()
+    for note in notes:
+        front = note.get("fields", {}).get("Front", {}).get("value")
+        if front is not None:
+            fronts.add(normalize_front(front, casefold))
+    return fronts
+
+
+def note_contents(notes: List[Dict[str, Any]]) -> List[Tuple[int, str, str]]:
+    """Extract note IDs with their normalized Front and Back values from notesInfo results.
+
+    Notes without a Front field are skipped.
+    """
+    contents = []
+    for note in notes:
+        fields = note.get("fields", {})
+        front = fields.get("Front", {}).get("value")
+        if front is not None:
+            contents.append(
+                (note["noteId"], normalize_text(front), normalize_text(fields.get("Back", {}).get("value", "")))
+            )
+    return contents
+
+
+class PendingResult:
+    """Deferred result of an action queued in a RequestBatch."""
+
+    def __init__(self, action: str):
+        self.action = action
+        self.done = False
+        self._result: Any = None
+        self._error: Optional[str] = None
+
+    def _resolve(self, result: Any = None, error: Optional[str] = None) -> None:
+        self._result = result
+        self._error = error
+        self.done = True
+
+    @property
+    def error(self) -> Optional[str]:
+        """Error message AnkiConnect returned for the action, if it failed."""
+        return self._error
+
+    def result(self) -> Any:
+        """Return the action result, raising if the action failed or was never sent."""
+        if not self.done:
+            raise RuntimeError(f"Action '{self.action}' has not been flushed yet")
+        if self._error:
+            raise Exception(f"API Error: {self._error}")
+        return self._result
+
+
+class ActionQueue:
+    """Queue of AnkiConnect actions to be sent together as a single multi request."""
+
+    def __init__(self) -> None:
+        self._actions: List[Dict[str, Any]] = []
+        self._pending: List[PendingResult] = []
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def add(self, action: str, params: Optional[Dict[str, Any]] = None) -> PendingResult:
+        """Queue an action and return a handle to its future result."""
+        pending = PendingResult(action)
+        self._actions.append(build_payload(action, params))
+        self._pending.append(pending)
+        return pending
+
+    def _take(self) -> Tuple[List[Dict[str, Any]], List[PendingResult]]:
+        """Remove and return the queued actions with their pending results."""
+        taken = self._actions, self._pending
+        self._actions, self._pending = [], []
+        return taken
+
+    @staticmethod
+    def _fail(pending: List[PendingResult], error: Exception) -> None:
+        for item in pending:
+            item._resolve(error=str(error))
+
+    @staticmethod
+    def _resolve_all(pending: List[PendingResult], results: List[Any]) -> None:
+        for index, item in enumerate(pending):
+            if index >= len(results):
+                item._resolve(error="missing result in multi response")
+                continue
+            outcome = results[index]
+            if isinstance(outcome, dict) and "error" in outcome:
+                item._resolve(outcome.get("result"), outcome.get("error"))
+            else:
+                item._resolve(outcome)
+
+
+class RequestBatch(ActionQueue):
+    """Batch of actions flushed through an AnkiConnectClient."""
+
+    def __init__(self, client: "AnkiConnectClient"):
+        super().__init__()
+        self.client = client
+
+    def flush(self) -> None:
+        """Send all queued actions and resolve their results.
+
+        Per-action errors are stored on the corresponding PendingResult; a failure of the
+        multi request itself marks every queued action as failed and is re-raised.
+        """
+        if not self:
+            return
+
+        actions, pending = self._take()
+        try:
+            results = self.client._make_request("multi", {"actions": actions}).get("result") or []
+        except Exception as e:
+            self._fail(pending, e)
+            raise
+
+        self._resolve_all(pending, results)
+
+
+class DeckRegistry:
+    """Client-side mapping of deck names to IDs, considered fresh for ``ttl`` seconds.
+
+    Clients fill it from deckNamesAndIds and keep it up to date when they create decks,
+    so checking decks does not download the whole deck list every time.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl if ttl is not None else Config.DECK_CACHE_TTL
+        self.decks: Dict[str, int] = {}
+        self.fetched_at: Optional[float] = None
+
+    def is_fresh(self) -> bool:
+        """Check whether the mapping was fetched less than ``ttl`` seconds ago."""
+        return self.fetched_at is not None and time.monotonic() - self.fetched_at < self.ttl
+
+    def update(self, decks: Dict[str, int]) -> None:
+        """Replace the mapping with a deckNamesAndIds result."""
+        self.decks = dict(decks)
+        self.fetched_at = time.monotonic()
+
+    def add(self, deck_name: str, deck_id: int) -> None:
+        """Record a deck created by this client.
+
+        Creating a nested deck also creates missing parents, whose IDs are unknown, so
+        the mapping is marked stale in that case.
+        """
+        self.decks[deck_name] = deck_id
+        parents = deck_name.split("::")[:-1]
+        if any("::".join(parents[: i + 1]) not in self.decks for i in range(len(parents))):
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Force the next lookup to fetch the mapping again."""
+        self.fetched_at = None
+
+    def missing(self, deck_names: Iterable[str]) -> List[str]:
+        """Get the distinct deck names that are not in the mapping, in order."""
+        return [name for name in dict.fromkeys(deck_names) if name not in self.decks]
 
 
 class AnkiConnectClient:
     """Client for interacting with AnkiConnect API."""
 
-    def __init__(self, anki_url: Optional[str] = None):
+    NOTES_INFO_CHUNK_SIZE = 500
+
+    def __init__(
+        self,
+        anki_url: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         self.anki_url = anki_url or Config.ANKI_URL
-        self.client = httpx.Client(timeout=Config.TIMEOUT)
+        self.metrics = metrics or Metrics()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.decks = DeckRegistry()
+        # Extra fields and tags of the notes to add, by front, see build_note
+        self.note_extras: Dict[str, Tuple[Dict[str, str], List[str]]] = {}
+        self.client = httpx.Client(timeout=Config.TIMEOUT, event_hooks=self.metrics.event_hooks())
 
     def __enter__(self) -> "AnkiConnectClient":
         return self
@@ -21,68 +265,292 @@ class AnkiConnectClient:
         self.client.close()
 
     def _make_request(self, action: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make a request to AnkiConnect API."""
-        payload = {"action": action, "version": 6, "params": params or {}}
+        """Make a request to AnkiConnect API.
 
-        try:
-            response = self.client.post(self.anki_url, json=payload)
-            response.raise_for_status()
-            data = response.json()
+        Idempotent actions are retried with jittered exponential backoff after transient failures.
+        """
+        payload = build_payload(action, params)
+        attempts = self.retry_policy.attempts if is_idempotent(action, params) else 1
+        attempt = 0
 
-            if data.get("error"):
-                raise Exception(data["error"])
+        while True:
+            try:
+                return self._send(action, payload)
+            except AnkiTransientError:
+                attempt += 1
+                if attempt >= attempts:
+                    raise
+                time.sleep(self.retry_policy.delay(attempt - 1))
 
-            return data  # type: ignore[no-any-return]
-        except httpx.RequestError as e:
-            raise Exception(f"Error connecting to Anki: {e}")
-        except Exception as e:
-            raise Exception(f"API Error: {e}")
+    def _send(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request, translating failures to AnkiConnect error types."""
+        with self.metrics.track_request(action):
+            try:
+                response = self.client.post(self.anki_url, json=payload)
+                return parse_response(response)
+            except Exception as e:
+                raise translate_error(e) from e
+
+    @contextmanager
+    def batch(self) -> Iterator[RequestBatch]:
+        """Queue actions and send them as one multi request when the block exits.
+
+        Example:
+            >>> with client.batch() as batch:
+            ...     decks = batch.add("deckNames")
+            ...     notes = batch.add("findNotes", {"query": 'deck:"Swedish"'})
+            >>> decks.result(), notes.result()
+        """
+        batch = RequestBatch(self)
+        yield batch
+        batch.flush()
 
     def get_deck_names(self) -> List[str]:
         """Get list of all deck names."""
         result = self._make_request("deckNames")
         return result.get("result", [])  # type: ignore[no-any-return]
 
+    def get_deck_ids(self) -> Dict[str, int]:
+        """Get the mapping of deck names to IDs, from the deck registry while it is fresh."""
+        if not self.decks.is_fresh():
+            result = self._make_request("deckNamesAndIds")
+            self.decks.update(result.get("result") or {})
+        return self.decks.decks
+
     def deck_exists(self, deck_name: str) -> bool:
         """Check if a deck exists."""
-        return deck_name in self.get_deck_names()
+        return deck_name in self.get_deck_ids()
 
     def create_deck(self, deck_name: str) -> bool:
         """Create a new deck."""
         try:
             result = self._make_request("createDeck", {"deck": deck_name})
-            return result.get("error") is None
         except Exception:
             return False
 
-    def find_notes(self, query: str) -> List[str]:
+        if result.get("error") is not None:
+            return False
+        self.decks.add(deck_name, result["result"])
+        return True
+
+    def create_decks(self, deck_names: Iterable[str]) -> Dict[str, bool]:
+        """Create every missing deck of a list in a single multi request.
+
+        Returns:
+            One flag per distinct deck name telling whether it exists afterwards
+        """
+        deck_names = list(dict.fromkeys(deck_names))
+        missing = self.decks.missing(deck_names) if self.decks.is_fresh() else deck_names
+        created = {name: name not in missing for name in deck_names}
+        if not missing:
+            return created
+
+        try:
+            with self.batch() as batch:
+                pending = [(name, batch.add("createDeck", {"deck": name})) for name in missing]
+        except Exception:
+            return created
+
+        for name, deck_id in pending:
+            try:
+                self.decks.add(name, deck_id.result())
+                created[name] = True
+            except Exception:
+                pass
+        return created
+
+    def find_notes(self, query: str) -> List[int]:
         """Find notes matching a query."""
         result = self._make_request("findNotes", {"query": query})
         return result.get("result", [])  # type: ignore[no-any-return]
 
+    def notes_info(self, note_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get fields and metadata for the given note IDs."""
+        result = self._make_request("notesInfo", {"notes": note_ids})
+        return result.get("result", [])  # type: ignore[no-any-return]
+
+    def get_existing_fronts(
+        self,
+        deck_name: str,
+        chunk_size: Optional[int] = None,
+        note_ids: Optional[List[int]] = None,
+        casefold: bool = True,
+    ) -> Set[str]:
+        """Get the normalized Front values of all notes in a deck.
+
+        Note IDs are fetched with a single findNotes query, unless already known, and fields
+        with paged notesInfo requests, so the number of requests does not depend on how many
+        word pairs are checked.
+        """
+        chunk_size = chunk_size or self.NOTES_INFO_CHUNK_SIZE
+        if note_ids is None:
+            note_ids = self.find_notes(deck_query(deck_name))
+        fronts: Set[str] = set()
+
+        for start in range(0, len(note_ids), chunk_size):
+            fronts |= note_fronts(self.notes_info(note_ids[start : start + chunk_size]), casefold)
+
+        return fronts
+
+    def get_deck_notes(
+        self, deck_name: str, chunk_size: Optional[int] = None, note_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, str, str]]:
+        """Get the ID and normalized Front and Back of every note in a deck, see note_contents."""
+        chunk_size = chunk_size or self.NOTES_INFO_CHUNK_SIZE
+        if note_ids is None:
+            note_ids = self.find_notes(deck_query(deck_name))
+
+        contents = []
+        for start in range(0, len(note_ids), chunk_size):
+            contents.extend(note_contents(self.notes_info(note_ids[start : start + chunk_size])))
+        return contents
+
+    def update_backs(self, updates: List[Tuple[int, str]], chunk_size: Optional[int] = None) -> List[bool]:
+        """Set the Back field of notes, sending one multi request of updateNoteFields per chunk.
+
+        Args:
+            updates: (note ID, new Back) pairs
+            chunk_size: Number of notes updated per request
+
+        Returns:
+            One flag per update, in input order, telling whether the note was updated
+        """
+        chunk_size = chunk_size or Config.BATCH_SIZE
+        updated: List[bool] = []
+
+        for start in range(0, len(updates), chunk_size):
+            chunk = updates[start : start + chunk_size]
+            try:
+                with self.batch() as batch:
+                    pending = [
+                        batch.add("updateNoteFields", {"note": {"id": note_id, "fields": {"Back": back}}})
+                        for note_id, back in chunk
+                    ]
+            except Exception:
+                updated.extend([False] * len(chunk))
+                continue
+
+            for result in pending:
+                try:
+                    result.result()
+                    updated.append(True)
+                except Exception:
+                    updated.append(False)
+
+        return updated
+
+    def delete_notes(self, note_ids: List[int]) -> bool:
+        """Delete notes with a single deleteNotes request."""
+        if not note_ids:
+            return True
+        try:
+            self._make_request("deleteNotes", {"notes": note_ids})
+        except Exception:
+            return False
+        return True
+
+    def get_media_file_names(self, pattern: str = "*") -> List[str]:
+        """Get the names of the media files in the collection matching a glob pattern."""
+        result = self._make_request("getMediaFilesNames", {"pattern": pattern})
+        return result.get("result") or []
+
+    def store_media_file(self, filename: str, path: str) -> bool:
+        """Upload a local file to the collection's media folder under the given name.
+
+        The content is sent inline, so it also works with a remote AnkiConnect.
+        """
+        try:
+            with open(path, "rb") as f:
+                data = base64.b64encode(f.read()).decode("ascii")
+            self._make_request("storeMediaFile", {"filename": filename, "data": data})
+        except Exception:
+            return False
+        return True
+
     def card_exists(self, deck_name: str, front: str) -> bool:
         """Check if a card with given front text exists."""
         try:
-            query = f'deck:"{deck_name}" Front:"{front}"'
+            query = f'deck:"{deck_name}" Front:"{normalize_text(front)}"'
             notes = self.find_notes(query)
             return len(notes) > 0
         except Exception:
             return False
 
+    def can_add_notes(self, deck_name: str, pairs: List[Tuple[str, str]]) -> List[bool]:
+        """Check with canAddNotes which pairs Anki would accept as new notes.
+
+        Returns:
+            One flag per input pair, in input order, False for duplicates and invalid notes
+        """
+        notes = [build_note(deck_name, front, back, self.note_extras.get(front)) for front, back in pairs]
+        return [bool(ok) for ok in self._make_request("canAddNotes", {"notes": notes}).get("result") or []]
+
     def add_note(self, deck_name: str, front: str, back: str) -> bool:
         """Add a new note with bidirectional cards."""
-        params = {
-            "note": {
-                "deckName": deck_name,
-                "modelName": "Basic (and reversed card)",
-                "fields": {"Front": front, "Back": back},
-                "options": {"allowDuplicate": False},
-                "tags": ["wb_anki"],
-            }
-        }
+        params = {"note": build_note(deck_name, front, back, self.note_extras.get(front))}
 
         try:
             result = self._make_request("addNote", params)
             return result.get("error") is None
         except Exception:
             return False
+
+    def add_notes(self, deck_name: str, pairs: List[Tuple[str, str]], chunk_size: Optional[int] = None) -> List[bool]:
+        """Add notes with bidirectional cards in chunks.
+
+        Each chunk is pre-checked with canAddNotes and submitted with a single addNotes request.
+
+        Returns:
+            One flag per input pair, in input order, telling whether the note was added
+        """
+        chunk_size = chunk_size or Config.BATCH_SIZE
+        added: List[bool] = []
+
+        for start in range(0, len(pairs), chunk_size):
+            notes = [
+                build_note(deck_name, front, back, self.note_extras.get(front))
+                for front, back in pairs[start : start + chunk_size]
+            ]
+            added.extend(self._add_note_chunk(notes))
+
+        return added
+
+    def _add_note_chunk(self, notes: List[Dict[str, Any]]) -> List[bool]:
+        """Submit one chunk of notes and map the results back to the chunk.
+
+        addNotes is not idempotent, so after a transient failure the remaining notes are
+        checked again with canAddNotes: notes that became duplicates were added by the
+        failed attempt, the others are submitted again.
+        """
+        added = [False] * len(notes)
+        try:
+            can_add = self._make_request("canAddNotes", {"notes": notes}).get("result") or []
+        except Exception:
+            return added
+
+        remaining = [i for i, ok in enumerate(can_add[: len(notes)]) if ok]
+        attempt = 0
+
+        while remaining:
+            try:
+                note_ids = self._make_request("addNotes", {"notes": [notes[i] for i in remaining]}).get("result") or []
+                for i, note_id in zip(remaining, note_ids):
+                    added[i] = note_id is not None
+                break
+            except AnkiTransientError:
+                attempt += 1
+                if attempt >= self.retry_policy.attempts:
+                    break
+                time.sleep(self.retry_policy.delay(attempt - 1))
+                try:
+                    recheck = self._make_request("canAddNotes", {"notes": [notes[i] for i in remaining]})
+                except Exception:
+                    break
+                still_addable = recheck.get("result") or []
+                for i, ok in zip(remaining, still_addable):
+                    added[i] = not ok
+                remaining = [i for i, ok in zip(remaining, still_addable) if ok]
+            except Exception:
+                break
+
+        return added
@@ -0,0 +1,266 @@
+"""Asynchronous AnkiConnect client module with bounded request concurrency."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from .anki_client import (
+    ActionQueue,
+    AnkiTransientError,
+    DeckRegistry,
+    build_note,
+    build_payload,
+    deck_query,
+    normalize_text,
+    note_fronts,
+    parse_response,
+    translate_error,
+)
+from .config import Config
+from .metrics import Metrics
+from .scheduler import AdaptiveLimiter, AIMDController, RetryPolicy, is_idempotent
+
+
+class AsyncRequestBatch(ActionQueue):
+    """Batch of actions flushed through an AsyncAnkiConnectClient."""
+
+    def __init__(self, client: "AsyncAnkiConnectClient"):
+        super().__init__()
+        self.client = client
+
+    async def flush(self) -> None:
+        """Send all queued actions as one multi request and resolve their results."""
+        if not self:
+            return
+
+        actions, pending = self._take()
+        try:
+            result = await self.client._make_request("multi", {"actions": actions})
+        except Exception as e:
+            self._fail(pending, e)
+            raise
+
+        self._resolve_all(pending, result.get("result") or [])
+
+
+class AsyncAnkiConnectClient:
+    """Asynchronous client for interacting with AnkiConnect API.
+
+    Mirrors AnkiConnectClient, but keeps up to ``concurrency`` requests in flight.
+    With ``adaptive`` set, the limit is halved when requests fail or slow down and
+    grows back by one with each fast response.
+    """
+
+    NOTES_INFO_CHUNK_SIZE = 500
+
+    def __init__(
+        self,
+        anki_url: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        adaptive: bool = False,
+    ):
+        self.anki_url = anki_url or Config.ANKI_URL
+        self.concurrency = concurrency or Config.CONCURRENCY
+        self.metrics = metrics or Metrics()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.decks = DeckRegistry()
+        # Extra fields and tags of the notes to add, by front, see build_note
+        self.note_extras: Dict[str, Tuple[Dict[str, str], List[str]]] = {}
+        self.client = httpx.AsyncClient(
+            timeout=Config.TIMEOUT,
+            limits=httpx.Limits(max_connections=self.concurrency),
+            event_hooks=self.metrics.async_event_hooks(),
+        )
+        controller = AIMDController(self.concurrency) if adaptive else AIMDController.fixed(self.concurrency)
+        self._limiter = AdaptiveLimiter(controller)
+
+    async def __aenter__(self) -> "AsyncAnkiConnectClient":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.client.aclose()
+
+    async def _make_request(self, action: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make a request to AnkiConnect API, waiting for a free concurrency slot.
+
+        Idempotent actions are retried with jittered exponential backoff after transient failures.
+        """
+        payload = build_payload(action, params)
+        attempts = self.retry_policy.attempts if is_idempotent(action, params) else 1
+        attempt = 0
+
+        while True:
+            try:
+                return await self._send(action, payload)
+            except AnkiTransientError:
+                attempt += 1
+                if attempt >= attempts:
+                    raise
+                await asyncio.sleep(self.retry_policy.delay(attempt - 1))
+
+    async def _send(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request within the concurrency limit, translating failures to AnkiConnect error types."""
+        await self._limiter.acquire()
+        started = time.perf_counter()
+        failed = False
+        try:
+            with self.metrics.track_request(action):
+                try:
+                    response = await self.client.post(self.anki_url, json=payload)
+                    return parse_response(response)
+                except Exception as e:
+                    error = translate_error(e)
+                    failed = isinstance(error, AnkiTransientError)
+                    raise error from e
+        finally:
+            await self._limiter.release(time.perf_counter() - started, failed)
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[AsyncRequestBatch]:
+        """Queue actions and send them as one multi request when the block exits."""
+        batch = AsyncRequestBatch(self)
+        yield batch
+        await batch.flush()
+
+    async def get_deck_names(self) -> List[str]:
+        """Get list of all deck names."""
+        result = await self._make_request("deckNames")
+        return result.get("result", [])  # type: ignore[no-any-return]
+
+    async def get_deck_ids(self) -> Dict[str, int]:
+        """Get the mapping of deck names to IDs, from the deck registry while it is fresh."""
+        if not self.decks.is_fresh():
+            result = await self._make_request("deckNamesAndIds")
+            self.decks.update(result.get("result") or {})
+        return self.decks.decks
+
+    async def deck_exists(self, deck_name: str) -> bool:
+        """Check if a deck exists."""
+        return deck_name in await self.get_deck_ids()
+
+    async def create_deck(self, deck_name: str) -> bool:
+        """Create a new deck."""
+        try:
+            result = await self._make_request("createDeck", {"deck": deck_name})
+        except Exception:
+            return False
+
+        if result.get("error") is not None:
+            return False
+        self.decks.add(deck_name, result["result"])
+        return True
+
+    async def find_notes(self, query: str) -> List[int]:
+        """Find notes matching a query."""
+        result = await self._make_request("findNotes", {"query": query})
+        return result.get("result", [])  # type: ignore[no-any-return]
+
+    async def notes_info(self, note_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get fields and metadata for the given note IDs."""
+        result = await self._make_request("notesInfo", {"notes": note_ids})
+        return result.get("result", [])  # type: ignore[no-any-return]
+
+    async def get_existing_fronts(
+        self,
+        deck_name: str,
+        chunk_size: Optional[int] = None,
+        note_ids: Optional[List[int]] = None,
+        casefold: bool = True,
+    ) -> Set[str]:
+        """Get the normalized Front values of all notes in a deck, fetching notesInfo pages concurrently."""
+        chunk_size = chunk_size or self.NOTES_INFO_CHUNK_SIZE
+        if note_ids is None:
+            note_ids = await self.find_notes(deck_query(deck_name))
+
+        pages = await asyncio.gather(
+            *(self.notes_info(note_ids[start : start + chunk_size]) for start in range(0, len(note_ids), chunk_size))
+        )
+
+        fronts: Set[str] = set()
+        for page in pages:
+            fronts |= note_fronts(page, casefold)
+        return fronts
+
+    async def card_exists(self, deck_name: str, front: str) -> bool:
+        """Check if a card with given front text exists."""
+        try:
+            query = f'deck:"{deck_name}" Front:"{normalize_text(front)}"'
+            notes = await self.find_notes(query)
+            return len(notes) > 0
+        except Exception:
+            return False
+
+    async def add_note(self, deck_name: str, front: str, back: str) -> bool:
+        """Add a new note with bidirectional cards."""
+        params = {"note": build_note(deck_name, front, back, self.note_extras.get(front))}
+
+        try:
+            result = await self._make_request("addNote", params)
+            return result.get("error") is None
+        except Exception:
+            return False
+
+    async def add_notes(
+        self, deck_name: str, pairs: List[Tuple[str, str]], chunk_size: Optional[int] = None
+    ) -> List[bool]:
+        """Add notes with bidirectional cards, submitting chunks concurrently.
+
+        Returns:
+            One flag per input pair, in input order, telling whether the note was added
+        """
+        chunk_size = chunk_size or Config.BATCH_SIZE
+        chunks = await asyncio.gather(
+            *(
+                self._add_note_chunk(
+                    [
+                        build_note(deck_name, front, back, self.note_extras.get(front))
+                        for front, back in pairs[start : start + chunk_size]
+                    ]
+                )
+                for start in range(0, len(pairs), chunk_size)
+            )
+        )
+        return [added for chunk in chunks for added in chunk]
+
+    async def _add_note_chunk(self, notes: List[Dict[str, Any]]) -> List[bool]:
+        """Submit one chunk of notes and map the results back to the chunk.
+
+        Transient addNotes failures are handled like in AnkiConnectClient._add_note_chunk.
+        """
+        added = [False] * len(notes)
+        try:
+            can_add = (await self._make_request("canAddNotes", {"notes": notes})).get("result") or []
+        except Exception:
+            return added
+
+        remaining = [i for i, ok in enumerate(can_add[: len(notes)]) if ok]
+        attempt = 0
+
+        while remaining:
+            try:
+                result = await self._make_request("addNotes", {"notes": [notes[i] for i in remaining]})
+                for i, note_id in zip(remaining, result.get("result") or []):
+                    added[i] = note_id is not None
+                break
+            except AnkiTransientError:
+                attempt += 1
+                if attempt >= self.retry_policy.attempts:
+                    break
+                await asyncio.sleep(self.retry_policy.delay(attempt - 1))
+                try:
+                    recheck = await self._make_request("canAddNotes", {"notes": [notes[i] for i in remaining]})
+                except Exception:
+                    break
+                still_addable = recheck.get("result") or []
+                for i, ok in zip(remaining, still_addable):
+                    added[i] = not ok
+                remaining = [i for i, ok in zip(remaining, still_addable) if ok]
+            except Exception:
+                break
+
+        return added
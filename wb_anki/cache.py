@@ -0,0 +1,175 @@
+"""Persistent deck index cache module for incremental duplicate detection."""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Set, Tuple
+
+from .anki_client import AnkiConnectClient, deck_query, note_contents
+from .config import Config
+
+# Bump whenever the stored fields would normalize differently or the schema changes, so stale
+# indexes are dropped. Fronts are stored without casefolding, which is applied when reading them.
+INDEX_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS decks (
+    anki_url TEXT NOT NULL,
+    deck TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (anki_url, deck)
+);
+CREATE TABLE IF NOT EXISTS notes (
+    anki_url TEXT NOT NULL,
+    deck TEXT NOT NULL,
+    note_id INTEGER NOT NULL,
+    front TEXT NOT NULL,
+    back TEXT NOT NULL,
+    mod INTEGER NOT NULL,
+    PRIMARY KEY (anki_url, deck, note_id)
+);
+"""
+
+
+def default_cache_dir() -> Path:
+    """Get the user cache directory of WB_Anki."""
+    if Config.CACHE_DIR:
+        return Path(Config.CACHE_DIR)
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "wb_anki"
+
+
+def default_cache_path() -> Path:
+    """Get the deck index location under the user cache directory."""
+    return default_cache_dir() / "deck_index.sqlite3"
+
+
+class DeckIndexCache:
+    """On-disk index of note fields per deck, refreshed incrementally from AnkiConnect.
+
+    The first refresh of a deck walks all of its notes; later refreshes only fetch notes
+    that are new or were edited since the last sync, and drop notes that were deleted.
+    """
+
+    def __init__(self, anki_url: str, path: Optional[Path] = None):
+        self.anki_url = anki_url
+        self.path = path or default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self._init_schema()
+
+    def __enter__(self) -> "DeckIndexCache":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.connection.close()
+
+    def _init_schema(self) -> None:
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or int(row[0]) != INDEX_VERSION:
+                self.connection.execute("DROP TABLE decks")
+                self.connection.execute("DROP TABLE notes")
+                self.connection.executescript(SCHEMA)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (str(INDEX_VERSION),)
+                )
+
+    def last_synced(self, deck_name: str) -> Optional[float]:
+        """Get the time of the last refresh of a deck, if it was ever indexed."""
+        row = self.connection.execute(
+            "SELECT synced_at FROM decks WHERE anki_url = ? AND deck = ?", (self.anki_url, deck_name)
+        ).fetchone()
+        return row[0] if row else None
+
+    def fronts(self, deck_name: str, casefold: bool = True) -> Set[str]:
+        """Get the cached normalized fronts of a deck, casefolded unless disabled."""
+        rows = self.connection.execute(
+            "SELECT front FROM notes WHERE anki_url = ? AND deck = ?", (self.anki_url, deck_name)
+        )
+        return {front.casefold() if casefold else front for (front,) in rows}
+
+    def notes(self, deck_name: str) -> List[Tuple[int, str, str]]:
+        """Get the cached ID and normalized Front and Back of every note in a deck."""
+        rows = self.connection.execute(
+            "SELECT note_id, front, back FROM notes WHERE anki_url = ? AND deck = ? ORDER BY note_id",
+            (self.anki_url, deck_name),
+        )
+        return list(rows)
+
+    def invalidate(self, deck_name: Optional[str] = None) -> None:
+        """Drop the cached index of a deck, or of every deck when no name is given."""
+        query = "WHERE anki_url = ?" + (" AND deck = ?" if deck_name else "")
+        params = (self.anki_url, deck_name) if deck_name else (self.anki_url,)
+        with self.connection:
+            self.connection.execute(f"DELETE FROM decks {query}", params)
+            self.connection.execute(f"DELETE FROM notes {query}", params)
+
+    def refresh(
+        self,
+        client: AnkiConnectClient,
+        deck_name: str,
+        note_ids: Optional[List[int]] = None,
+        chunk_size: Optional[int] = None,
+        casefold: bool = True,
+    ) -> Set[str]:
+        """Bring the index of a deck up to date and return its normalized fronts.
+
+        Args:
+            client: Client used to query AnkiConnect
+            deck_name: Name of the deck to refresh
+            note_ids: IDs of all notes currently in the deck, if already fetched
+            chunk_size: Number of notes per notesInfo request
+            casefold: Casefold the returned fronts
+
+        Returns:
+            Set of normalized Front values of the deck
+        """
+        started_at = time.time()
+        chunk_size = chunk_size or client.NOTES_INFO_CHUNK_SIZE
+        last_synced = self.last_synced(deck_name)
+        query = deck_query(deck_name)
+
+        if note_ids is None:
+            note_ids = client.find_notes(query)
+
+        cached_ids = {
+            note_id
+            for (note_id,) in self.connection.execute(
+                "SELECT note_id FROM notes WHERE anki_url = ? AND deck = ?", (self.anki_url, deck_name)
+            )
+        }
+
+        if last_synced is None:
+            to_fetch = list(note_ids)
+        else:
+            # edited:N counts whole days relative to Anki's day rollover, so keep a day of margin
+            days = int((started_at - last_synced) // 86400) + 2
+            edited_ids = set(client.find_notes(f"{query} edited:{days}"))
+            to_fetch = [note_id for note_id in note_ids if note_id not in cached_ids or note_id in edited_ids]
+
+        removed_ids = cached_ids - set(note_ids)
+
+        rows = []
+        for start in range(0, len(to_fetch), chunk_size):
+            notes = client.notes_info(to_fetch[start : start + chunk_size])
+            mods = {note.get("noteId"): note.get("mod", 0) for note in notes}
+            for note_id, front, back in note_contents(notes):
+                rows.append((self.anki_url, deck_name, note_id, front, back, mods[note_id]))
+
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM notes WHERE anki_url = ? AND deck = ? AND note_id = ?",
+                [(self.anki_url, deck_name, note_id) for note_id in removed_ids | set(to_fetch)],
+            )
+            self.connection.executemany(
+                "INSERT INTO notes (anki_url, deck, note_id, front, back, mod) VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO decks (anki_url, deck, synced_at) VALUES (?, ?, ?)",
+                (self.anki_url, deck_name, started_at),
+            )
+
+        return self.fronts(deck_name, casefold)
@@ -1,27 +1,221 @@
 """CLI module for WB_Anki command-line interface."""
 
-from typing import Dict, List, Optional, Tuple
+import itertools
+import queue
+import threading
+import time
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Sized, Tuple
 
 import click
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
 
-from .anki_client import AnkiConnectClient
-from .parser import parse_word_pairs, read_input
+from .config import Config
+from .dedup import DEDUP_POLICIES, PairDeduplicator, normalize_front, normalize_text
+from .media import MEDIA_WORKERS, MediaUploader
+from .metrics import Metrics
+from .parser import (
+    INPUT_FORMATS,
+    ParseSummary,
+    collect_input_files,
+    iter_input,
+    iter_routed_pairs,
+    iter_table_rows,
+    iter_word_pairs,
+    parse_files,
+)
+from .proxy import COALESCE_WINDOW, MAX_COALESCED_REQUESTS, PROXY_PORT
+from .report import REPORT_MODES, Report, create_report
+from .results import ResultStore
+from .scheduler import AIMDController
+from .watch import DEBOUNCE_SECONDS, open_inbox, watch_inbox
+
+# httpx, asyncio, sqlite3 and the Rich progress and table widgets are imported where they
+# are used, so that --help, argument errors and small piped imports start quickly
+if TYPE_CHECKING:
+    from .anki_client import AnkiConnectClient
+    from .async_client import AsyncAnkiConnectClient
+    from .journal import ImportJournal
 
 console = Console()
 
+# Number of batches buffered between the parsing thread and the submitting thread
+PIPELINE_QUEUE_SIZE = 8
 
-@click.command()
+# Ways of reaching the collection: through AnkiConnect, or by writing the collection file directly
+BACKENDS = ("ankiconnect", "file")
+
+# Number of times watch retries the lines of pairs failing with a transient error before dropping them
+WATCH_RETRIES = 3
+
+
+class DefaultGroup(click.Group):
+    """Command group running its default command when no subcommand is named.
+
+    Keeps ``wb-anki --deck-name ...`` working next to subcommands such as ``wb-anki watch``.
+    """
+
+    def __init__(self, *args: Any, default: str, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.default = default
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        """Prepend the default command unless the arguments start with a subcommand or --help."""
+        if not args or (args[0] not in self.commands and args[0] != "--help"):
+            args = [self.default, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.command(short_help="Import word pairs into a deck (default command)")
 @click.option("--deck-name", required=True, help="Name of the Anki deck to add cards to")
-@click.option("--file", type=click.Path(exists=True, readable=True), help="Path to text file containing word pairs")
+@click.option(
+    "--file",
+    "files",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, readable=True),
+    help="Path to text file containing word pairs (repeatable)",
+)
+@click.option(
+    "--dir",
+    "directory",
+    type=click.Path(exists=True, file_okay=False, readable=True),
+    help="Directory containing vocabulary files to import",
+)
+@click.option("--glob", "pattern", default="*.txt", show_default=True, help="File pattern matched inside --dir")
+@click.option(
+    "--format",
+    "input_format",
+    type=click.Choice(INPUT_FORMATS),
+    default="pairs",
+    show_default=True,
+    help="Read word pairs split by dashes or tabs, or the columns of TSV or CSV files with an optional header row",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of processes parsing multiple files in parallel (default: CPU count)",
+)
 @click.option(
     "--anki-url", default="http://localhost:8765", help="AnkiConnect API URL (default: http://localhost:8765)"
 )
+@click.option(
+    "--backend",
+    type=click.Choice(BACKENDS),
+    default="ankiconnect",
+    show_default=True,
+    help="Add notes through AnkiConnect, or write them straight into the --collection file",
+)
+@click.option(
+    "--collection",
+    type=click.Path(dir_okay=False),
+    help="Collection (.anki2) or package (.apkg) written by --backend file, created if missing; close Anki first",
+)
 @click.option("--create-deck/--no-create-deck", default=True, help="Automatically create deck if it does not exist")
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=lambda: Config.BATCH_SIZE,
+    show_default="ANKI_BATCH_SIZE or 100",
+    help="Number of notes submitted per addNotes request",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=lambda: Config.CONCURRENCY,
+    show_default="ANKI_CONCURRENCY or 1",
+    help="Number of AnkiConnect requests kept in flight",
+)
+@click.option(
+    "--adaptive/--no-adaptive",
+    default=True,
+    help="Grow batch size and concurrency while Anki keeps up, shrink them when it slows down",
+)
+@click.option(
+    "--on-duplicate",
+    type=click.Choice(DEDUP_POLICIES),
+    default="first",
+    show_default=True,
+    help="Keep the first or last back of repeated fronts in the input, or merge their backs",
+)
+@click.option("--casefold/--no-casefold", default=True, help="Treat fronts differing only in letter case as duplicates")
+@click.option("--cache/--no-cache", default=True, help="Use the local deck index cache for duplicate detection")
+@click.option("--clear-cache", is_flag=True, help="Rebuild the deck's cached index from scratch")
+@click.option(
+    "--route-decks",
+    is_flag=True,
+    help="Add each pair to the deck named by its line, falling back to --deck-name",
+)
+@click.option("--sync", is_flag=True, help="Also update notes whose translation differs from the input")
+@click.option("--prune", is_flag=True, help="With --sync, delete notes whose word is missing from the input")
+@click.option("--resume", is_flag=True, help="Skip the pairs an interrupted import of the same files already committed")
+@click.option("--mmap", "use_mmap", is_flag=True, help="Read the input file through a memory map")
+@click.option(
+    "--media-dir",
+    type=click.Path(exists=True, file_okay=False),
+    help="Upload the files referenced by [sound:...] and <img src=...> tags from this directory",
+)
+@click.option(
+    "--media-workers",
+    type=click.IntRange(min=1),
+    default=MEDIA_WORKERS,
+    show_default=True,
+    help="Number of media files uploaded at the same time",
+)
+@click.option(
+    "--report",
+    "report_mode",
+    type=click.Choice(REPORT_MODES),
+    default="table",
+    show_default=True,
+    help="How to report per-pair results: a capped table, counts only, a JSON or CSV file, or nothing",
+)
+@click.option(
+    "--report-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File the json and csv reports are streamed to",
+)
+@click.option(
+    "--metrics-json",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write per-action request metrics and phase timings to a JSON file",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a cProfile capture of the run to a file (view with python -m pstats)",
+)
 @click.version_option(version="1.0.0")
-def main(deck_name: str, file: Optional[str], anki_url: str, create_deck: bool) -> None:
+def main(
+    deck_name: str,
+    files: Tuple[str, ...],
+    directory: Optional[str],
+    pattern: str,
+    input_format: str,
+    workers: Optional[int],
+    anki_url: str,
+    backend: str,
+    collection: Optional[str],
+    create_deck: bool,
+    batch_size: int,
+    concurrency: int,
+    adaptive: bool,
+    on_duplicate: str,
+    casefold: bool,
+    cache: bool,
+    clear_cache: bool,
+    route_decks: bool,
+    sync: bool,
+    prune: bool,
+    resume: bool,
+    use_mmap: bool,
+    media_dir: Optional[str],
+    media_workers: int,
+    report_mode: str,
+    report_file: Optional[str],
+    metrics_json: Optional[str],
+    profile: Optional[str],
+) -> None:
     """WB_Anki: Anki Card Creator CLI
 
     Create Anki flashcards from word pairs in text format.
@@ -37,6 +231,11 @@ def main(deck_name: str, file: Optional[str], anki_url: str, create_deck: bool)
     # From file
     python -m wb_anki.cli --deck-name Swedish --file vocabulary.txt
 
+    \b
+    # From several files, or every .txt file of a directory
+    python -m wb_anki.cli --deck-name Swedish --file week1.txt --file week2.txt
+    python -m wb_anki.cli --deck-name Swedish --dir vocabulary/ --glob "**/*.txt"
+
     \b
     # From stdin
     cat vocabulary.txt | python -m wb_anki.cli --deck-name Swedish
@@ -44,39 +243,222 @@ def main(deck_name: str, file: Optional[str], anki_url: str, create_deck: bool)
     \b
     # With custom AnkiConnect URL
     python -m wb_anki.cli --deck-name Spanish --anki-url http://localhost:8765
+
+    \b
+    # Without Anki running, into a package to import later
+    python -m wb_anki.cli --deck-name Swedish --file vocabulary.txt --backend file --collection swedish.apkg
+
+    \b
+    # From a spreadsheet export with a "word,translation,tags,example" header row
+    python -m wb_anki.cli --deck-name Swedish --file vocabulary.csv --format csv
+
+    \b
+    # Making a deck match a curated file, deleting notes no longer in it
+    python -m wb_anki.cli --deck-name Swedish --file vocabulary.txt --sync --prune
+
+    \b
+    # Routing lines like "[Swedish::Verbs] run - springa" to their own decks
+    python -m wb_anki.cli --deck-name Swedish --file mixed.txt --route-decks
     """
 
+    input_files = collect_input_files(files, directory, pattern)
+    if directory and not input_files:
+        console.print(f"[red]❌ No files matching '{pattern}' found in {directory}[/red]")
+        raise click.Abort()
+    if resume and not input_files:
+        console.print("[red]❌ --resume requires input from --file or --dir[/red]")
+        raise click.Abort()
+    if prune and not sync:
+        console.print("[red]❌ --prune requires --sync[/red]")
+        raise click.Abort()
+    if sync and (route_decks or resume):
+        console.print("[red]❌ --sync cannot be combined with --route-decks or --resume[/red]")
+        raise click.Abort()
+    if report_mode in ("json", "csv") and not report_file:
+        console.print(f"[red]❌ --report {report_mode} requires --report-file[/red]")
+        raise click.Abort()
+    if backend == "file" and not collection:
+        console.print("[red]❌ --backend file requires --collection[/red]")
+        raise click.Abort()
+    if backend == "file":
+        # The collection is read locally, so the deck index cache and parallel requests gain nothing
+        cache = False
+        concurrency = 1
+
+    from .anki_client import deck_query
+
+    metrics = Metrics()
+    profiler = None
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    if profiler:
+        profiler.enable()
+
+    journal: Optional["ImportJournal"] = None
+    uploader: Optional[MediaUploader] = None
     try:
-        with AnkiConnectClient(anki_url) as client:
-            # Check if deck exists
-            if not client.deck_exists(deck_name):
-                if create_deck:
-                    if client.create_deck(deck_name):
-                        console.print(f"[green]✅ Created deck: {deck_name}[/green]")
-                    else:
-                        console.print(f"[red]❌ Failed to create deck: {deck_name}[/red]")
-                        raise click.Abort()
-                else:
-                    console.print(f"[red]❌ Deck '{deck_name}' does not exist and --no-create-deck specified[/red]")
-                    raise click.Abort()
+        # A sync recomputes its changes on every run, so it needs no journal to resume
+        # Options deciding which pairs are produced, and in which order, select the journal too
+        stream_options = {
+            "casefold": casefold,
+            "on_duplicate": on_duplicate,
+            "route_decks": route_decks,
+            "format": input_format,
+        }
+        journal = None if sync else open_journal(deck_name, input_files, resume, stream_options)
+        with open_client(backend, anki_url, collection, metrics) as client:
+            # Fetch the deck registry and the deck's note IDs in a single round trip. A sync
+            # leaves the notes of subdecks alone, so it only fetches the deck's own notes
+            with metrics.phase("deck_check"), client.batch() as batch:
+                deck_ids = batch.add("deckNamesAndIds")
+                deck_note_ids = batch.add("findNotes", {"query": deck_query(deck_name, subdecks=not sync)})
+            client.decks.update(deck_ids.result())
 
-            # Read input
-            lines = read_input(file)
+            if not route_decks:
+                ensure_decks(client, [deck_name], create_deck)
 
-            # Parse word pairs
-            word_pairs = parse_word_pairs(lines)
+            # Read, parse and deduplicate input lazily, peeking at the first pair to reject empty input early
+            parse_summary = ParseSummary()
+            file_stats: Dict[str, Dict[str, int]] = {}
+            dedup = PairDeduplicator(on_duplicate, casefold)
+            if media_dir:
+                # Media files upload in the background while the notes referencing them are added
+                uploader = MediaUploader(client, media_dir, media_workers)
+            paths: List[Optional[str]] = list(input_files) or [None]
+            routed: Iterable[Tuple[Optional[str], str, str]] = ()
+            if input_format != "pairs":
+                # Each file is read with its own header row, and line breaks in quoted fields kept as written
+                rows = itertools.chain.from_iterable(
+                    iter_table_rows(iter_input(path, use_mmap, newline=""), input_format, parse_summary)
+                    for path in paths
+                )
+                routed = take_note_extras(rows, client.note_extras, uploader)
+            elif route_decks:
+                routed_lines = itertools.chain.from_iterable(iter_input(path, use_mmap) for path in paths)
+                routed = iter_routed_pairs(routed_lines, parse_summary)
 
-            if not word_pairs:
+            if route_decks:
+                with metrics.phase("parse"):
+                    groups = route_word_pairs(routed, deck_name, dedup)
+                parsed: Iterator[Tuple[str, str]] = itertools.chain.from_iterable(groups.values())
+            elif input_format != "pairs":
+                parsed = dedup.dedupe((front, back) for _, front, back in routed)
+            elif len(input_files) > 1:
+                parsed = merge_parsed_files(parse_files(input_files, workers, use_mmap), file_stats, dedup)
+            else:
+                lines = iter_input(input_files[0] if input_files else None, use_mmap)
+                parsed = dedup.dedupe(iter_word_pairs(lines, parse_summary))
+            if journal and journal.offset:
+                console.print(f"[blue]⏭️ Resuming after {journal.offset} pairs committed by an earlier run[/blue]")
+                if route_decks:
+                    groups = skip_routed_pairs(groups, journal.offset)
+                    parsed = itertools.chain.from_iterable(groups.values())
+                else:
+                    parsed = itertools.islice(parsed, journal.offset, None)
+            if uploader and input_format == "pairs":
+                if route_decks:
+                    groups = {deck: list(uploader.rewrite_pairs(pairs)) for deck, pairs in groups.items()}
+                    parsed = itertools.chain.from_iterable(groups.values())
+                else:
+                    parsed = uploader.rewrite_pairs(parsed)
+            word_pairs = metrics.timed_iter("parse", parsed)
+            first_pair = next(word_pairs, None)
+
+            if first_pair is None and journal and journal.offset:
+                console.print("[green]✅ Nothing left to import[/green]")
+                journal.finish()
+                return
+
+            if first_pair is None:
+                parse_summary.print()
+                print_file_report(file_stats)
                 console.print("[red]❌ No valid word pairs found.[/red]")
                 raise click.Abort()
 
-            console.print(f"[blue]Processing {len(word_pairs)} word pairs...[/blue]")
+            word_pairs = itertools.chain([first_pair], word_pairs)
+            console.print("[blue]Processing word pairs...[/blue]")
 
             # Process word pairs
-            stats, results = process_word_pairs(client, word_pairs, deck_name)
+            jobs: List[Tuple[str, Iterable[Tuple[str, str]], Set[str]]]
+            with metrics.phase("snapshot"):
+                if sync:
+                    deck_notes = load_deck_notes(
+                        client, deck_name, deck_note_ids.result(), use_cache=cache, clear_cache=clear_cache
+                    )
+                    jobs = []
+                elif route_decks:
+                    ensure_decks(client, list(groups), create_deck)
+                    jobs = load_deck_jobs(
+                        client,
+                        groups,
+                        {deck_name: deck_note_ids.result()},
+                        use_cache=cache,
+                        clear_cache=clear_cache,
+                        casefold=casefold,
+                    )
+                else:
+                    existing_fronts = load_existing_fronts(
+                        client,
+                        deck_name,
+                        deck_note_ids.result(),
+                        use_cache=cache,
+                        clear_cache=clear_cache,
+                        casefold=casefold,
+                    )
+                    jobs = [(deck_name, word_pairs, existing_fronts)]
+            sizer = batch_sizer(batch_size, adaptive)
+            report = create_report(report_mode, report_file)
+            with metrics.phase("process"):
+                if sync:
+                    stats = sync_deck(client, deck_name, word_pairs, deck_notes, batch_size, casefold, prune, report)
+                elif concurrency > 1:
+                    import asyncio
+
+                    stats = asyncio.run(
+                        _process_concurrently(
+                            anki_url,
+                            concurrency,
+                            jobs,
+                            batch_size,
+                            metrics,
+                            sizer,
+                            adaptive,
+                            journal,
+                            casefold,
+                            report,
+                            client.note_extras,
+                        )
+                    )
+                else:
+                    stats = {"added": 0, "exists": 0, "error": 0}
+                    for deck, pairs, fronts in jobs:
+                        deck_stats, _ = process_word_pairs(
+                            client, pairs, deck, batch_size, fronts, sizer, journal, casefold, report
+                        )
+                        _add_stats(stats, deck_stats)
+
+                if uploader:
+                    media_stats = uploader.close()
+
+            if journal and stats["error"] == 0:
+                journal.finish()
 
             # Print report
-            print_report(stats, results)
+            with metrics.phase("render"):
+                report.close()
+                print_file_report(file_stats)
+                if route_decks:
+                    print_deck_report(groups)
+                if uploader:
+                    print_media_report(media_stats)
+                parse_summary.print()
+                if dedup.duplicates:
+                    console.print(
+                        f"[blue]ℹ️ Collapsed {dedup.duplicates} repeated fronts in the input "
+                        f"(--on-duplicate {on_duplicate})[/blue]"
+                    )
 
             if stats["error"] > 0:
                 raise click.Abort()
@@ -85,67 +467,829 @@ def main(deck_name: str, file: Optional[str], anki_url: str, create_deck: bool)
         console.print(f"[red]❌ Error: {e}[/red]")
         raise click.Abort()
 
+    finally:
+        if journal:
+            journal.close()
+        if uploader:
+            uploader.close()
+        if profiler and profile:
+            profiler.disable()
+            profiler.dump_stats(profile)
+        if metrics_json:
+            metrics.write_json(metrics_json)
+
+
+@click.command()
+@click.option("--deck-name", required=True, help="Name of the Anki deck to add cards to")
+@click.option(
+    "--inbox",
+    required=True,
+    type=click.Path(exists=True, readable=True),
+    help="Directory or named pipe receiving word pairs",
+)
+@click.option(
+    "--glob", "pattern", default="*.txt", show_default=True, help="File pattern followed inside an inbox directory"
+)
+@click.option(
+    "--anki-url", default="http://localhost:8765", help="AnkiConnect API URL (default: http://localhost:8765)"
+)
+@click.option("--create-deck/--no-create-deck", default=True, help="Automatically create deck if it does not exist")
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=lambda: Config.BATCH_SIZE,
+    show_default="ANKI_BATCH_SIZE or 100",
+    help="Number of notes submitted per addNotes request",
+)
+@click.option(
+    "--debounce",
+    type=click.FloatRange(min=0),
+    default=DEBOUNCE_SECONDS,
+    show_default=True,
+    help="Seconds without new lines before the pending lines are imported",
+)
+@click.option("--casefold/--no-casefold", default=True, help="Treat fronts differing only in letter case as duplicates")
+@click.option("--cache/--no-cache", default=True, help="Use the local deck index cache for duplicate detection")
+def watch(
+    deck_name: str,
+    inbox: str,
+    pattern: str,
+    anki_url: str,
+    create_deck: bool,
+    batch_size: int,
+    debounce: float,
+    casefold: bool,
+    cache: bool,
+) -> None:
+    """Watch an inbox and import word pairs as they arrive.
+
+    The inbox is a directory whose files are followed as lines are appended to
+    them, or a named pipe. Lines already in the inbox are imported on start.
+    One connection and one snapshot of the deck are kept for the whole run, and
+    lines arriving close together are imported as a single batch.
+
+    Examples:
+
+    \b
+    # Follow every .txt file of a directory
+    wb-anki watch --deck-name Swedish --inbox inbox/
+
+    \b
+    # Read from a named pipe
+    mkfifo /tmp/wb-anki && wb-anki watch --deck-name Swedish --inbox /tmp/wb-anki
+    """
+    from .anki_client import AnkiConnectClient, deck_query
+
+    try:
+        with AnkiConnectClient(anki_url) as client:
+            with client.batch() as batch:
+                deck_ids = batch.add("deckNamesAndIds")
+                deck_note_ids = batch.add("findNotes", {"query": deck_query(deck_name)})
+            client.decks.update(deck_ids.result())
+            ensure_decks(client, [deck_name], create_deck)
+
+            existing_fronts = load_existing_fronts(
+                client, deck_name, deck_note_ids.result(), use_cache=cache, casefold=casefold
+            )
+            loaded_at = time.monotonic()
+            sizer = batch_sizer(batch_size)
+
+            def line_front(line: str) -> Optional[str]:
+                pairs = list(iter_word_pairs([line], ParseSummary()))
+                return normalize_front(pairs[0][0], casefold) if pairs else None
+
+            # Lines kept for a retry, by the number of retries they had
+            retries: Dict[str, int] = {}
+
+            def keep_for_retry(lines: List[str], retry: List[str]) -> List[str]:
+                for line in set(lines) - set(retry):
+                    retries.pop(line, None)
+                for line in set(retry):
+                    retries[line] = retries.get(line, 0) + 1
+                kept = [line for line in retry if retries[line] <= WATCH_RETRIES]
+                if len(kept) < len(retry):
+                    console.print(
+                        f"[red]❌ Dropping {len(retry) - len(kept)} lines still failing after {WATCH_RETRIES} "
+                        "retries[/red]"
+                    )
+                    for line in set(retry) - set(kept):
+                        del retries[line]
+                if kept:
+                    console.print(f"[yellow]⚠️ Retrying {len(kept)} lines after the next pause[/yellow]")
+                return kept
+
+            def import_lines(lines: List[str]) -> List[str]:
+                nonlocal existing_fronts, loaded_at
+                try:
+                    # Pick up notes added to the deck outside of this run
+                    if time.monotonic() - loaded_at >= Config.DECK_CACHE_TTL:
+                        note_ids = client.find_notes(deck_query(deck_name))
+                        existing_fronts = load_existing_fronts(
+                            client, deck_name, note_ids, use_cache=cache, casefold=casefold
+                        )
+                        loaded_at = time.monotonic()
+
+                    summary = ParseSummary()
+                    pairs = list(PairDeduplicator("first", casefold).dedupe(iter_word_pairs(lines, summary)))
+                    summary.print()
+                    if not pairs:
+                        return keep_for_retry(lines, [])
+
+                    stats, results = process_word_pairs(
+                        client, pairs, deck_name, batch_size, existing_fronts, sizer, casefold=casefold
+                    )
+                    console.print(
+                        f"[green]✅ {stats['added']} added[/green], {stats['exists']} already existed, "
+                        f"{stats['error']} failed"
+                    )
+                    failed = {
+                        normalize_front(front, casefold): (front, back)
+                        for front, back, status in results
+                        if status == "error"
+                    }
+                    # Pairs Anki still refuses, such as a front already in another deck, fail again on every retry
+                    accepted = client.can_add_notes(deck_name, list(failed.values())) if failed else []
+                except Exception as e:
+                    console.print(f"[red]❌ Error: {e}[/red]")
+                    return keep_for_retry(lines, lines)
+
+                rejected = [pair for pair, ok in zip(failed.values(), accepted) if not ok]
+                if rejected:
+                    fronts = ", ".join(f"'{front}'" for front, _ in rejected)
+                    console.print(
+                        f"[red]❌ Anki rejected {len(rejected)} pairs as duplicates or invalid: {fronts}[/red]"
+                    )
+                # Pairs added meanwhile are in the snapshot and count as existing on retry
+                transient = {key for key, ok in zip(failed, accepted) if ok}
+                return keep_for_retry(lines, [line for line in lines if line_front(line) in transient])
+
+            console.print(f"[blue]👀 Watching {inbox} for word pairs, press Ctrl+C to stop[/blue]")
+            watch_inbox(open_inbox(inbox, pattern), import_lines, debounce)
+
+    except click.Abort:
+        raise
+    except Exception as e:
+        console.print(f"[red]❌ Error: {e}[/red]")
+        raise click.Abort()
+
+
+@click.command(short_help="Serve a request-coalescing AnkiConnect proxy for many clients")
+@click.option(
+    "--anki-url", default="http://localhost:8765", help="AnkiConnect API URL (default: http://localhost:8765)"
+)
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address the proxy listens on")
+@click.option(
+    "--port", type=click.IntRange(min=0), default=PROXY_PORT, show_default=True, help="Port the proxy listens on"
+)
+@click.option(
+    "--window",
+    type=click.FloatRange(min=0),
+    default=COALESCE_WINDOW,
+    show_default=True,
+    help="Seconds to wait for more requests before forwarding a batch",
+)
+@click.option(
+    "--max-batch",
+    type=click.IntRange(min=1),
+    default=MAX_COALESCED_REQUESTS,
+    show_default=True,
+    help="Maximum number of client requests forwarded in one upstream request",
+)
+def serve(anki_url: str, host: str, port: int, window: float, max_batch: int) -> None:
+    """Serve AnkiConnect to many concurrent clients through one coalescing proxy.
+
+    Point scripts at the proxy's URL instead of AnkiConnect. Requests arriving
+    together are forwarded as one multi request, with addNote calls merged into
+    addNotes and identical queries sent once, so Anki handles a few large requests
+    instead of many small ones.
+
+    \b
+    # Share one Anki between several importers
+    wb-anki serve --anki-url http://localhost:8765 --port 8766
+    wb-anki --deck-name Swedish --file words.txt --anki-url http://localhost:8766
+    """
+    from .anki_client import AnkiConnectClient
+    from .proxy import ProxyServer, RequestCoalescer
+
+    try:
+        with AnkiConnectClient(anki_url) as client:
+            coalescer = RequestCoalescer(client, window, max_batch)
+            with ProxyServer(coalescer, host, port) as proxy:
+                console.print(f"[blue]🔀 Proxying {proxy.url} to {anki_url}, press Ctrl+C to stop[/blue]")
+                try:
+                    proxy.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+            console.print(
+                f"[green]✅ Forwarded {coalescer.counts['requests']} requests "
+                f"in {coalescer.counts['upstream_requests']} upstream requests[/green]"
+            )
+    except OSError as e:
+        console.print(f"[red]❌ Error: cannot listen on {host}:{port}: {e}[/red]")
+        raise click.Abort()
+
+
+cli = DefaultGroup(
+    name="wb-anki",
+    help="WB_Anki: Anki Card Creator CLI\n\nRuns the import command unless another command is named.",
+    default="import",
+)
+cli.add_command(main, "import")
+cli.add_command(watch)
+cli.add_command(serve)
+
+
+def take_note_extras(
+    rows: Iterable[Tuple[Optional[str], str, str, Optional[Tuple[Dict[str, str], List[str]]]]],
+    note_extras: Dict[str, Tuple[Dict[str, str], List[str]]],
+    uploader: Optional[MediaUploader] = None,
+) -> Iterator[Tuple[Optional[str], str, str]]:
+    """Move the extra fields and tags of TSV or CSV rows into ``note_extras``, keyed by front.
+
+    The rows then go through the same deduplication and processing as word pairs, and
+    the client adds the extras back when it builds each note. Keys are normalized with
+    normalize_text, as the fronts deduplication yields are. The first row of a front
+    decides its extras. Media references are rewritten here, before the fronts become
+    keys, and in the extra fields too.
+
+    Yields:
+        Tuples containing (deck, front, back)
+    """
+    for deck, front, back, extras in rows:
+        if uploader:
+            front, back = uploader.rewrite(front), uploader.rewrite(back)
+            if extras:
+                extras = ({name: uploader.rewrite(value) for name, value in extras[0].items()}, extras[1])
+        key = normalize_text(front)
+        if extras and key not in note_extras:
+            note_extras[key] = extras
+        yield deck, front, back
+
+
+def merge_parsed_files(
+    parsed_files: Iterable[Tuple[str, List[Tuple[str, str]], ParseSummary]],
+    file_stats: Dict[str, Dict[str, int]],
+    dedup: Optional[PairDeduplicator] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Merge parsed files into a single stream, collapsing fronts repeated in an earlier file or line.
+
+    Per-file counts of parsed pairs, collapsed duplicates and skipped lines are recorded in ``file_stats``.
+    """
+    dedup = dedup or PairDeduplicator()
+
+    def chain_files() -> Iterator[Tuple[str, str]]:
+        for path, pairs, summary in parsed_files:
+            stats = file_stats[path] = {"pairs": len(pairs), "duplicates": 0, "skipped": summary.skipped}
+            before = dedup.duplicates
+            yield from pairs
+            stats["duplicates"] = dedup.duplicates - before
+
+    return dedup.dedupe(chain_files())
+
+
+def ensure_decks(client: "AnkiConnectClient", deck_names: List[str], create: bool = True) -> None:
+    """Make sure every deck of a list exists, creating the missing ones in a single request.
+
+    Raises:
+        click.Abort: If a deck is missing and cannot or may not be created
+    """
+    missing = [name for name in deck_names if not client.deck_exists(name)]
+    if not missing:
+        return
+
+    if not create:
+        names = "', '".join(missing)
+        console.print(f"[red]❌ Deck '{names}' does not exist and --no-create-deck specified[/red]")
+        raise click.Abort()
+
+    if len(missing) == 1:
+        created = {missing[0]: client.create_deck(missing[0])}
+    else:
+        created = client.create_decks(missing)
+
+    for name in missing:
+        if created.get(name):
+            console.print(f"[green]✅ Created deck: {name}[/green]")
+        else:
+            console.print(f"[red]❌ Failed to create deck: {name}[/red]")
+    if not all(created.get(name) for name in missing):
+        raise click.Abort()
+
+
+def route_word_pairs(
+    routed_pairs: Iterable[Tuple[Optional[str], str, str]],
+    default_deck: str,
+    dedup: Optional[PairDeduplicator] = None,
+) -> Dict[str, List[Tuple[str, str]]]:
+    """Group routed word pairs by deck, deduplicating fronts within each deck.
+
+    Pairs without a deck go to ``default_deck``. Decks are kept in order of first
+    appearance, and pairs in input order within their deck.
+
+    Args:
+        routed_pairs: Iterable of (deck, front, back) tuples, see iter_routed_pairs
+        default_deck: Deck of pairs whose line names none
+        dedup: Deduplicator applied to each deck separately
+
+    Returns:
+        Dictionary mapping deck names to their word pairs
+    """
+    dedup = dedup or PairDeduplicator()
+    groups: Dict[str, List[Tuple[str, str]]] = {}
+    for deck, front, back in routed_pairs:
+        groups.setdefault(deck or default_deck, []).append((front, back))
+    return {deck: list(dedup.dedupe(pairs)) for deck, pairs in groups.items()}
+
+
+def skip_routed_pairs(groups: Dict[str, List[Tuple[str, str]]], count: int) -> Dict[str, List[Tuple[str, str]]]:
+    """Drop the first ``count`` pairs of the deck groups, taken in deck order."""
+    remaining = {}
+    for deck, pairs in groups.items():
+        skipped = min(count, len(pairs))
+        count -= skipped
+        if skipped < len(pairs):
+            remaining[deck] = pairs[skipped:]
+    return remaining
+
+
+def load_deck_jobs(
+    client: "AnkiConnectClient",
+    groups: Dict[str, List[Tuple[str, str]]],
+    note_ids: Dict[str, List[int]],
+    use_cache: bool = True,
+    clear_cache: bool = False,
+    casefold: bool = True,
+) -> List[Tuple[str, Iterable[Tuple[str, str]], Set[str]]]:
+    """Load the existing fronts of every routed deck, finding their notes in a single request.
+
+    Args:
+        client: AnkiConnect client
+        groups: Word pairs per deck, see route_word_pairs
+        note_ids: Note IDs already known for some of the decks
+
+    Returns:
+        List of (deck, word pairs, existing fronts) tuples in deck order
+    """
+    from .anki_client import deck_query
+
+    with client.batch() as batch:
+        pending = {deck: batch.add("findNotes", {"query": deck_query(deck)}) for deck in groups if deck not in note_ids}
+
+    jobs: List[Tuple[str, Iterable[Tuple[str, str]], Set[str]]] = []
+    for deck, pairs in groups.items():
+        ids = note_ids[deck] if deck in note_ids else pending[deck].result()
+        fronts = load_existing_fronts(client, deck, ids, use_cache, clear_cache, casefold)
+        jobs.append((deck, pairs, fronts))
+    return jobs
+
+
+def load_existing_fronts(
+    client: "AnkiConnectClient",
+    deck_name: str,
+    note_ids: List[int],
+    use_cache: bool = True,
+    clear_cache: bool = False,
+    casefold: bool = True,
+) -> Set[str]:
+    """Get the normalized fronts of a deck, through the local deck index cache when enabled.
+
+    Falls back to a full deck walk if the cache cannot be used.
+    """
+    if use_cache:
+        import sqlite3
+
+        from .cache import DeckIndexCache
+
+        try:
+            with DeckIndexCache(client.anki_url) as index:
+                if clear_cache:
+                    index.invalidate(deck_name)
+                return index.refresh(client, deck_name, note_ids=note_ids, casefold=casefold)
+        except sqlite3.Error as e:
+            console.print(f"[yellow]⚠️ Deck index cache unavailable, scanning the whole deck: {e}[/yellow]")
+
+    return client.get_existing_fronts(deck_name, note_ids=note_ids, casefold=casefold)
+
+
+def load_deck_notes(
+    client: "AnkiConnectClient",
+    deck_name: str,
+    note_ids: List[int],
+    use_cache: bool = True,
+    clear_cache: bool = False,
+) -> List[Tuple[int, str, str]]:
+    """Get the ID, Front and Back of every note of a deck, through the local deck index cache when enabled.
+
+    Falls back to a full deck walk if the cache cannot be used.
+    """
+    if use_cache:
+        import sqlite3
+
+        from .cache import DeckIndexCache
+
+        try:
+            with DeckIndexCache(client.anki_url) as index:
+                if clear_cache:
+                    index.invalidate(deck_name)
+                index.refresh(client, deck_name, note_ids=note_ids)
+                return index.notes(deck_name)
+        except sqlite3.Error as e:
+            console.print(f"[yellow]⚠️ Deck index cache unavailable, scanning the whole deck: {e}[/yellow]")
+
+    return client.get_deck_notes(deck_name, note_ids=note_ids)
+
+
+def sync_deck(
+    client: "AnkiConnectClient",
+    deck_name: str,
+    word_pairs: Iterable[Tuple[str, str]],
+    deck_notes: List[Tuple[int, str, str]],
+    batch_size: Optional[int] = None,
+    casefold: bool = True,
+    prune: bool = False,
+    report: Optional[Report] = None,
+) -> Dict[str, int]:
+    """Diff word pairs against a deck's notes and apply the changes, see wb_anki.sync."""
+    from .sync import apply_sync, diff_deck
+
+    plan = diff_deck(word_pairs, deck_notes, casefold)
+    console.print(f"[blue]Sync: {plan.describe()}[/blue]")
+    if plan.missing and not prune:
+        console.print("[blue]ℹ️ Notes missing from the input are kept, pass --prune to delete them[/blue]")
+    return apply_sync(client, deck_name, plan, batch_size, prune, report)
+
+
+def batch_sizer(batch_size: int, adaptive: bool = True) -> AIMDController:
+    """Create the controller deciding how many new notes go into each addNotes request.
+
+    An adaptive sizer starts at ``batch_size``, grows by ``batch_size`` after each fast
+    request up to Config.MAX_BATCH_SIZE and halves when a request is slow or fails.
+    """
+    if not adaptive:
+        return AIMDController.fixed(batch_size)
+    return AIMDController(batch_size, maximum=max(batch_size, Config.MAX_BATCH_SIZE), step=batch_size)
+
+
+def _record_batch(sizer: AIMDController, started: float, added: List[bool]) -> None:
+    """Adapt the batch size to the latency and outcome of one addNotes batch."""
+    sizer.record(time.perf_counter() - started, failed=bool(added) and not any(added))
+
+
+def open_client(
+    backend: str, anki_url: str, collection: Optional[str], metrics: Optional[Metrics] = None
+) -> "AnkiConnectClient":
+    """Create the client of a backend: AnkiConnect, or a collection file written directly."""
+    if backend == "file" and collection:
+        from .collection import CollectionBackend
+
+        return CollectionBackend(collection, metrics=metrics)
+
+    from .anki_client import AnkiConnectClient
+
+    return AnkiConnectClient(anki_url, metrics=metrics)
+
+
+def open_journal(
+    deck_name: str, input_files: List[str], resume: bool = False, options: Optional[Dict[str, Any]] = None
+) -> Optional["ImportJournal"]:
+    """Open the checkpoint journal of an import from files, or return None for stdin input.
+
+    ``options`` are the import options shaping the pair stream, which select the
+    journal together with the deck and inputs. Falls back to importing without a
+    journal if it cannot be written.
+    """
+    if not input_files:
+        return None
+
+    from .journal import ImportJournal
+
+    try:
+        return ImportJournal.open(deck_name, input_files, resume, options=options)
+    except OSError as e:
+        console.print(f"[yellow]⚠️ Import journal unavailable, this run cannot be resumed: {e}[/yellow]")
+        return None
+
+
+def _classify_pairs(
+    word_pairs: Iterable[Tuple[str, str]], existing_fronts: Set[str], casefold: bool = True
+) -> Tuple[ResultStore, "array[int]"]:
+    """Mark pairs whose front already exists and collect the indices of pairs to add.
+
+    Pairs to add start out as errors until their batch reports them as added. Fronts
+    repeated within the input are checked against a set local to this call, so
+    ``existing_fronts`` only ever holds fronts that are in the deck; see _commit_fronts.
+    """
+    results = ResultStore()
+    pending = array("L")  # indices into results that still need to be added
+    seen: Set[str] = set()
+
+    for front, back in word_pairs:
+        key = normalize_front(front, casefold)
+        if key in existing_fronts or key in seen:
+            results.append(front, back, "exists")
+        else:
+            seen.add(key)
+            pending.append(results.append(front, back, "error"))
+
+    return results, pending
+
+
+def _apply_batch(results: ResultStore, chunk: Sequence[int], added: List[bool]) -> None:
+    """Record the outcome of one addNotes batch in the results."""
+    for i, ok in zip(chunk, added):
+        results.set_status(i, "added" if ok else "error")
+
+
+def _commit_fronts(
+    existing_fronts: Set[str], pairs: Sequence[Tuple[str, str]], added: Sequence[bool], casefold: bool = True
+) -> None:
+    """Record the fronts of the pairs a batch added in the deck snapshot.
+
+    Fronts of failed pairs stay out of the snapshot, so long-lived callers such as
+    watch see them as new when they are retried.
+    """
+    for (front, _), ok in zip(pairs, added):
+        if ok:
+            existing_fronts.add(normalize_front(front, casefold))
+
+
+def _add_stats(total: Dict[str, int], stats: Dict[str, int]) -> None:
+    """Add per-status counts to a running total."""
+    for status, count in stats.items():
+        total[status] += count
+
+
+def _pipeline(
+    word_pairs: Iterable[Tuple[str, str]], existing_fronts: Set[str], sizer: AIMDController, casefold: bool = True
+) -> Iterator[List[Tuple[str, str, bool]]]:
+    """Classify pairs in a background thread and yield them in batches.
+
+    Each batch holds ``(front, back, is_new)`` entries in input order, with at most
+    ``sizer.value`` new pairs, read as each batch is filled. Pairs whose front already
+    exists never wait for a full batch longer than that many entries. Up to PIPELINE_QUEUE_SIZE batches are
+    buffered, so reading, parsing and submission overlap while memory stays bounded.
+    Fronts repeated within the input are tracked in a set of this run only; the
+    consumer adds fronts to ``existing_fronts`` once they are added, see _commit_fronts.
+    """
+    batches: "queue.Queue[Any]" = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    done = object()
+
+    def produce() -> None:
+        try:
+            batch: List[Tuple[str, str, bool]] = []
+            new_count = 0
+            seen: Set[str] = set()
+            for front, back in word_pairs:
+                key = normalize_front(front, casefold)
+                is_new = key not in existing_fronts and key not in seen
+                if is_new:
+                    seen.add(key)
+                    new_count += 1
+                batch.append((front, back, is_new))
+
+                batch_size = sizer.value
+                if new_count >= batch_size or len(batch) - new_count >= batch_size:
+                    batches.put(batch)
+                    batch, new_count = [], 0
+
+            if batch:
+                batches.put(batch)
+            batches.put(done)
+        except BaseException as e:
+            batches.put(e)
+
+    threading.Thread(target=produce, name="wb-anki-parser", daemon=True).start()
+
+    while True:
+        item = batches.get()
+        if item is done:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
 
 def process_word_pairs(
-    client: AnkiConnectClient, word_pairs: List[Tuple[str, str]], deck_name: str
-) -> Tuple[Dict[str, int], List[Tuple[str, str, str]]]:
-    """Process word pairs and return statistics."""
+    client: "AnkiConnectClient",
+    word_pairs: Iterable[Tuple[str, str]],
+    deck_name: str,
+    batch_size: Optional[int] = None,
+    existing_fronts: Optional[Set[str]] = None,
+    sizer: Optional[AIMDController] = None,
+    journal: Optional["ImportJournal"] = None,
+    casefold: bool = True,
+    report: Optional[Report] = None,
+) -> Tuple[Dict[str, int], ResultStore]:
+    """Process word pairs and return statistics.
+
+    Existing cards are detected against a single snapshot of the deck's fronts
+    instead of one findNotes request per pair, and new notes are submitted in
+    batches of ``batch_size`` through addNotes. The snapshot is fetched from the
+    deck unless ``existing_fronts`` is given. An adaptive ``sizer`` replaces the
+    fixed batch size, and each finished batch is committed to ``journal``.
+
+    ``word_pairs`` may be a lazy iterator: pairs are parsed and checked in a
+    background thread while earlier batches are being submitted. With a ``report``,
+    result rows are streamed to it instead of being collected in the returned list,
+    so memory does not grow with the input.
+    """
+    from .progress import ProgressReporter
+
+    sizer = sizer or AIMDController.fixed(batch_size or Config.BATCH_SIZE)
+    if existing_fronts is None:
+        existing_fronts = client.get_existing_fronts(deck_name, casefold=casefold)
+
+    results = ResultStore()
     stats = {"added": 0, "exists": 0, "error": 0}
-    results = []
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Processing word pairs...", total=len(word_pairs))
-
-        for front, back in word_pairs:
-            try:
-                if client.card_exists(deck_name, front):
-                    results.append((front, back, "exists"))
-                    stats["exists"] += 1
+    total = len(word_pairs) if isinstance(word_pairs, Sized) else None
+
+    with ProgressReporter("Processing word pairs...", total, console) as progress:
+
+        for batch in _pipeline(word_pairs, existing_fronts, sizer, casefold):
+            pairs = [(front, back) for front, back, is_new in batch if is_new]
+            added: List[bool] = []
+            if pairs:
+                started = time.perf_counter()
+                try:
+                    added = client.add_notes(deck_name, pairs, sizer.value)
+                except Exception as e:
+                    console.print(f"[red]❌ Error adding batch starting at '{pairs[0][0]}': {e}[/red]")
+                _record_batch(sizer, started, added or [False])
+                _commit_fronts(existing_fronts, pairs, added, casefold)
+
+            outcomes = iter(added)
+            rows = [
+                (front, back, ("added" if next(outcomes, False) else "error") if is_new else "exists")
+                for front, back, is_new in batch
+            ]
+            for front, back, status in rows:
+                stats[status] += 1
+                if report:
+                    report.record(front, back, status)
                 else:
-                    if client.add_note(deck_name, front, back):
-                        results.append((front, back, "added"))
-                        stats["added"] += 1
-                    else:
-                        results.append((front, back, "error"))
-                        stats["error"] += 1
-            except Exception as e:
-                results.append((front, back, "error"))
-                stats["error"] += 1
-                console.print(f"[red]❌ Error processing '{front}': {e}[/red]")
-
-            progress.advance(task)
+                    results.append(front, back, status)
+
+            if journal:
+                journal.commit(status for _, _, status in rows)
+            progress.advance(len(batch))
 
     return stats, results
 
 
-def print_report(stats: Dict[str, int], results: List[Tuple[str, str, str]]) -> None:
-    """Print the final report."""
-    console.print("\n[bold green]Processing complete![/bold green]\n")
+async def process_word_pairs_async(
+    client: "AsyncAnkiConnectClient",
+    word_pairs: Iterable[Tuple[str, str]],
+    deck_name: str,
+    batch_size: Optional[int] = None,
+    existing_fronts: Optional[Set[str]] = None,
+    sizer: Optional[AIMDController] = None,
+    journal: Optional["ImportJournal"] = None,
+    casefold: bool = True,
+    report: Optional[Report] = None,
+) -> Tuple[Dict[str, int], ResultStore]:
+    """Process word pairs like process_word_pairs, keeping several batches in flight.
+
+    The number of concurrent requests is bounded by the client's concurrency limit;
+    results are reported in input order regardless of completion order. Each worker
+    takes the next batch at the size ``sizer`` allows when it starts it. Pairs are
+    committed to ``journal`` and streamed to ``report`` once every pair before them
+    has finished.
+    """
+    import asyncio
+
+    from .progress import ProgressReporter
+
+    sizer = sizer or AIMDController.fixed(batch_size or Config.BATCH_SIZE)
+    if existing_fronts is None:
+        existing_fronts = await client.get_existing_fronts(deck_name, casefold=casefold)
+
+    # The pairs are only kept in the result store, which holds them in input order
+    results, pending = _classify_pairs(word_pairs, existing_fronts, casefold)
+
+    with ProgressReporter("Processing word pairs...", len(results), console) as progress:
+        progress.advance(len(results) - len(pending))
+
+        settled = bytearray(b"\x01") * len(results)
+        for i in pending:
+            settled[i] = 0
+        position = frontier = 0
+
+        def commit(chunk: Sequence[int]) -> None:
+            nonlocal frontier
+            for i in chunk:
+                settled[i] = 1
+            start = frontier
+            while frontier < len(results) and settled[frontier]:
+                frontier += 1
+            if journal and frontier > start:
+                journal.commit(results.status_names(start, frontier))
+            if report:
+                for front, back, status in results.rows(start, frontier):
+                    report.record(front, back, status)
+
+        async def submit() -> None:
+            nonlocal position
+            while position < len(pending):
+                chunk = pending[position : position + sizer.value]
+                position += len(chunk)
+
+                pairs = [results.pair(i) for i in chunk]
+                started = time.perf_counter()
+                try:
+                    added = await client.add_notes(deck_name, pairs, sizer.value)
+                except Exception as e:
+                    added = [False] * len(chunk)
+                    console.print(f"[red]❌ Error adding batch starting at '{pairs[0][0]}': {e}[/red]")
+                _record_batch(sizer, started, added)
+
+                _apply_batch(results, chunk, added)
+                _commit_fronts(existing_fronts, pairs, added, casefold)
+                commit(chunk)
+                progress.advance(len(chunk))
+
+        commit([])
+        await asyncio.gather(*(submit() for _ in range(client.concurrency)))
+
+    return results.stats(), results
+
+
+async def _process_concurrently(
+    anki_url: str,
+    concurrency: int,
+    jobs: List[Tuple[str, Iterable[Tuple[str, str]], Set[str]]],
+    batch_size: int,
+    metrics: Optional[Metrics] = None,
+    sizer: Optional[AIMDController] = None,
+    adaptive: bool = False,
+    journal: Optional["ImportJournal"] = None,
+    casefold: bool = True,
+    report: Optional[Report] = None,
+    note_extras: Optional[Dict[str, Tuple[Dict[str, str], List[str]]]] = None,
+) -> Dict[str, int]:
+    """Run process_word_pairs_async on each (deck, word pairs, existing fronts) job with one asynchronous client.
+
+    Returns:
+        Counts of each status over all jobs
+    """
+    from .async_client import AsyncAnkiConnectClient
+
+    stats = {"added": 0, "exists": 0, "error": 0}
+    async with AsyncAnkiConnectClient(anki_url, concurrency, metrics, adaptive=adaptive) as client:
+        # The dict is shared with take_note_extras, which fills it while the pairs are read
+        if note_extras is not None:
+            client.note_extras = note_extras
+        for deck, word_pairs, existing_fronts in jobs:
+            deck_stats, _ = await process_word_pairs_async(
+                client, word_pairs, deck, batch_size, existing_fronts, sizer, journal, casefold, report
+            )
+            _add_stats(stats, deck_stats)
+    return stats
+
+
+def print_file_report(file_stats: Dict[str, Dict[str, int]]) -> None:
+    """Print per-file statistics of a multi-file import."""
+    if not file_stats:
+        return
+
+    from rich.table import Table
+
+    table = Table(title="Input Files")
+    table.add_column("File", style="cyan")
+    table.add_column("Pairs", justify="right")
+    table.add_column("Duplicates", justify="right", style="blue")
+    table.add_column("Skipped lines", justify="right", style="yellow")
+
+    for path, stats in file_stats.items():
+        table.add_row(path, str(stats["pairs"]), str(stats["duplicates"]), str(stats["skipped"]))
+
+    console.print(table)
+
+
+def print_deck_report(groups: Dict[str, List[Tuple[str, str]]]) -> None:
+    """Print the number of pairs routed to each deck."""
+    from rich.table import Table
+
+    table = Table(title="Decks")
+    table.add_column("Deck", style="cyan")
+    table.add_column("Pairs", justify="right")
 
-    if results:
-        table = Table(title="Processing Results")
-        table.add_column("Word", style="cyan")
-        table.add_column("Translation", style="magenta")
-        table.add_column("Status", style="green")
+    for deck, pairs in groups.items():
+        table.add_row(deck, str(len(pairs)))
 
-        for front, back, status in results:
-            if status == "added":
-                table.add_row(front, back, "[green]✅ Added[/green]")
-            elif status == "exists":
-                table.add_row(front, back, "[blue]☑️ Exists[/blue]")
-            elif status == "error":
-                table.add_row(front, back, "[red]❌ Error[/red]")
+    console.print(table)
 
-        console.print(table)
 
-    console.print(
-        f"\n[bold]Summary:[/bold] {stats['added']} added, {stats['exists']} already existed, {stats['error']} failed"
+def print_media_report(media_stats: Dict[str, int]) -> None:
+    """Print the outcome of the media uploads, warning about files that did not make it."""
+    summary = (
+        f"{media_stats['uploaded']} uploaded, {media_stats['skipped']} already stored, "
+        f"{media_stats['missing']} not found, {media_stats['failed']} failed"
     )
+    if media_stats["missing"] or media_stats["failed"]:
+        console.print(f"[yellow]⚠️ Media: {summary}[/yellow]")
+    else:
+        console.print(f"[blue]🎵 Media: {summary}[/blue]")
 
 
 if __name__ == "__main__":
-    main()
+    cli()
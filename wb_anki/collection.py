@@ -0,0 +1,654 @@
+"""Collection module writing notes straight into an Anki collection file or .apkg package."""
+
+import base64
+import fnmatch
+import hashlib
+import html
+import json
+import os
+import random
+import re
+import shutil
+import sqlite3
+import string
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .anki_client import AnkiConnectClient, AnkiConnectError, DeckRegistry
+from .metrics import Metrics
+from .scheduler import RetryPolicy
+
+# Legacy collection schema, used inside .apkg packages and importable by every Anki version
+SCHEMA_VERSION = 11
+
+# Note type of the notes created by WB_Anki
+MODEL_NAME = "Basic (and reversed card)"
+
+# Separator between the fields of a note in the notes table
+FIELD_SEPARATOR = "\x1f"
+
+# Alphabet of Anki's base91 note GUIDs
+GUID_CHARS = string.ascii_letters + string.digits + "!#$%&()*+,-./:;<=>?@[]^_`{|}~"
+
+QUERY_TERM_PATTERN = re.compile(r'(-?)(\w+):(?:"([^"]*)"|(\S+))')
+# Anki's patterns for HTML tags and comments, and for the media tags whose file names it keeps
+HTML_TAG_PATTERN = re.compile(r"(?si)<!--.*?-->|<.*?>")
+HTML_MEDIA_TAG_PATTERN = re.compile(
+    r"""(?si)<\b(?:img|audio|video|object)\b(?:[^>]|"[^"]+?"|'[^']+?')+?\b(?:src|data)\b="""
+    r"""(?:"([^"]+?)"[^>]*>|'([^']+?)'[^>]*>|([^ >]+?)(?: [^>]*>|>))"""
+)
+
+SCHEMA = """
+CREATE TABLE col (
+    id integer PRIMARY KEY, crt integer NOT NULL, mod integer NOT NULL, scm integer NOT NULL,
+    ver integer NOT NULL, dty integer NOT NULL, usn integer NOT NULL, ls integer NOT NULL,
+    conf text NOT NULL, models text NOT NULL, decks text NOT NULL, dconf text NOT NULL, tags text NOT NULL
+);
+CREATE TABLE notes (
+    id integer PRIMARY KEY, guid text NOT NULL, mid integer NOT NULL, mod integer NOT NULL,
+    usn integer NOT NULL, tags text NOT NULL, flds text NOT NULL, sfld integer NOT NULL,
+    csum integer NOT NULL, flags integer NOT NULL, data text NOT NULL
+);
+CREATE TABLE cards (
+    id integer PRIMARY KEY, nid integer NOT NULL, did integer NOT NULL, ord integer NOT NULL,
+    mod integer NOT NULL, usn integer NOT NULL, type integer NOT NULL, queue integer NOT NULL,
+    due integer NOT NULL, ivl integer NOT NULL, factor integer NOT NULL, reps integer NOT NULL,
+    lapses integer NOT NULL, left integer NOT NULL, odue integer NOT NULL, odid integer NOT NULL,
+    flags integer NOT NULL, data text NOT NULL
+);
+CREATE TABLE revlog (
+    id integer PRIMARY KEY, cid integer NOT NULL, usn integer NOT NULL, ease integer NOT NULL,
+    ivl integer NOT NULL, lastIvl integer NOT NULL, factor integer NOT NULL, time integer NOT NULL,
+    type integer NOT NULL
+);
+CREATE TABLE graves (usn integer NOT NULL, oid integer NOT NULL, type integer NOT NULL);
+CREATE INDEX ix_notes_usn ON notes (usn);
+CREATE INDEX ix_cards_usn ON cards (usn);
+CREATE INDEX ix_revlog_usn ON revlog (usn);
+CREATE INDEX ix_cards_nid ON cards (nid);
+CREATE INDEX ix_cards_sched ON cards (did, queue, due);
+CREATE INDEX ix_revlog_cid ON revlog (cid);
+CREATE INDEX ix_notes_csum ON notes (csum);
+"""
+
+LATEX_PRE = (
+    "\\documentclass[12pt]{article}\n\\special{papersize=3in,5in}\n\\usepackage[utf8]{inputenc}\n"
+    "\\usepackage{amssymb,amsmath}\n\\pagestyle{empty}\n\\setlength{\\parindent}{0in}\n\\begin{document}\n"
+)
+
+DEFAULT_DECK_CONFIG = {
+    "id": 1,
+    "name": "Default",
+    "mod": 0,
+    "usn": 0,
+    "maxTaken": 60,
+    "autoplay": True,
+    "timer": 0,
+    "replayq": True,
+    "dyn": False,
+    "new": {"delays": [1.0, 10.0], "ints": [1, 4, 0], "initialFactor": 2500, "order": 1, "perDay": 20, "bury": False},
+    "rev": {"perDay": 200, "ease4": 1.3, "ivlFct": 1.0, "maxIvl": 36500, "hardFactor": 1.2, "bury": False},
+    "lapse": {"delays": [10.0], "mult": 0.0, "minInt": 1, "leechFails": 8, "leechAction": 1},
+}
+
+
+def strip_html(text: str) -> str:
+    """Strip HTML tags, comments and entities from a field, as Anki does."""
+    return html.unescape(HTML_TAG_PATTERN.sub("", text)).replace("\xa0", " ")
+
+
+def strip_html_preserving_media_filenames(text: str) -> str:
+    """Strip HTML from a field like strip_html, keeping the file names of media tags as Anki's sort field does.
+
+    Example:
+        >>> strip_html_preserving_media_filenames('dog <img src="dog.jpg">')
+        "dog  dog.jpg "
+    """
+    return strip_html(HTML_MEDIA_TAG_PATTERN.sub(lambda match: f" {''.join(filter(None, match.groups()))} ", text))
+
+
+def field_checksum(text: str) -> int:
+    """Compute Anki's duplicate-detection checksum of a note's first field."""
+    return int(hashlib.sha1(strip_html_preserving_media_filenames(text).encode("utf-8")).hexdigest()[:8], 16)
+
+
+def guid64(rng: Optional[random.Random] = None) -> str:
+    """Generate a random note GUID in Anki's base91 format."""
+    number = (rng or random).getrandbits(64)
+    guid = ""
+    while number:
+        number, digit = divmod(number, len(GUID_CHARS))
+        guid = GUID_CHARS[digit] + guid
+    return guid or GUID_CHARS[0]
+
+
+def basic_reversed_model(model_id: int, now: int) -> Dict[str, Any]:
+    """Build the legacy definition of the "Basic (and reversed card)" note type."""
+    answer = "{{FrontSide}}\n\n<hr id=answer>\n\n"
+    return {
+        "id": model_id,
+        "name": MODEL_NAME,
+        "type": 0,
+        "mod": now,
+        "usn": -1,
+        "sortf": 0,
+        "did": 1,
+        "tmpls": [
+            {"name": "Card 1", "ord": 0, "qfmt": "{{Front}}", "afmt": answer + "{{Back}}", "did": None},
+            {"name": "Card 2", "ord": 1, "qfmt": "{{Back}}", "afmt": answer + "{{Front}}", "did": None},
+        ],
+        "flds": [
+            {"name": name, "ord": order, "sticky": False, "rtl": False, "font": "Arial", "size": 20, "media": []}
+            for order, name in enumerate(("Front", "Back"))
+        ],
+        "css": ".card {\n font-family: arial;\n font-size: 20px;\n text-align: center;\n color: black;\n"
+        " background-color: white;\n}\n",
+        "latexPre": LATEX_PRE,
+        "latexPost": "\\end{document}",
+        "latexsvg": False,
+        "req": [[0, "any", [0]], [1, "any", [1]]],
+        "tags": [],
+        "vers": [],
+    }
+
+
+def new_deck(deck_id: int, name: str, now: int) -> Dict[str, Any]:
+    """Build the legacy definition of a regular deck."""
+    return {
+        "id": deck_id,
+        "name": name,
+        "mod": now,
+        "usn": -1,
+        "lrnToday": [0, 0],
+        "revToday": [0, 0],
+        "newToday": [0, 0],
+        "timeToday": [0, 0],
+        "collapsed": False,
+        "browserCollapsed": False,
+        "desc": "",
+        "dyn": 0,
+        "conf": 1,
+        "extendNew": 0,
+        "extendRev": 0,
+    }
+
+
+def create_collection(path: Path) -> None:
+    """Create an empty collection file with the Default deck and the "Basic (and reversed card)" note type."""
+    now = int(time.time())
+    model_id = now * 1000
+    conf = {
+        "nextPos": 1,
+        "estTimes": True,
+        "activeDecks": [1],
+        "sortType": "noteFld",
+        "timeLim": 0,
+        "sortBackwards": False,
+        "addToCur": True,
+        "curDeck": 1,
+        "newSpread": 0,
+        "dueCounts": True,
+        "curModel": model_id,
+        "collapseTime": 1200,
+        "schedVer": 2,
+    }
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            connection.execute(
+                "INSERT INTO col VALUES (1, ?, ?, ?, ?, 0, 0, 0, ?, ?, ?, ?, '{}')",
+                (
+                    now - now % 86400,
+                    now * 1000,
+                    now * 1000,
+                    SCHEMA_VERSION,
+                    json.dumps(conf),
+                    json.dumps({str(model_id): basic_reversed_model(model_id, now)}),
+                    json.dumps({"1": new_deck(1, "Default", now)}),
+                    json.dumps({"1": DEFAULT_DECK_CONFIG}),
+                ),
+            )
+    finally:
+        connection.close()
+
+
+class CollectionBackend(AnkiConnectClient):
+    """AnkiConnect client that serves the actions WB_Anki uses from a collection file instead of Anki.
+
+    Writes go straight into the SQLite database of a ``collection.anki2`` file, in one
+    transaction per request, with Anki's GUIDs and first-field checksums. A path ending
+    in ``.apkg`` is written as a package that Anki imports. The collection must not be
+    open in Anki; it is locked for the lifetime of the backend. Only the legacy schema
+    (version 11) used by .apkg packages can be written. Media files go to the
+    ``collection.media`` folder next to the collection, or into the package.
+
+    Example:
+        >>> with CollectionBackend("vocabulary.apkg") as client:
+        ...     client.create_deck("Swedish")
+        ...     client.add_notes("Swedish", [("hello", "hej")])
+    """
+
+    def __init__(self, path: str, metrics: Optional[Metrics] = None):
+        self.path = Path(path)
+        self.package = self.path.suffix.lower() == ".apkg"
+        self._workdir: Optional[str] = None
+        self.anki_url = f"file://{self.path.resolve()}"
+        self.metrics = metrics or Metrics()
+        # Local writes either succeed or fail for good, so they are never retried
+        self.retry_policy = RetryPolicy(attempts=1)
+        self.decks = DeckRegistry()
+        self.note_extras: Dict[str, Tuple[Dict[str, str], List[str]]] = {}
+
+        collection_path = self._unpack() if self.package else self.path
+        self.media_dir = collection_path.with_suffix(".media")
+        if not collection_path.exists():
+            create_collection(collection_path)
+        self.connection = self._connect(collection_path)
+        self.rng = random.Random()
+        self._next_id = int(time.time() * 1000)
+        self._load()
+
+    def _unpack(self) -> Path:
+        self._workdir = tempfile.mkdtemp(prefix="wb_anki-")
+        collection_path = Path(self._workdir) / "collection.anki2"
+        if self.path.exists():
+            with zipfile.ZipFile(self.path) as package:
+                names = set(package.namelist())
+                if names & {"collection.anki21", "collection.anki21b"}:
+                    raise AnkiConnectError(f"{self.path} uses a newer package format that cannot be written")
+                package.extract("collection.anki2", self._workdir)
+
+                # Packages store media files under numbers, mapped to their names by the media file
+                media_dir = collection_path.with_suffix(".media")
+                media_dir.mkdir()
+                for number, name in json.loads(package.read("media") or b"{}").items():
+                    (media_dir / os.path.basename(name)).write_bytes(package.read(number))
+        return collection_path
+
+    def _connect(self, collection_path: Path) -> sqlite3.Connection:
+        connection = sqlite3.connect(collection_path, timeout=0)
+        try:
+            # Keep Anki out while notes are written; fails right away if Anki has the collection open
+            connection.execute("PRAGMA locking_mode = EXCLUSIVE")
+            connection.execute("BEGIN EXCLUSIVE")
+            connection.commit()
+            row = connection.execute("SELECT ver FROM col").fetchone()
+        except sqlite3.OperationalError as e:
+            connection.close()
+            raise AnkiConnectError(f"Cannot open collection {collection_path}, close it in Anki first: {e}") from e
+
+        if row is None or row[0] != SCHEMA_VERSION:
+            connection.close()
+            raise AnkiConnectError(
+                f"Collection schema {row[0] if row else None} is not supported, write an .apkg package "
+                f"with --collection file.apkg and import it in Anki instead"
+            )
+        return connection
+
+    def _load(self) -> None:
+        """Read the collection's configuration, note types and decks."""
+        conf, models, decks = self.connection.execute("SELECT conf, models, decks FROM col").fetchone()
+        self.conf: Dict[str, Any] = json.loads(conf)
+        self.models: Dict[str, Any] = json.loads(models)
+        self.deck_defs: Dict[str, Any] = json.loads(decks)
+        # Notes per (note type, first field), and per (note type, deck, first field), for duplicate checks
+        self._first_fields: Counter = Counter()
+        self._deck_first_fields: Counter = Counter()
+        self._index_first_fields()
+
+    def _index_first_fields(self, note_ids: Optional[List[int]] = None, delta: int = 1) -> None:
+        """Count the first fields of notes, of every note unless ``note_ids`` are given, in the duplicate index.
+
+        Notes being changed or deleted are counted out with a ``delta`` of -1 first, so
+        the index follows each change without rescanning the collection.
+        """
+        sql = "SELECT DISTINCT n.id, n.mid, c.did, n.flds FROM notes n JOIN cards c ON c.nid = n.id"
+        if note_ids is not None:
+            sql += " WHERE n.id IN (%s)" % ",".join("?" * len(note_ids))
+        counted: Set[int] = set()
+        for note_id, mid, did, flds in self.connection.execute(sql, note_ids or ()):
+            first = strip_html_preserving_media_filenames(flds.split(FIELD_SEPARATOR, 1)[0]).strip()
+            if note_id not in counted:
+                counted.add(note_id)
+                self._first_fields[mid, first] += delta
+            self._deck_first_fields[mid, did, first] += delta
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the collection, writing the package when the output is an .apkg."""
+        self.connection.close()
+        if not self._workdir:
+            return
+
+        try:
+            temporary = self.path.with_suffix(".apkg.tmp")
+            with zipfile.ZipFile(temporary, "w", zipfile.ZIP_DEFLATED) as package:
+                package.write(Path(self._workdir) / "collection.anki2", "collection.anki2")
+                media = self._media_names()
+                for number, name in enumerate(media):
+                    package.write(self.media_dir / name, str(number))
+                package.writestr("media", json.dumps({str(number): name for number, name in enumerate(media)}))
+            os.replace(temporary, self.path)
+        finally:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
+
+    def _send(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Serve one request from the collection, raising on errors like AnkiConnect responses do."""
+        with self.metrics.track_request(action):
+            response = self._dispatch(action, payload.get("params") or {})
+        if response["error"]:
+            raise AnkiConnectError(f"API Error: {response['error']}")
+        return response
+
+    def _dispatch(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        handler: Optional[Callable[[Dict[str, Any]], Any]] = getattr(self, f"_action_{action}", None)
+        if handler is None:
+            return {"result": None, "error": f"unsupported action: {action}"}
+        try:
+            return {"result": handler(params), "error": None}
+        except (AnkiConnectError, KeyError, ValueError) as e:
+            return {"result": None, "error": str(e)}
+
+    def _new_id(self, table: str) -> int:
+        """Generate a millisecond-timestamp ID that is not used yet."""
+        if self._next_id <= int(time.time() * 1000):
+            self._next_id = int(time.time() * 1000)
+            for (highest,) in self.connection.execute(f"SELECT max(id) FROM {table}"):
+                if highest is not None and highest >= self._next_id:
+                    self._next_id = highest + 1
+        self._next_id += 1
+        return self._next_id
+
+    def _save_col(self, schema_changed: bool = False) -> None:
+        now = int(time.time() * 1000)
+        self.connection.execute(
+            "UPDATE col SET mod = ?, conf = ?, models = ?, decks = ?" + (", scm = ?" if schema_changed else ""),
+            (now, json.dumps(self.conf), json.dumps(self.models), json.dumps(self.deck_defs))
+            + ((now,) if schema_changed else ()),
+        )
+
+    def _model(self, name: str) -> Dict[str, Any]:
+        for model in self.models.values():
+            if model["name"] == name:
+                return model  # type: ignore[no-any-return]
+        if name != MODEL_NAME:
+            raise AnkiConnectError(f"model was not found: {name}")
+
+        model_id = self._new_id("notes")
+        model = self.models[str(model_id)] = basic_reversed_model(model_id, int(time.time()))
+        with self.connection:
+            self._save_col(schema_changed=True)
+        return model
+
+    def _deck_ids(self) -> Dict[str, int]:
+        return {deck["name"]: int(deck["id"]) for deck in self.deck_defs.values()}
+
+    def _deck_tree_ids(self, deck_name: str) -> List[int]:
+        # A deck search matches the deck and its subdecks, and may use * wildcards such as "Swedish::*"
+        pattern = deck_name.replace("[", "[[]")
+        return [
+            deck_id
+            for name, deck_id in self._deck_ids().items()
+            if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(name, f"{pattern}::*")
+        ]
+
+    def _action_deckNames(self, params: Dict[str, Any]) -> List[str]:
+        return list(self._deck_ids())
+
+    def _action_deckNamesAndIds(self, params: Dict[str, Any]) -> Dict[str, int]:
+        return self._deck_ids()
+
+    def _action_createDeck(self, params: Dict[str, Any]) -> int:
+        deck_name = params["deck"]
+        deck_ids = self._deck_ids()
+        parts = deck_name.split("::")
+        for depth in range(1, len(parts) + 1):
+            name = "::".join(parts[:depth])
+            if name not in deck_ids:
+                deck_id = deck_ids[name] = self._new_id("cards")
+                self.deck_defs[str(deck_id)] = new_deck(deck_id, name, int(time.time()))
+        with self.connection:
+            self._save_col()
+        return deck_ids[deck_name]
+
+    def _action_findNotes(self, params: Dict[str, Any]) -> List[int]:
+        terms = [
+            (
+                match.group(1) == "-",
+                match.group(2).lower(),
+                match.group(3) if match.group(3) is not None else match.group(4),
+            )
+            for match in QUERY_TERM_PATTERN.finditer(params.get("query", ""))
+        ]
+        clauses = []
+        args: List[Any] = []
+        for negated, key, value in terms:
+            if key == "deck":
+                deck_ids = self._deck_tree_ids(value)
+                clauses.append(
+                    ("NOT " if negated else "")
+                    + "id IN (SELECT nid FROM cards WHERE did IN (%s))" % (",".join("?" * len(deck_ids)) or "NULL")
+                )
+                args.extend(deck_ids)
+            elif key == "edited":
+                clauses.append("mod < ?" if negated else "mod >= ?")
+                args.append(int(time.time()) - int(value) * 86400)
+
+        sql = "SELECT id, mid, flds, mod FROM notes" + "".join(
+            f" {'WHERE' if i == 0 else 'AND'} {clause}" for i, clause in enumerate(clauses)
+        )
+        field_terms = [
+            (negated, key, value.casefold()) for negated, key, value in terms if key not in ("deck", "edited")
+        ]
+        note_ids = []
+        for note_id, mid, flds, _ in self.connection.execute(sql + " ORDER BY id", args):
+            if field_terms:
+                names = [field["name"].lower() for field in self.models[str(mid)]["flds"]]
+                fields = dict(zip(names, flds.split(FIELD_SEPARATOR)))
+                if any((fields.get(key, "").casefold() == value) == negated for negated, key, value in field_terms):
+                    continue
+            note_ids.append(note_id)
+        return note_ids
+
+    def _action_notesInfo(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        note_ids = params.get("notes", [])
+        rows = {
+            row[0]: row
+            for row in self.connection.execute(
+                "SELECT id, mid, tags, flds, mod FROM notes WHERE id IN (%s)" % ",".join("?" * len(note_ids)), note_ids
+            )
+        }
+        infos: List[Dict[str, Any]] = []
+        for note_id in note_ids:
+            if note_id not in rows:
+                infos.append({})
+                continue
+            _, mid, tags, flds, mod = rows[note_id]
+            model = self.models[str(mid)]
+            infos.append(
+                {
+                    "noteId": note_id,
+                    "modelName": model["name"],
+                    "tags": tags.split(),
+                    "fields": {
+                        field["name"]: {"value": value, "order": field["ord"]}
+                        for field, value in zip(model["flds"], flds.split(FIELD_SEPARATOR))
+                    },
+                    "mod": mod,
+                }
+            )
+        return infos
+
+    def _check_note(self, note: Dict[str, Any]) -> Tuple[Dict[str, Any], int, List[str]]:
+        """Validate a note, returning its note type, deck ID and ordered field values.
+
+        Like AnkiConnect, a note duplicates any note of its type with the same first
+        field in the collection, or only those in its deck with ``duplicateScope`` "deck".
+        """
+        deck_id = self._deck_ids().get(note.get("deckName", ""))
+        if deck_id is None:
+            raise AnkiConnectError(f"deck was not found: {note.get('deckName')}")
+        model = self._model(note.get("modelName", MODEL_NAME))
+        values = [note.get("fields", {}).get(field["name"], "") for field in model["flds"]]
+        first = strip_html_preserving_media_filenames(values[0]).strip()
+        if not first:
+            raise AnkiConnectError("cannot create note because it is empty")
+        options = note.get("options") or {}
+        if options.get("duplicateScope") == "deck":
+            duplicate = self._deck_first_fields[model["id"], deck_id, first] > 0
+        else:
+            duplicate = self._first_fields[model["id"], first] > 0
+        if duplicate and not options.get("allowDuplicate"):
+            raise AnkiConnectError("cannot create note because it is a duplicate")
+        return model, deck_id, values
+
+    def _action_canAddNotes(self, params: Dict[str, Any]) -> List[bool]:
+        results = []
+        for note in params.get("notes", []):
+            try:
+                self._check_note(note)
+                results.append(True)
+            except AnkiConnectError:
+                results.append(False)
+        return results
+
+    def _action_addNote(self, params: Dict[str, Any]) -> Optional[int]:
+        (note_id,) = self._action_addNotes({"notes": [params["note"]]})
+        if note_id is None:
+            raise AnkiConnectError("cannot create note")
+        return note_id
+
+    def _action_addNotes(self, params: Dict[str, Any]) -> List[Optional[int]]:
+        """Insert notes and both of their cards in a single transaction."""
+        now = int(time.time())
+        note_rows = []
+        card_rows = []
+        note_ids: List[Optional[int]] = []
+
+        for note in params.get("notes", []):
+            try:
+                model, deck_id, values = self._check_note(note)
+            except AnkiConnectError:
+                note_ids.append(None)
+                continue
+
+            note_id = self._new_id("notes")
+            sort_field = strip_html_preserving_media_filenames(values[0])
+            self._first_fields[model["id"], sort_field.strip()] += 1
+            self._deck_first_fields[model["id"], deck_id, sort_field.strip()] += 1
+            tags = " ".join(note.get("tags") or [])
+            note_rows.append(
+                (
+                    note_id,
+                    guid64(self.rng),
+                    model["id"],
+                    now,
+                    -1,
+                    f" {tags} " if tags else "",
+                    FIELD_SEPARATOR.join(values),
+                    sort_field,
+                    field_checksum(values[0]),
+                    0,
+                    "",
+                )
+            )
+            due = self.conf.get("nextPos", 1)
+            self.conf["nextPos"] = due + 1
+            for template in model["tmpls"]:
+                card_rows.append(
+                    (
+                        self._new_id("cards"),
+                        note_id,
+                        deck_id,
+                        template["ord"],
+                        now,
+                        -1,
+                        0,
+                        0,
+                        due,
+                        0,
+                        0,
+                        0,
+                        0,
+                        0,
+                        0,
+                        0,
+                        0,
+                        "",
+                    )
+                )
+            note_ids.append(note_id)
+
+        with self.connection:
+            self.connection.executemany("INSERT INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", note_rows)
+            self.connection.executemany(
+                "INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", card_rows
+            )
+            self._save_col()
+        return note_ids
+
+    def _action_updateNoteFields(self, params: Dict[str, Any]) -> None:
+        update = params.get("note") or {}
+        row = self.connection.execute("SELECT mid, flds FROM notes WHERE id = ?", (update.get("id"),)).fetchone()
+        if row is None:
+            raise AnkiConnectError(f"note was not found: {update.get('id')}")
+
+        mid, flds = row
+        model = self.models[str(mid)]
+        values = dict(zip((field["name"] for field in model["flds"]), flds.split(FIELD_SEPARATOR)))
+        values.update(update.get("fields") or {})
+        ordered = [values.get(field["name"], "") for field in model["flds"]]
+        self._index_first_fields([update["id"]], -1)
+        with self.connection:
+            self.connection.execute(
+                "UPDATE notes SET flds = ?, sfld = ?, csum = ?, mod = ?, usn = -1 WHERE id = ?",
+                (
+                    FIELD_SEPARATOR.join(ordered),
+                    strip_html_preserving_media_filenames(ordered[0]),
+                    field_checksum(ordered[0]),
+                    int(time.time()),
+                    update["id"],
+                ),
+            )
+        self._index_first_fields([update["id"]])
+
+    def _action_deleteNotes(self, params: Dict[str, Any]) -> None:
+        note_ids = params.get("notes", [])
+        placeholders = ",".join("?" * len(note_ids))
+        self._index_first_fields(note_ids, -1)
+        with self.connection:
+            card_ids = [
+                card_id
+                for (card_id,) in self.connection.execute(
+                    f"SELECT id FROM cards WHERE nid IN ({placeholders})", note_ids
+                )
+            ]
+            self.connection.executemany("INSERT INTO graves VALUES (-1, ?, 0)", [(card_id,) for card_id in card_ids])
+            self.connection.executemany("INSERT INTO graves VALUES (-1, ?, 1)", [(note_id,) for note_id in note_ids])
+            self.connection.execute(f"DELETE FROM cards WHERE nid IN ({placeholders})", note_ids)
+            self.connection.execute(f"DELETE FROM notes WHERE id IN ({placeholders})", note_ids)
+
+    def _media_names(self) -> List[str]:
+        return sorted(os.listdir(self.media_dir)) if self.media_dir.is_dir() else []
+
+    def _action_storeMediaFile(self, params: Dict[str, Any]) -> str:
+        filename = os.path.basename(params.get("filename", ""))
+        if not filename or "data" not in params:
+            raise AnkiConnectError("storeMediaFile requires a filename and data")
+        self.media_dir.mkdir(exist_ok=True)
+        (self.media_dir / filename).write_bytes(base64.b64decode(params["data"]))
+        return filename  # type: ignore[no-any-return]
+
+    def _action_getMediaFilesNames(self, params: Dict[str, Any]) -> List[str]:
+        return fnmatch.filter(self._media_names(), params.get("pattern", "*"))
+
+    def _action_multi(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [self._dispatch(item.get("action", ""), item.get("params") or {}) for item in params.get("actions", [])]
@@ -1,20 +1,70 @@
 """Environment configuration module for WB_Anki."""
 
+import functools
 import os
+from typing import Any, Callable, Dict, Tuple
 
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+def _flag(value: str) -> bool:
+    return value.lower() == "true"
 
 
-class Config:
-    """Configuration class for WB_Anki."""
+# Environment variable, default value and type of each setting
+SETTINGS: Dict[str, Tuple[str, str, Callable[[str], Any]]] = {
+    "ANKI_URL": ("ANKI_URL", "http://localhost:8765", str),
+    "DEFAULT_DECK_NAME": ("DEFAULT_DECK_NAME", "WB_Anki", str),
+    "TIMEOUT": ("ANKI_TIMEOUT", "30.0", float),
+    "BATCH_SIZE": ("ANKI_BATCH_SIZE", "100", int),
+    "MAX_BATCH_SIZE": ("ANKI_MAX_BATCH_SIZE", "1000", int),
+    "CONCURRENCY": ("ANKI_CONCURRENCY", "1", int),
+    "RETRIES": ("ANKI_RETRIES", "3", int),
+    "TARGET_LATENCY": ("ANKI_TARGET_LATENCY", "2.0", float),
+    "CACHE_DIR": ("ANKI_CACHE_DIR", "", str),
+    "DECK_CACHE_TTL": ("ANKI_DECK_CACHE_TTL", "60.0", float),
+    "DEBUG": ("DEBUG", "false", _flag),
+}
 
-    ANKI_URL: str = os.getenv("ANKI_URL", "http://localhost:8765")
-    DEFAULT_DECK_NAME: str = os.getenv("DEFAULT_DECK_NAME", "WB_Anki")
-    TIMEOUT: float = float(os.getenv("ANKI_TIMEOUT", "30.0"))
-    DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
+
+@functools.lru_cache(maxsize=None)
+def load_environment() -> None:
+    """Load environment variables from the .env file, once."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+class _LazyConfig(type):
+    """Metaclass resolving each setting from the environment on first access."""
+
+    def __getattr__(cls, name: str) -> Any:
+        if name not in SETTINGS:
+            raise AttributeError(f"type object 'Config' has no attribute '{name}'")
+
+        load_environment()
+        variable, default, convert = SETTINGS[name]
+        value = convert(os.getenv(variable, default))
+        setattr(cls, name, value)
+        return value
+
+
+class Config(metaclass=_LazyConfig):
+    """Configuration class for WB_Anki.
+
+    Settings are read from the environment, after loading the .env file, the first
+    time they are used, so importing the package stays cheap.
+    """
+
+    ANKI_URL: str
+    DEFAULT_DECK_NAME: str
+    TIMEOUT: float
+    BATCH_SIZE: int
+    MAX_BATCH_SIZE: int
+    CONCURRENCY: int
+    RETRIES: int
+    TARGET_LATENCY: float
+    CACHE_DIR: str
+    DECK_CACHE_TTL: float
+    DEBUG: bool
 
     @classmethod
     def validate(cls) -> bool:
@@ -23,4 +73,12 @@ class Config:
             raise ValueError("ANKI_URL must be provided")
         if not cls.DEFAULT_DECK_NAME:
             raise ValueError("DEFAULT_DECK_NAME must be provided")
+        if cls.BATCH_SIZE < 1:
+            raise ValueError("ANKI_BATCH_SIZE must be a positive integer")
+        if cls.MAX_BATCH_SIZE < cls.BATCH_SIZE:
+            raise ValueError("ANKI_MAX_BATCH_SIZE must not be smaller than ANKI_BATCH_SIZE")
+        if cls.CONCURRENCY < 1:
+            raise ValueError("ANKI_CONCURRENCY must be a positive integer")
+        if cls.RETRIES < 0:
+            raise ValueError("ANKI_RETRIES must not be negative")
         return True
@@ -0,0 +1,96 @@
+"""Deduplication module collapsing repeated word pairs before they reach Anki."""
+
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# How to resolve pairs whose normalized fronts collide
+DEDUP_POLICIES = ("first", "last", "merge")
+
+# Separator between distinct backs combined by the merge policy
+MERGE_SEPARATOR = "; "
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a field value to NFC with collapsed whitespace."""
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+def normalize_front(text: str, casefold: bool = True) -> str:
+    """Normalize a Front value for duplicate comparison.
+
+    Applies normalize_text and, by default, casefolds, mirroring Anki's case-insensitive field search.
+    """
+    text = normalize_text(text)
+    return text.casefold() if casefold else text
+
+
+class PairDeduplicator:
+    """Normalize word pairs and collapse those sharing a front.
+
+    Fronts and backs are normalized to NFC with collapsed whitespace; fronts are compared
+    casefolded unless ``casefold`` is disabled. Colliding pairs are resolved by ``policy``:
+
+    - ``first`` keeps the first pair and streams pairs as they arrive
+    - ``last`` keeps the last back at the position of the first occurrence
+    - ``merge`` joins the distinct backs at the position of the first occurrence
+
+    ``last`` and ``merge`` need the whole input before yielding, so they hold one entry
+    per distinct front in memory.
+
+    Example:
+        >>> dedup = PairDeduplicator("merge")
+        >>> list(dedup.dedupe([("hello", "hej"), ("Hello", "hallå")]))
+        [("hello", "hej; hallå")]
+        >>> dedup.duplicates
+        1
+    """
+
+    def __init__(self, policy: str = "first", casefold: bool = True):
+        if policy not in DEDUP_POLICIES:
+            raise ValueError(f"Unknown duplicate policy '{policy}', expected one of {', '.join(DEDUP_POLICIES)}")
+        self.policy = policy
+        self.casefold = casefold
+        self.duplicates = 0
+
+    def dedupe(self, pairs: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+        """Yield the normalized pairs left after collapsing duplicates.
+
+        Args:
+            pairs: Iterable of (front, back) word pairs
+
+        Yields:
+            Normalized (front, back) word pairs with unique fronts, in order of first occurrence
+        """
+        if self.policy == "first":
+            yield from self._dedupe_first(pairs)
+            return
+
+        entries: Dict[str, Tuple[str, List[str]]] = {}
+        for front, back in pairs:
+            front, back = normalize_text(front), normalize_text(back)
+            key = normalize_front(front, self.casefold)
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = (front, [back])
+                continue
+
+            self.duplicates += 1
+            backs = entry[1]
+            if self.policy == "last":
+                backs[:] = [back]
+            elif back not in backs:
+                backs.append(back)
+
+        for front, backs in entries.values():
+            yield front, MERGE_SEPARATOR.join(backs)
+
+    def _dedupe_first(self, pairs: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+        seen = set()
+        for front, back in pairs:
+            front = normalize_text(front)
+            key = normalize_front(front, self.casefold)
+            if key in seen:
+                self.duplicates += 1
+                continue
+            seen.add(key)
+            yield front, normalize_text(back)
@@ -0,0 +1,296 @@
+"""In-process fake AnkiConnect server for tests and benchmarks."""
+
+import base64
+import fnmatch
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+QUERY_TERM_PATTERN = re.compile(r'(-?)(\w+):(?:"([^"]*)"|(\S+))')
+
+
+class FakeAnkiError(Exception):
+    """Error reported back to the client in the response's error field."""
+
+
+class FakeAnkiConnect:
+    """Minimal AnkiConnect implementation serving an in-memory collection over HTTP.
+
+    Supports the actions used by WB_Anki: deckNames, deckNamesAndIds, createDeck, findNotes, notesInfo,
+    addNote, addNotes, canAddNotes, updateNoteFields, deleteNotes, storeMediaFile, getMediaFilesNames
+    and multi. Latency, jitter and error injection make it possible to measure throughput without a
+    running Anki. ``latency`` delays requests in parallel, like the network; ``service_time`` is
+    spent on each request one at a time, like Anki's main thread.
+
+    Example:
+        >>> with FakeAnkiConnect(latency=0.005) as anki:
+        ...     client = AnkiConnectClient(anki.url)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        service_time: float = 0.0,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.service_time = service_time
+        self.decks: Dict[str, int] = {"Default": 1}
+        self.notes: Dict[int, Dict[str, Any]] = {}
+        # Notes per (note type, deck, first field), and per (note type, first field), for duplicate checks
+        self._first_fields: Counter = Counter()
+        self._model_first_fields: Counter = Counter()
+        self.media: Dict[str, bytes] = {}
+        self.request_counts: Counter = Counter()
+        self.action_counts: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_id = int(time.time() * 1000)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL the fake server listens on."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def __enter__(self) -> "FakeAnkiConnect":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="fake-anki", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self) -> type:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                body = json.dumps(fake.handle(request)).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def seed(self, deck_name: str, pairs: List[Tuple[str, str]]) -> None:
+        """Pre-populate a deck with bidirectional notes."""
+        with self._lock:
+            self._action_createDeck({"deck": deck_name})
+            for front, back in pairs:
+                note = {"deckName": deck_name, "modelName": "Basic (and reversed card)"}
+                self._store_note({**note, "fields": {"Front": front, "Back": back}})
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle one decoded AnkiConnect request and build its response."""
+        delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        action = request.get("action", "")
+
+        # AnkiConnect runs every request on Anki's main thread, one at a time
+        with self._lock:
+            if self.service_time:
+                time.sleep(self.service_time)
+            self.request_counts[action] += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                return {"result": None, "error": "injected error"}
+            return self._dispatch(action, request.get("params") or {})
+
+    def _dispatch(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.action_counts[action] += 1
+        handler: Optional[Callable[[Dict[str, Any]], Any]] = getattr(self, f"_action_{action}", None)
+        if handler is None:
+            return {"result": None, "error": "unsupported action"}
+
+        try:
+            return {"result": handler(params), "error": None}
+        except FakeAnkiError as e:
+            return {"result": None, "error": str(e)}
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def _in_deck(self, note: Dict[str, Any], deck_name: str) -> bool:
+        # A deck search matches the deck and its subdecks, and may use * wildcards such as "Swedish::*"
+        pattern = deck_name.replace("[", "[[]")
+        return fnmatch.fnmatchcase(note["deckName"], pattern) or fnmatch.fnmatchcase(note["deckName"], f"{pattern}::*")
+
+    def _matches(self, note: Dict[str, Any], query: str) -> bool:
+        for match in QUERY_TERM_PATTERN.finditer(query):
+            negated, key = match.group(1) == "-", match.group(2).lower()
+            value = match.group(3) if match.group(3) is not None else match.group(4)
+
+            if key == "deck":
+                matched = self._in_deck(note, value)
+            elif key == "edited":
+                matched = note["mod"] >= time.time() - int(value) * 86400
+            else:
+                fields = {name.lower(): field for name, field in note["fields"].items()}
+                matched = key in fields and fields[key].casefold() == value.casefold()
+            if matched == negated:
+                return False
+        return True
+
+    @staticmethod
+    def _first_field_key(note: Dict[str, Any]) -> Tuple[str, str, str]:
+        first_field = next(iter((note.get("fields") or {}).values()), "")
+        return note.get("modelName", "Basic"), note.get("deckName", ""), first_field.strip()
+
+    def _count_first_field(self, note: Dict[str, Any], delta: int) -> None:
+        model, deck, first = self._first_field_key(note)
+        self._first_fields[model, deck, first] += delta
+        self._model_first_fields[model, first] += delta
+
+    def _check_note(self, note: Dict[str, Any]) -> None:
+        if note.get("deckName") not in self.decks:
+            raise FakeAnkiError(f"deck was not found: {note.get('deckName')}")
+        model, deck, first = self._first_field_key(note)
+        if not first:
+            raise FakeAnkiError("cannot create note because it is empty")
+        # AnkiConnect checks the whole collection unless the note asks for duplicateScope "deck"
+        options = note.get("options") or {}
+        if options.get("duplicateScope") == "deck":
+            duplicate = self._first_fields[model, deck, first] > 0
+        else:
+            duplicate = self._model_first_fields[model, first] > 0
+        if duplicate and not options.get("allowDuplicate"):
+            raise FakeAnkiError("cannot create note because it is a duplicate")
+
+    def _store_note(self, note: Dict[str, Any]) -> int:
+        self._check_note(note)
+        self._count_first_field(note, 1)
+        note_id = self._new_id()
+        self.notes[note_id] = {
+            "noteId": note_id,
+            "deckName": note["deckName"],
+            "modelName": note.get("modelName", "Basic"),
+            "fields": dict(note["fields"]),
+            "tags": list(note.get("tags") or []),
+            "mod": int(time.time()),
+        }
+        return note_id
+
+    def _action_deckNames(self, params: Dict[str, Any]) -> List[str]:
+        return list(self.decks)
+
+    def _action_deckNamesAndIds(self, params: Dict[str, Any]) -> Dict[str, int]:
+        return dict(self.decks)
+
+    def _action_createDeck(self, params: Dict[str, Any]) -> int:
+        deck_name = params["deck"]
+        if deck_name not in self.decks:
+            self.decks[deck_name] = self._new_id()
+        return self.decks[deck_name]
+
+    def _action_findNotes(self, params: Dict[str, Any]) -> List[int]:
+        query = params.get("query", "")
+        return [note_id for note_id, note in self.notes.items() if self._matches(note, query)]
+
+    def _action_notesInfo(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        infos: List[Dict[str, Any]] = []
+        for note_id in params.get("notes", []):
+            note = self.notes.get(note_id)
+            if note is None:
+                infos.append({})
+                continue
+            infos.append(
+                {
+                    "noteId": note_id,
+                    "modelName": note["modelName"],
+                    "tags": note["tags"],
+                    "fields": {
+                        name: {"value": value, "order": order}
+                        for order, (name, value) in enumerate(note["fields"].items())
+                    },
+                    "mod": note["mod"],
+                }
+            )
+        return infos
+
+    def _action_addNote(self, params: Dict[str, Any]) -> int:
+        return self._store_note(params["note"])
+
+    def _action_addNotes(self, params: Dict[str, Any]) -> List[Optional[int]]:
+        note_ids: List[Optional[int]] = []
+        for note in params.get("notes", []):
+            try:
+                note_ids.append(self._store_note(note))
+            except FakeAnkiError:
+                note_ids.append(None)
+        return note_ids
+
+    def _action_updateNoteFields(self, params: Dict[str, Any]) -> None:
+        update = params.get("note") or {}
+        note = self.notes.get(int(update.get("id") or 0))
+        if note is None:
+            raise FakeAnkiError(f"note was not found: {update.get('id')}")
+
+        self._count_first_field(note, -1)
+        note["fields"].update(update.get("fields") or {})
+        note["mod"] = int(time.time())
+        self._count_first_field(note, 1)
+
+    def _action_deleteNotes(self, params: Dict[str, Any]) -> None:
+        for note_id in params.get("notes", []):
+            note = self.notes.pop(note_id, None)
+            if note is not None:
+                self._count_first_field(note, -1)
+
+    def _action_canAddNotes(self, params: Dict[str, Any]) -> List[bool]:
+        results = []
+        for note in params.get("notes", []):
+            try:
+                self._check_note(note)
+                results.append(True)
+            except FakeAnkiError:
+                results.append(False)
+        return results
+
+    def _action_storeMediaFile(self, params: Dict[str, Any]) -> str:
+        filename = params.get("filename", "")
+        if not filename or "data" not in params:
+            raise FakeAnkiError("storeMediaFile requires a filename and data")
+        self.media[filename] = base64.b64decode(params["data"])
+        return filename  # type: ignore[no-any-return]
+
+    def _action_getMediaFilesNames(self, params: Dict[str, Any]) -> List[str]:
+        return fnmatch.filter(self.media, params.get("pattern", "*"))
+
+    def _action_multi(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [self._dispatch(item.get("action", ""), item.get("params") or {}) for item in params.get("actions", [])]
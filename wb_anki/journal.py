@@ -0,0 +1,182 @@
+"""Checkpoint journal module for resuming interrupted imports."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, TextIO
+
+from .cache import default_cache_dir
+
+# Bump whenever the order or content of the parsed pair stream changes, so old journals are ignored
+JOURNAL_VERSION = 2
+
+# Seconds between fsyncs of buffered journal records
+FLUSH_INTERVAL = 1.0
+
+
+def hash_inputs(file_paths: Sequence[str], chunk_size: int = 1 << 20) -> str:
+    """Hash the contents of input files, in order."""
+    digest = hashlib.sha256()
+    for file_path in file_paths:
+        file_digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                file_digest.update(chunk)
+        digest.update(file_digest.digest())
+    return digest.hexdigest()
+
+
+def journal_key(deck_name: str, input_hash: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Get the journal name of an import of the given inputs into a deck.
+
+    ``options`` holds the import options that change which pairs are produced, or in
+    which order, such as the duplicate policy; an import run with other options
+    gets another journal instead of skipping pairs recorded for a different stream.
+    """
+    key = f"{JOURNAL_VERSION}\0{deck_name}\0{input_hash}\0{json.dumps(options or {}, sort_keys=True)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+class ImportJournal:
+    """Append-only record of the word pairs an import has committed to Anki.
+
+    Pairs are committed in input order; the journal keeps the length of the prefix
+    of the parsed pair stream that was added or found to exist. A failed pair ends
+    the prefix, so a resumed run retries it and everything after it.
+
+    Records are buffered and written with fsync at most every FLUSH_INTERVAL seconds.
+    Losing the last records in a crash only means re-checking a few batches on resume,
+    which duplicate detection makes safe.
+
+    Example:
+        >>> with ImportJournal.open("Swedish", ["words.txt"], resume=True) as journal:
+        ...     pairs = itertools.islice(pairs, journal.offset, None)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        deck_name: str,
+        input_hash: str,
+        resume: bool = False,
+        options: Optional[Dict[str, Any]] = None,
+    ):
+        self.path = path
+        self.deck_name = deck_name
+        self.input_hash = input_hash
+        self.options = options or {}
+        self.offset = 0
+        self.counts = {"added": 0, "exists": 0}
+        self.resumed_offset = 0
+        self._blocked = False
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+        if resume:
+            self._replay()
+            self.resumed_offset = self.offset
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: Optional[TextIO] = open(self.path, "a" if self.offset else "w", encoding="utf-8")
+        if not self.offset:
+            self._write({"version": JOURNAL_VERSION, "deck": deck_name, "inputs": input_hash, "options": self.options})
+
+    @classmethod
+    def open(
+        cls,
+        deck_name: str,
+        file_paths: Sequence[str],
+        resume: bool = False,
+        directory: Optional[Path] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> "ImportJournal":
+        """Open the journal of importing files into a deck.
+
+        Args:
+            deck_name: Name of the target deck
+            file_paths: Input files, in import order
+            resume: Continue the existing journal instead of starting over
+            directory: Journal directory. If None, uses the user cache directory.
+            options: Import options shaping the pair stream, see journal_key
+
+        Returns:
+            Journal positioned after the pairs committed by earlier runs when resuming
+        """
+        input_hash = hash_inputs(file_paths)
+        directory = directory or default_cache_dir() / "journals"
+        path = directory / f"{journal_key(deck_name, input_hash, options)}.jsonl"
+        return cls(path, deck_name, input_hash, resume, options)
+
+    def __enter__(self) -> "ImportJournal":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def _replay(self) -> None:
+        """Restore the committed prefix from an existing journal file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final write from a crash
+                break
+            if "offset" in record:
+                self.offset = record["offset"]
+                self.counts = {"added": record["added"], "exists": record["exists"]}
+
+    def commit(self, statuses: Iterable[str]) -> None:
+        """Record the outcome of the next pairs of the input, in order.
+
+        Args:
+            statuses: One of "added", "exists" or "error" per pair
+        """
+        if self._blocked:
+            return
+
+        before = self.offset
+        for status in statuses:
+            if status not in self.counts:
+                self._blocked = True
+                break
+            self.counts[status] += 1
+            self.offset += 1
+
+        if self.offset != before:
+            self._write({"offset": self.offset, **self.counts})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._buffer.append(json.dumps(record))
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records and fsync the journal."""
+        if self._file is None:
+            return
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush and close the journal."""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def finish(self) -> None:
+        """Close and delete the journal after an import completed without errors."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,143 @@
+"""Media module uploading the audio and image files referenced by word pairs."""
+
+import hashlib
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from rich.console import Console
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from .anki_client import AnkiConnectClient
+
+console = Console()
+
+# Anki's sound tags and HTML image tags, the two ways fields reference media files
+MEDIA_PATTERN = re.compile(r"(\[sound:)([^\]]+)(\])|(<img\b[^>]*?\bsrc=[\"'])([^\"']+)([\"'])", re.IGNORECASE)
+
+# Number of media files uploaded at the same time
+MEDIA_WORKERS = 4
+
+# Prefix of the names media files are stored under, followed by a hash of their content
+MEDIA_PREFIX = "wb_anki_"
+
+# Bytes read at a time while hashing a media file
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def media_references(text: str) -> List[str]:
+    """List the file names referenced by the sound and image tags of a field."""
+    return [match.group(2) or match.group(5) for match in MEDIA_PATTERN.finditer(text)]
+
+
+def hashed_name(path: str) -> str:
+    """Name a media file after the SHA-1 of its content, keeping its extension.
+
+    Identical files get the same name wherever they come from, so each is stored once.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return f"{MEDIA_PREFIX}{digest.hexdigest()[:20]}{os.path.splitext(path)[1].lower()}"
+
+
+class MediaUploader:
+    """Upload the local files referenced by word pairs and point the references at the stored files.
+
+    Every sound or image reference to a file under ``media_dir`` is replaced by the
+    content-hashed name the file is stored under. Uploads run in a bounded thread pool
+    while the notes are added; a file is uploaded at most once per run and not at all
+    when Anki already has it. References to files that do not exist locally, such as
+    URLs or media already in Anki, are left as they are, and so are references
+    resolving outside ``media_dir``, such as ``../`` paths or absolute paths, which
+    are never read.
+
+    Example:
+        >>> with MediaUploader(client, "audio/") as uploader:
+        ...     pairs = list(uploader.rewrite_pairs([("[sound:hej.mp3] hej", "hello")]))
+        >>> pairs
+        [("[sound:wb_anki_3f2a...mp3] hej", "hello")]
+    """
+
+    def __init__(self, client: "AnkiConnectClient", media_dir: str, workers: int = MEDIA_WORKERS):
+        self.client = client
+        self.media_dir = media_dir
+        self._root = os.path.realpath(media_dir)
+        self.names: Dict[str, Optional[str]] = {}
+        self.uploads: Dict[str, "Future[bool]"] = {}
+        self.stats = {"uploaded": 0, "skipped": 0, "missing": 0, "failed": 0}
+        self._existing: Optional[Set[str]] = None
+        self._lock = threading.Lock()
+
+        # Imported here, like the other thread and process pools, to keep CLI startup fast
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wb-anki-media")
+
+    def __enter__(self) -> "MediaUploader":
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        self.close()
+
+    def _existing_names(self) -> Set[str]:
+        """Fetch the names of the media files Anki already stores under a content hash, once."""
+        if self._existing is None:
+            try:
+                self._existing = set(self.client.get_media_file_names(f"{MEDIA_PREFIX}*"))
+            except Exception as e:
+                # Uploading a file Anki already has only overwrites it with the same content
+                console.print(f"[yellow]⚠️ Could not list the media files in Anki, uploading all: {e}[/yellow]")
+                self._existing = set()
+        return self._existing
+
+    def _resolve(self, reference: str) -> Optional[str]:
+        """Get the stored name of a referenced file, scheduling its upload the first time it is seen."""
+        path = os.path.realpath(os.path.join(self._root, reference))
+        if path in self.names:
+            return self.names[path]
+
+        inside = os.path.commonpath([self._root, path]) == self._root
+        if not inside:
+            console.print(f"[yellow]⚠️ Not uploading '{reference}': it is outside {self.media_dir}[/yellow]")
+        name = hashed_name(path) if inside and os.path.isfile(path) else None
+        self.names[path] = name
+        if name is None:
+            self.stats["missing"] += 1
+        elif name in self.uploads or name in self._existing_names():
+            self.stats["skipped"] += 1
+        else:
+            self.uploads[name] = self._executor.submit(self._upload, name, path)
+        return name
+
+    def _upload(self, name: str, path: str) -> bool:
+        stored = self.client.store_media_file(name, path)
+        with self._lock:
+            self.stats["uploaded" if stored else "failed"] += 1
+        return stored
+
+    def rewrite(self, text: str) -> str:
+        """Replace the media references of a field with the names their files are stored under."""
+        if "[sound:" not in text and "<img" not in text.lower():
+            return text
+
+        def replace(match: "re.Match[str]") -> str:
+            start, reference, end = match.group(1, 2, 3) if match.group(1) else match.group(4, 5, 6)
+            name = self._resolve(reference)
+            return f"{start}{name or reference}{end}"
+
+        return MEDIA_PATTERN.sub(replace, text)
+
+    def rewrite_pairs(self, word_pairs: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+        """Rewrite the media references of word pairs lazily, uploading their files in the background."""
+        for front, back in word_pairs:
+            yield self.rewrite(front), self.rewrite(back)
+
+    def close(self) -> Dict[str, int]:
+        """Wait for the pending uploads and return the counts of uploaded, skipped, missing and failed files."""
+        self._executor.shutdown(wait=True)
+        return self.stats
@@ -0,0 +1,164 @@
+"""Metrics module for timing AnkiConnect requests and processing phases."""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, TypeVar
+
+if TYPE_CHECKING:
+    import httpx
+
+T = TypeVar("T")
+
+# Action of the request currently being sent, read by the httpx event hooks
+_current_action: ContextVar[str] = ContextVar("wb_anki_action", default="unknown")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Get a nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class ActionStats:
+    """Counters and latencies of one AnkiConnect action."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latencies: List[float] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the action, with latencies in milliseconds."""
+        latencies = sorted(self.latencies)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_ms": {
+                "total": round(sum(latencies) * 1000, 3),
+                "p50": round(percentile(latencies, 0.50) * 1000, 3),
+                "p95": round(percentile(latencies, 0.95) * 1000, 3),
+                "max": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+            },
+        }
+
+
+class Metrics:
+    """Collector of per-action request statistics and phase timings.
+
+    Request counts and latencies are recorded by the clients around each request;
+    request and response sizes are recorded by httpx event hooks.
+    """
+
+    def __init__(self) -> None:
+        self.actions: Dict[str, ActionStats] = {}
+        self.phases: Dict[str, float] = {}
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _action(self, action: str) -> ActionStats:
+        stats = self.actions.get(action)
+        if stats is None:
+            stats = self.actions[action] = ActionStats()
+        return stats
+
+    @contextmanager
+    def track_request(self, action: str) -> Iterator[None]:
+        """Time one request of an action and count it, marking it as failed if the block raises."""
+        token = _current_action.set(action)
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_action.reset(token)
+            with self._lock:
+                stats = self._action(action)
+                stats.count += 1
+                stats.errors += failed
+                stats.latencies.append(elapsed)
+
+    def record_bytes(self, action: str, sent: int = 0, received: int = 0) -> None:
+        """Add request and response sizes to an action."""
+        with self._lock:
+            stats = self._action(action)
+            stats.bytes_sent += sent
+            stats.bytes_received += received
+
+    def _on_request(self, request: "httpx.Request") -> None:
+        self.record_bytes(_current_action.get(), sent=len(request.content))
+
+    def _on_response(self, response: "httpx.Response") -> None:
+        self.record_bytes(_current_action.get(), received=int(response.headers.get("content-length", 0)))
+
+    def event_hooks(self) -> Dict[str, List[Callable[..., Any]]]:
+        """Event hooks recording request and response sizes for an httpx.Client."""
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    def async_event_hooks(self) -> Dict[str, List[Callable[..., Any]]]:
+        """Event hooks recording request and response sizes for an httpx.AsyncClient."""
+
+        async def on_request(request: "httpx.Request") -> None:
+            self._on_request(request)
+
+        async def on_response(response: "httpx.Response") -> None:
+            self._on_response(response)
+
+        return {"request": [on_request], "response": [on_response]}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to a named phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def timed_iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Yield from an iterable, adding the time spent producing items to a named phase.
+
+        Used for lazily parsed input, whose work happens while the consumer iterates.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize all collected metrics."""
+        with self._lock:
+            actions = {action: stats.to_dict() for action, stats in sorted(self.actions.items())}
+            phases = {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()}
+
+        return {
+            "wall_time_ms": round((time.perf_counter() - self.started_at) * 1000, 3),
+            "requests": sum(stats["count"] for stats in actions.values()),
+            "phases_ms": phases,
+            "actions": actions,
+        }
+
+    def write_json(self, path: str) -> None:
+        """Write the metrics summary to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
@@ -1,15 +1,83 @@
 """Word parser module for parsing word pairs from text input."""
 
+import itertools
+import mmap
+import os
 import re
-from typing import List, Optional, Tuple
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import click
 from rich.console import Console
 
 console = Console()
 
+# Split by dashes or tabs
+# For dashes: require surrounding whitespace
+# For tabs: no surrounding whitespace required
+# This regex looks for:
+# - one or more dashes (-) or other dash-like characters (–, —) with surrounding whitespace
+# - or a tab character (\t) without surrounding whitespace
+DELIMITER_PATTERN = re.compile(r"\s+[-–—]+\s+|\t")
 
-def parse_word_pairs(lines: List[str]) -> List[Tuple[str, str]]:
+# Input formats: word pairs split by dashes or tabs, or the columns of a TSV or CSV file
+INPUT_FORMATS = ("pairs", "tsv", "csv")
+
+# Column delimiter of each tabular input format
+TABLE_DELIMITERS = {"tsv": "\t", "csv": ","}
+
+# Header names, compared case-insensitively, of the columns holding the front and back
+FRONT_HEADERS = ("front", "word")
+BACK_HEADERS = ("back", "translation")
+
+# Header names of the columns holding a note's space-separated tags and its deck
+TAGS_HEADER = "tags"
+DECK_HEADER = "deck"
+
+
+class ParseSummary:
+    """Counts of parsed and skipped lines, reported once instead of per line."""
+
+    MAX_EXAMPLES = 5
+
+    def __init__(self) -> None:
+        self.parsed = 0
+        self.invalid_format = 0
+        self.empty_field = 0
+        self.examples: List[Tuple[int, str]] = []
+
+    @property
+    def skipped(self) -> int:
+        """Total number of skipped non-blank lines."""
+        return self.invalid_format + self.empty_field
+
+    def skip(self, line_num: int, message: str, invalid_format: bool) -> None:
+        """Record a skipped line, keeping the first few as examples."""
+        if invalid_format:
+            self.invalid_format += 1
+        else:
+            self.empty_field += 1
+        if len(self.examples) < self.MAX_EXAMPLES:
+            self.examples.append((line_num, message))
+
+    def print(self) -> None:
+        """Print a warning summarizing the skipped lines, if any."""
+        if not self.skipped:
+            return
+
+        console.print(
+            f"[yellow]⚠️ Skipped {self.skipped} lines: {self.invalid_format} with invalid format, "
+            f"{self.empty_field} with empty word or translation[/yellow]"
+        )
+        for line_num, message in self.examples:
+            console.print(f"[yellow]   line {line_num}: {message}[/yellow]")
+        if self.skipped > len(self.examples):
+            console.print(f"[yellow]   ... and {self.skipped - len(self.examples)} more[/yellow]")
+
+
+def parse_word_pairs(lines: Iterable[str]) -> List[Tuple[str, str]]:
     """Parse word pairs from input lines.
 
     Args:
@@ -23,33 +91,240 @@ def parse_word_pairs(lines: List[str]) -> List[Tuple[str, str]]:
         >>> parse_word_pairs(lines)
         [("hello", "hej"), ("goodbye", "hej då")]
     """
-    word_pairs = []
+    return list(iter_word_pairs(lines))
+
+
+def iter_word_pairs(lines: Iterable[str], summary: Optional[ParseSummary] = None) -> Iterator[Tuple[str, str]]:
+    """Lazily parse word pairs from input lines.
+
+    Args:
+        lines: Iterable of input lines to parse
+        summary: Optional summary collecting skipped lines. If None, skipped lines
+            are summarized once the input is exhausted.
+
+    Yields:
+        Tuples containing (front, back) word pairs, as soon as their line is read
+    """
+    report = summary is None
+    if summary is None:
+        summary = ParseSummary()
+
+    split = DELIMITER_PATTERN.split
 
     for line_num, line in enumerate(lines, 1):
         line = line.strip()
         if not line:
             continue
 
-        # Split by dashes or tabs
-        # For dashes: require surrounding whitespace
-        # For tabs: no surrounding whitespace required
-        # This regex looks for:
-        # - one or more dashes (-) or other dash-like characters (–, —) with surrounding whitespace
-        # - or a tab character (\t) without surrounding whitespace
-        parts = re.split(r"\s+[-–—]+\s+|\t", line, maxsplit=1)
-        if len(parts) != 2:
-            console.print(f"[yellow]⚠️ Skipping line {line_num}: invalid format '{line}'[/yellow]")
-            continue
+        # Tab-only lines cannot contain a dash delimiter, so skip the regex
+        if "\t" in line and "-" not in line and "–" not in line and "—" not in line:
+            front, _, back = line.partition("\t")
+        else:
+            parts = split(line, maxsplit=1)
+            if len(parts) != 2:
+                summary.skip(line_num, f"invalid format '{line}'", invalid_format=True)
+                continue
+            front, back = parts
 
-        front = parts[0].strip()
-        back = parts[1].strip()
+        front = front.strip()
+        back = back.strip()
 
         if front and back:
-            word_pairs.append((front, back))
+            summary.parsed += 1
+            yield front, back
         else:
-            console.print(f"[yellow]⚠️ Skipping line {line_num}: empty word or translation[/yellow]")
+            summary.skip(line_num, "empty word or translation", invalid_format=False)
+
+    if report:
+        summary.print()
+
+
+def split_deck(line: str) -> Tuple[Optional[str], str]:
+    """Split a deck off the start of an input line.
+
+    A line may name its deck in a leading ``[Deck::Subdeck]`` prefix, or in a first
+    tab-separated column when it has three columns (deck, word, translation). A
+    prefix with a single colon, such as ``[sound:hej.mp3]``, is a media tag and
+    stays part of the line.
+
+    Args:
+        line: Input line
+
+    Returns:
+        Tuple of the deck name, or None if the line has none, and the rest of the line
+
+    Example:
+        >>> split_deck("[Swedish::Verbs] run - springa")
+        ("Swedish::Verbs", " run - springa")
+    """
+    stripped = line.lstrip()
+    if stripped.startswith("["):
+        end = stripped.find("]")
+        # Deck names separate subdecks with "::", while Anki's media tags start with a "sound:" scheme
+        if end > 1 and ":" not in stripped[1:end].replace("::", ""):
+            return stripped[1:end].strip() or None, stripped[end + 1 :]
+    elif line.count("\t") >= 2:
+        deck, rest = line.split("\t", 1)
+        return deck.strip() or None, rest
+    return None, line
+
+
+def iter_routed_pairs(
+    lines: Iterable[str], summary: Optional[ParseSummary] = None
+) -> Iterator[Tuple[Optional[str], str, str]]:
+    """Lazily parse word pairs that may each carry a deck, see split_deck.
+
+    Args:
+        lines: Iterable of input lines to parse
+        summary: Optional summary collecting skipped lines
+
+    Yields:
+        Tuples containing (deck, front, back), where deck is None for lines without one
+    """
+    current_deck: List[Optional[str]] = [None]
+
+    def strip_decks() -> Iterator[str]:
+        for line in lines:
+            current_deck[0], rest = split_deck(line)
+            yield rest
+
+    # iter_word_pairs reads one line at a time, so a pair always comes from the last line read
+    for front, back in iter_word_pairs(strip_decks(), summary):
+        yield current_deck[0], front, back
+
+
+class TableColumns:
+    """Positions of a note's fields in the rows of a TSV or CSV file.
+
+    Without a header row, columns are read as Anki exports notes in plain text:
+    front, back, and optionally the tags.
+    """
+
+    __slots__ = ("front", "back", "tags", "deck", "fields")
+
+    def __init__(
+        self,
+        front: int = 0,
+        back: int = 1,
+        tags: Optional[int] = 2,
+        deck: Optional[int] = None,
+        fields: Sequence[Tuple[int, str]] = (),
+    ):
+        self.front = front
+        self.back = back
+        self.tags = tags
+        self.deck = deck
+        self.fields = tuple(fields)
+
+    @classmethod
+    def from_header(cls, row: Sequence[str]) -> Optional["TableColumns"]:
+        """Map a header row to columns, or return None if the row has no front and back column.
+
+        Columns named after neither the front, back, tags nor deck become extra note
+        fields, under the name the header gives them.
+        """
+        names = [cell.strip().casefold() for cell in row]
+        front = next((i for i, name in enumerate(names) if name in FRONT_HEADERS), None)
+        back = next((i for i, name in enumerate(names) if name in BACK_HEADERS), None)
+        if front is None or back is None:
+            return None
+
+        tags = names.index(TAGS_HEADER) if TAGS_HEADER in names else None
+        deck = names.index(DECK_HEADER) if DECK_HEADER in names else None
+        special = {front, back, tags, deck}
+        fields = [(i, row[i].strip()) for i, name in enumerate(names) if name and i not in special]
+        return cls(front, back, tags, deck, fields)
+
+    @property
+    def width(self) -> int:
+        """Number of columns a row needs to hold its front and back."""
+        return max(self.front, self.back) + 1
+
+
+def iter_table_rows(
+    lines: Iterable[str], input_format: str, summary: Optional[ParseSummary] = None
+) -> Iterator[Tuple[Optional[str], str, str, Optional[Tuple[Dict[str, str], List[str]]]]]:
+    """Lazily parse the rows of a TSV or CSV file with the C-accelerated csv reader.
 
-    return word_pairs
+    Fields may be quoted, and quoted fields may hold delimiters and line breaks. A
+    first row naming a front and a back column (see FRONT_HEADERS and BACK_HEADERS)
+    is a header mapping columns to note fields, see TableColumns. Rows stream from
+    the reader one at a time, so memory stays flat for files of any length, and rows
+    holding nothing beyond the front and back skip the per-row field mapping. Skipped
+    rows are reported by row number, which matches the line number unless quoted
+    fields span lines.
+
+    Args:
+        lines: Iterable of input lines of one file
+        input_format: "tsv" or "csv"
+        summary: Optional summary collecting skipped rows. If None, skipped rows
+            are summarized once the input is exhausted.
+
+    Yields:
+        Tuples of (deck, front, back, extras), where deck is None for rows without one
+        and extras is None or the note's extra fields and tags
+
+    Raises:
+        click.Abort: If the input is not valid TSV or CSV
+
+    Example:
+        >>> list(iter_table_rows(['word,translation,tags', 'hello,"hej, hallå",greeting'], "csv"))
+        [(None, "hello", "hej, hallå", ({}, ["greeting"]))]
+    """
+    # Imported here so the pairs format does not pay for it at startup
+    import csv
+
+    report = summary is None
+    if summary is None:
+        summary = ParseSummary()
+
+    rows: Iterator[Tuple[int, List[str]]] = enumerate(csv.reader(lines, delimiter=TABLE_DELIMITERS[input_format]), 1)
+    row_num = 0
+    try:
+        columns = TableColumns()
+        for row_num, row in rows:
+            if any(row):
+                header = TableColumns.from_header(row)
+                if header is not None:
+                    columns = header
+                else:
+                    rows = itertools.chain([(row_num, row)], rows)
+                break
+
+        front_col, back_col, width = columns.front, columns.back, columns.width
+        tags_col, deck_col, extra_fields = columns.tags, columns.deck, columns.fields
+        # Rows ending before the first column beyond the front and back need no field mapping
+        extra_cols = [i for i in (tags_col, deck_col, *(i for i, _ in extra_fields)) if i is not None]
+        plain_width = min(extra_cols, default=None)
+
+        for row_num, row in rows:
+            if len(row) < width:
+                if any(row):
+                    summary.skip(row_num, f"invalid format, {len(row)} columns", invalid_format=True)
+                continue
+            front = row[front_col].strip()
+            back = row[back_col].strip()
+            if not (front and back):
+                summary.skip(row_num, "empty word or translation", invalid_format=False)
+                continue
+
+            summary.parsed += 1
+            if plain_width is None or len(row) <= plain_width:
+                yield None, front, back, None
+                continue
+
+            deck = None
+            if deck_col is not None and deck_col < len(row):
+                deck = row[deck_col].strip() or None
+            tags = row[tags_col].split() if tags_col is not None and tags_col < len(row) else []
+            fields = {name: row[i] for i, name in extra_fields if i < len(row) and row[i]}
+            yield deck, front, back, (fields, tags) if fields or tags else None
+    except csv.Error as e:
+        console.print(f"[red]❌ Invalid {input_format.upper()} input after row {row_num}: {e}[/red]")
+        raise click.Abort()
+
+    if report:
+        summary.print()
 
 
 def read_input(file_path: Optional[str] = None) -> List[str]:
@@ -76,3 +351,123 @@ def read_input(file_path: Optional[str] = None) -> List[str]:
             raise click.Abort()
     else:
         return click.get_text_stream("stdin").readlines()
+
+
+def iter_input(file_path: Optional[str] = None, use_mmap: bool = False, newline: Optional[str] = None) -> Iterator[str]:
+    """Lazily read input lines from file or stdin.
+
+    Args:
+        file_path: Optional path to input file. If None, reads from stdin.
+        use_mmap: Read the file through a memory map instead of buffered reads.
+            Lines keep their original line endings.
+        newline: Newline mode the file is opened with. TSV and CSV input needs ""
+            so line breaks inside quoted fields reach the csv reader unchanged.
+
+    Yields:
+        Lines from input, one at a time
+
+    Raises:
+        click.Abort: If file cannot be read
+    """
+    if not file_path:
+        # sys.stdin is the stream click's test runner and shell pipes provide; click's own
+        # get_text_stream is deprecated and untyped
+        for line in sys.stdin:
+            yield line
+        return
+
+    try:
+        if use_mmap:
+            yield from _iter_mmap(file_path)
+        else:
+            with open(file_path, "r", encoding="utf-8", newline=newline) as f:
+                yield from f
+    except FileNotFoundError:
+        console.print(f"[red]❌ File not found: {file_path}[/red]")
+        raise click.Abort()
+    except Exception as e:
+        console.print(f"[red]❌ Error reading file: {e}[/red]")
+        raise click.Abort()
+
+
+def _iter_mmap(file_path: str) -> Iterator[str]:
+    """Yield decoded lines of a file through a read-only memory map."""
+    with open(file_path, "rb") as f:
+        # Empty files cannot be memory mapped
+        if not f.seek(0, 2):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for raw_line in iter(mapped.readline, b""):
+                yield raw_line.decode("utf-8")
+
+
+def parse_file(file_path: str, use_mmap: bool = False) -> Tuple[List[Tuple[str, str]], ParseSummary]:
+    """Parse all word pairs of a file.
+
+    Args:
+        file_path: Path to the input file
+        use_mmap: Read the file through a memory map
+
+    Returns:
+        Tuple of the parsed (front, back) word pairs and the summary of skipped lines
+    """
+    summary = ParseSummary()
+    return list(iter_word_pairs(iter_input(file_path, use_mmap), summary)), summary
+
+
+def parse_files(
+    file_paths: Sequence[str], workers: Optional[int] = None, use_mmap: bool = False
+) -> Iterator[Tuple[str, List[Tuple[str, str]], ParseSummary]]:
+    """Parse files in a process pool, yielding results in input order.
+
+    At most twice as many files as there are workers are parsed ahead of the
+    consumer, so memory stays bounded for large corpora.
+
+    Args:
+        file_paths: Paths of the input files
+        workers: Number of worker processes. If None, uses the CPU count.
+        use_mmap: Read the files through a memory map
+
+    Yields:
+        Tuples of (file path, word pairs, summary of skipped lines)
+    """
+    # Imported here so single-file and piped imports do not pay for the process pool at startup
+    import multiprocessing
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    # Spawn workers: the pool may be started from the pipeline thread, where forking is unsafe
+    context = multiprocessing.get_context("spawn")
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        paths = iter(file_paths)
+        pending: Deque[Tuple[str, Future]] = deque(
+            (path, executor.submit(parse_file, path, use_mmap)) for path in itertools.islice(paths, window)
+        )
+
+        while pending:
+            path, future = pending.popleft()
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append((next_path, executor.submit(parse_file, next_path, use_mmap)))
+
+            pairs, summary = future.result()
+            yield path, pairs, summary
+
+
+def collect_input_files(files: Sequence[str], directory: Optional[str] = None, pattern: str = "*.txt") -> List[str]:
+    """Collect input file paths from explicit files and a directory glob.
+
+    Args:
+        files: Explicitly given file paths, kept in order
+        directory: Optional directory to search for input files
+        pattern: Glob pattern matched inside the directory (``**`` recurses)
+
+    Returns:
+        List of unique file paths, explicit files first, directory matches sorted
+    """
+    paths = list(files)
+    if directory:
+        paths.extend(str(path) for path in sorted(Path(directory).glob(pattern)) if path.is_file())
+    return list(dict.fromkeys(paths))
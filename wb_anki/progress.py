@@ -0,0 +1,150 @@
+"""Progress module rendering import progress from a background thread."""
+
+import threading
+import time
+from typing import Any, Optional
+
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    ProgressColumn,
+    SpinnerColumn,
+    Task,
+    TextColumn,
+    TimeRemainingColumn,
+)
+from rich.text import Text
+
+# Seconds between redraws of the live progress display
+REFRESH_INTERVAL = 0.1
+
+# Seconds between progress lines when output is not a terminal
+LOG_INTERVAL = 5.0
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as H:MM:SS or M:SS."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+class ThroughputColumn(ProgressColumn):
+    """Progress column showing processed pairs per second."""
+
+    def render(self, task: Task) -> Text:
+        """Render the task's current speed."""
+        speed = task.finished_speed or task.speed
+        return Text(f"{speed:,.0f} pairs/s" if speed else "- pairs/s", style="progress.data.speed")
+
+
+class ProgressReporter:
+    """Counter of processed pairs, rendered at a fixed rate instead of on every update.
+
+    ``advance`` only adds to a counter, so it is cheap enough for the processing loop.
+    A background thread renders the counter with throughput and ETA: as a live Rich
+    display on a terminal, or as a plain log line every LOG_INTERVAL seconds otherwise.
+    Updates must come from a single thread.
+
+    Example:
+        >>> with ProgressReporter("Processing word pairs...", total=len(pairs)) as progress:
+        ...     progress.advance(len(batch))
+    """
+
+    def __init__(
+        self,
+        description: str,
+        total: Optional[int] = None,
+        console: Optional[Console] = None,
+        live: Optional[bool] = None,
+        refresh_interval: float = REFRESH_INTERVAL,
+        log_interval: float = LOG_INTERVAL,
+    ):
+        self.description = description
+        self.total = total
+        self.console = console or Console()
+        self.live = self.console.is_terminal if live is None else live
+        self.refresh_interval = refresh_interval
+        self.log_interval = log_interval
+        self.completed = 0
+        self.started_at = 0.0
+        self._last_log = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._progress: Optional[Progress] = None
+        self._task: Any = None
+
+    def __enter__(self) -> "ProgressReporter":
+        self.started_at = self._last_log = time.perf_counter()
+        if self.live:
+            self._progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                ThroughputColumn(),
+                TimeRemainingColumn(),
+                console=self.console,
+                auto_refresh=False,
+            )
+            self._progress.start()
+            self._task = self._progress.add_task(self.description, total=self.total)
+
+        self._thread = threading.Thread(target=self._run, name="wb-anki-progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+        if self._progress:
+            self._render()
+            self._progress.stop()
+        else:
+            elapsed = time.perf_counter() - self.started_at
+            self.console.print(
+                f"Processed {self.completed:,} pairs in {format_duration(elapsed)} ({self.rate():,.0f} pairs/s)"
+            )
+
+    def advance(self, count: int = 1) -> None:
+        """Count processed pairs."""
+        self.completed += count
+
+    def rate(self) -> float:
+        """Average number of pairs processed per second so far."""
+        elapsed = time.perf_counter() - self.started_at
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until all pairs are processed, if the total is known."""
+        rate = self.rate()
+        if self.total is None or not rate:
+            return None
+        return max(0.0, (self.total - self.completed) / rate)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval if self.live else min(self.log_interval, 1.0)):
+            self._render()
+
+    def _render(self) -> None:
+        if self._progress:
+            self._progress.update(self._task, completed=self.completed)
+            self._progress.refresh()
+            return
+
+        now = time.perf_counter()
+        if now - self._last_log < self.log_interval:
+            return
+        self._last_log = now
+        self.console.print(self.log_line())
+
+    def log_line(self) -> str:
+        """Describe the progress in one plain line."""
+        done = f"{self.completed:,}/{self.total:,}" if self.total is not None else f"{self.completed:,}"
+        eta = self.eta()
+        remaining = f", ETA {format_duration(eta)}" if eta is not None else ""
+        return f"{self.description} {done} pairs ({self.rate():,.0f} pairs/s{remaining})"
@@ -0,0 +1,296 @@
+"""Proxy module serving AnkiConnect to many clients through coalesced upstream requests."""
+
+import json
+import queue
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .scheduler import is_idempotent
+
+# httpx and http.server are imported when the proxy starts, so the CLI can import this module cheaply
+if TYPE_CHECKING:
+    from .anki_client import AnkiConnectClient, PendingResult
+
+# Port the proxy listens on by default, next to AnkiConnect's 8765
+PROXY_PORT = 8766
+
+# Seconds the proxy waits for more requests after the first one before forwarding them
+COALESCE_WINDOW = 0.005
+
+# Maximum number of client requests forwarded in one upstream request
+MAX_COALESCED_REQUESTS = 500
+
+# Seconds a client request waits for its upstream response
+RESPONSE_TIMEOUT = 120.0
+
+
+class ProxyRequest:
+    """Client request waiting for its share of a coalesced upstream response."""
+
+    __slots__ = ("action", "params", "response", "_done")
+
+    def __init__(self, action: str, params: Dict[str, Any]):
+        self.action = action
+        self.params = params
+        self.response: Dict[str, Any] = {"result": None, "error": "no response from Anki"}
+        self._done = threading.Event()
+
+    def resolve(self, result: Any = None, error: Optional[str] = None) -> None:
+        """Set the response sent back to the client."""
+        self.response = {"result": result, "error": error}
+        self._done.set()
+
+    def wait(self, timeout: float = RESPONSE_TIMEOUT) -> Dict[str, Any]:
+        """Block until the response is set, or until ``timeout`` seconds have passed."""
+        if not self._done.wait(timeout):
+            return {"result": None, "error": "timed out waiting for Anki"}
+        return self.response
+
+
+class RequestCoalescer:
+    """Forward requests from many threads to AnkiConnect as a few batched requests.
+
+    A single worker thread talks to AnkiConnect, which handles one request at a time
+    anyway. Requests arriving within ``window`` seconds of each other, or while an
+    upstream request is in flight, are sent together: identical idempotent requests
+    such as the same findNotes query are sent once, and everything is wrapped in one
+    multi request. Each client then gets its own result back.
+
+    addNote requests are checked with one canAddNotes action in that request, and
+    the notes that can be added are sent as one addNotes action in a second one.
+    AnkiConnect fails a whole addNotes action when one of its notes is a duplicate,
+    so notes repeating the first field of an earlier note in the batch are sent as
+    separate addNote actions after it; one client's duplicate never fails another
+    client's note.
+
+    Example:
+        >>> with AnkiConnectClient("http://localhost:8765") as client:
+        ...     coalescer = RequestCoalescer(client)
+        ...     coalescer.submit("findNotes", {"query": 'deck:"Swedish"'})
+        {"result": [1496198395707], "error": None}
+    """
+
+    def __init__(
+        self,
+        client: "AnkiConnectClient",
+        window: float = COALESCE_WINDOW,
+        max_requests: int = MAX_COALESCED_REQUESTS,
+    ):
+        self.client = client
+        self.window = window
+        self.max_requests = max_requests
+        self.counts: Counter = Counter()
+        self._requests: "queue.Queue[Optional[ProxyRequest]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="wb-anki-coalescer", daemon=True)
+        self._thread.start()
+
+    def submit(self, action: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue a request and wait for its ``{"result", "error"}`` response."""
+        request = ProxyRequest(action, params or {})
+        self._requests.put(request)
+        return request.wait()
+
+    def close(self) -> None:
+        """Forward the requests still queued and stop the worker thread."""
+        self._requests.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._requests.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            stopping = False
+            while len(batch) < self.max_requests:
+                try:
+                    request = self._requests.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            self._forward(batch)
+            if stopping:
+                return
+
+    def _forward(self, batch: List[ProxyRequest]) -> None:
+        """Send one batch of client requests upstream and resolve each of them."""
+        from .anki_client import RequestBatch
+
+        self.counts["requests"] += len(batch)
+        self.counts["upstream_requests"] += 1
+
+        notes: List[ProxyRequest] = []
+        groups: List[Tuple["PendingResult", List[ProxyRequest]]] = []
+        shared: Dict[str, Tuple["PendingResult", List[ProxyRequest]]] = {}
+        upstream = RequestBatch(self.client)
+
+        for request in batch:
+            if request.action == "addNote":
+                if isinstance(request.params.get("note"), dict):
+                    notes.append(request)
+                else:
+                    request.resolve(error="invalid request: addNote requires a note")
+                continue
+            # Identical idempotent requests, such as polling the same query, are sent once
+            key = json.dumps([request.action, request.params], sort_keys=True)
+            if key in shared:
+                shared[key][1].append(request)
+                continue
+            group = (upstream.add(request.action, request.params), [request])
+            groups.append(group)
+            if is_idempotent(request.action, request.params):
+                shared[key] = group
+        checked = (
+            upstream.add("canAddNotes", {"notes": [request.params["note"] for request in notes]}) if notes else None
+        )
+
+        try:
+            upstream.flush()
+        except Exception as e:
+            for request in batch:
+                request.resolve(error=str(e))
+            return
+
+        for pending, requests in groups:
+            for request in requests:
+                if pending.error:
+                    request.resolve(error=pending.error)
+                else:
+                    request.resolve(pending.result())
+        if checked is not None:
+            self._add_notes(notes, checked)
+
+    def _add_notes(self, notes: List[ProxyRequest], checked: "PendingResult") -> None:
+        """Add the notes canAddNotes accepted, resolving every addNote request with its own outcome."""
+        from .anki_client import RequestBatch
+
+        if checked.error:
+            for request in notes:
+                request.resolve(error=checked.error)
+            return
+
+        can_add = checked.result() or []
+        batched: List[ProxyRequest] = []
+        repeated: List[ProxyRequest] = []
+        first_fields = set()
+        for index, request in enumerate(notes):
+            if not (index < len(can_add) and can_add[index]):
+                request.resolve(error="cannot create note because it is a duplicate or invalid")
+                continue
+            note = request.params["note"]
+            first_field = (note.get("modelName"), str(next(iter((note.get("fields") or {}).values()), "")).strip())
+            if first_field in first_fields:
+                repeated.append(request)
+            else:
+                first_fields.add(first_field)
+                batched.append(request)
+        if not batched:
+            return
+
+        self.counts["upstream_requests"] += 1
+        upstream = RequestBatch(self.client)
+        added = upstream.add("addNotes", {"notes": [request.params["note"] for request in batched]})
+        singles = [(upstream.add("addNote", request.params), request) for request in repeated]
+        try:
+            upstream.flush()
+        except Exception as e:
+            for request in batched + repeated:
+                request.resolve(error=str(e))
+            return
+
+        note_ids = [] if added.error else added.result() or []
+        for index, request in enumerate(batched):
+            note_id = note_ids[index] if index < len(note_ids) else None
+            if added.error:
+                request.resolve(error=added.error)
+            elif note_id is None:
+                request.resolve(error="cannot create note because it is a duplicate or invalid")
+            else:
+                request.resolve(note_id)
+        for pending, request in singles:
+            if pending.error:
+                request.resolve(error=pending.error)
+            else:
+                request.resolve(pending.result())
+
+
+class ProxyServer:
+    """HTTP server accepting AnkiConnect requests and answering them through a RequestCoalescer.
+
+    Responses always use the ``{"result", "error"}`` format of AnkiConnect version 6.
+
+    Example:
+        >>> with ProxyServer(coalescer, port=8766) as proxy:
+        ...     proxy.serve_forever()
+    """
+
+    def __init__(self, coalescer: RequestCoalescer, host: str = "127.0.0.1", port: int = PROXY_PORT):
+        from http.server import ThreadingHTTPServer
+
+        self.coalescer = coalescer
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """URL the proxy listens on."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def __enter__(self) -> "ProxyServer":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def serve_forever(self) -> None:
+        """Handle requests until shutdown is called from another thread."""
+        self._server.serve_forever(poll_interval=0.1)
+
+    def shutdown(self) -> None:
+        """Stop serve_forever."""
+        self._server.shutdown()
+
+    def close(self) -> None:
+        """Release the socket and forward the requests still queued."""
+        self._server.server_close()
+        self.coalescer.close()
+
+    def _handler_class(self) -> type:
+        from http.server import BaseHTTPRequestHandler
+
+        coalescer = self.coalescer
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections open between requests, as httpx clients expect, without
+            # delaying the body segment sent after the headers
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                    response = coalescer.submit(request.get("action", ""), request.get("params"))
+                except (ValueError, AttributeError) as e:
+                    response = {"result": None, "error": f"invalid request: {e}"}
+                body = json.dumps(response).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
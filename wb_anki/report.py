@@ -0,0 +1,178 @@
+"""Report module for streaming import results to the terminal or a file."""
+
+import csv
+import json
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from rich.console import Console
+
+console = Console()
+
+# Output modes of --report
+REPORT_MODES = ("table", "summary", "json", "csv", "none")
+
+# Maximum number of rows rendered by the table report
+TABLE_MAX_ROWS = 50
+
+STATUS_LABELS = {
+    "added": "[green]✅ Added[/green]",
+    "exists": "[blue]☑️ Exists[/blue]",
+    "updated": "[yellow]✏️ Updated[/yellow]",
+    "deleted": "[magenta]🗑️ Deleted[/magenta]",
+    "error": "[red]❌ Error[/red]",
+}
+
+
+class Report:
+    """Sink receiving result rows as they are produced, printing the summary when closed.
+
+    Subclasses render the rows; this base class only counts them.
+    """
+
+    def __init__(self) -> None:
+        self.stats = {status: 0 for status in STATUS_LABELS}
+
+    def record(self, front: str, back: str, status: str) -> None:
+        """Record the outcome of one word pair."""
+        self.stats[status] += 1
+
+    def close(self) -> None:
+        """Finish the report and print the summary."""
+        console.print("\n[bold green]Processing complete![/bold green]\n")
+        self.print_summary()
+
+    def print_summary(self) -> None:
+        """Print the counts of each status, including updated and deleted notes when there are any."""
+        changes = "".join(f", {self.stats[status]} {status}" for status in ("updated", "deleted") if self.stats[status])
+        console.print(
+            f"\n[bold]Summary:[/bold] {self.stats['added']} added, {self.stats['exists']} already existed, "
+            f"{self.stats['error']} failed{changes}"
+        )
+
+
+class TableReport(Report):
+    """Report rendered as a table of at most ``max_rows`` rows.
+
+    When there are more rows than fit, only pairs that were not added are shown, so
+    the table stays readable and rendering time stays bounded for large imports.
+    """
+
+    def __init__(self, max_rows: int = TABLE_MAX_ROWS):
+        super().__init__()
+        self.max_rows = max_rows
+        self.rows: List[Tuple[str, str, str]] = []
+        self.problem_rows: List[Tuple[str, str, str]] = []
+
+    def record(self, front: str, back: str, status: str) -> None:
+        """Record the outcome of one word pair, keeping only the rows that may be shown."""
+        super().record(front, back, status)
+        if len(self.rows) < self.max_rows:
+            self.rows.append((front, back, status))
+        if status != "added" and len(self.problem_rows) < self.max_rows:
+            self.problem_rows.append((front, back, status))
+
+    def close(self) -> None:
+        """Print the table and the summary."""
+        console.print("\n[bold green]Processing complete![/bold green]\n")
+
+        total = sum(self.stats.values())
+        rows = self.rows if total <= self.max_rows else self.problem_rows
+        if rows:
+            from rich.table import Table
+
+            table = Table(title="Processing Results" if rows is self.rows else "Pairs Not Added")
+            table.add_column("Word", style="cyan")
+            table.add_column("Translation", style="magenta")
+            table.add_column("Status", style="green")
+
+            for front, back, status in rows:
+                table.add_row(front, back, STATUS_LABELS[status])
+
+            console.print(table)
+
+        if len(rows) < total:
+            console.print(f"[dim]{total - len(rows)} more rows not shown, use --report json or csv for all[/dim]")
+
+        self.print_summary()
+
+
+class FileReport(Report):
+    """Report streamed to a file, row by row."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.file: TextIO = open(path, "w", encoding="utf-8", newline="")
+
+    def close(self) -> None:
+        """Close the file and print the summary."""
+        self.file.close()
+        super().close()
+        console.print(f"[blue]Results written to {self.path}[/blue]")
+
+
+class JsonReport(FileReport):
+    """Report streamed to a file as a JSON array of ``{"front", "back", "status"}`` objects."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.file.write("[")
+        self._separator = "\n"
+
+    def record(self, front: str, back: str, status: str) -> None:
+        """Append the outcome of one word pair to the array."""
+        super().record(front, back, status)
+        self.file.write(self._separator)
+        self.file.write(json.dumps({"front": front, "back": back, "status": status}, ensure_ascii=False))
+        self._separator = ",\n"
+
+    def close(self) -> None:
+        """Terminate the array, close the file and print the summary."""
+        self.file.write("\n]\n")
+        super().close()
+
+
+class CsvReport(FileReport):
+    """Report streamed to a CSV file with front, back and status columns."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["front", "back", "status"])
+
+    def record(self, front: str, back: str, status: str) -> None:
+        """Append the outcome of one word pair as a row."""
+        super().record(front, back, status)
+        self.writer.writerow([front, back, status])
+
+
+class SilentReport(Report):
+    """Report that only counts results and prints nothing."""
+
+    def close(self) -> None:
+        """Do nothing."""
+
+
+def create_report(mode: str, path: Optional[str] = None) -> Report:
+    """Create the report of a --report mode.
+
+    Args:
+        mode: One of REPORT_MODES
+        path: Output file, required by the json and csv modes
+
+    Returns:
+        Report receiving the results of an import
+
+    Raises:
+        ValueError: If the mode is unknown or a file mode has no path
+    """
+    if mode in ("json", "csv"):
+        if not path:
+            raise ValueError(f"--report {mode} requires --report-file")
+        return JsonReport(path) if mode == "json" else CsvReport(path)
+
+    reports: Dict[str, type] = {"table": TableReport, "summary": Report, "none": SilentReport}
+    if mode not in reports:
+        raise ValueError(f"Unknown report mode '{mode}', expected one of {', '.join(REPORT_MODES)}")
+    report: Report = reports[mode]()
+    return report
@@ -0,0 +1,81 @@
+"""Results module keeping the outcome of every pair of an import in compact arrays."""
+
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Statuses a pair can end up with, stored as their index in this tuple
+STATUSES = ("added", "exists", "error", "updated", "deleted")
+
+# Statuses of a plain import, the keys of its stats
+IMPORT_STATUSES = STATUSES[:3]
+
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+class ResultStore:
+    """Outcome of each pair of an import, in input order, at a few bytes per pair.
+
+    The front and back of pair ``i`` are references at ``2 * i`` and ``2 * i + 1`` in a
+    single string table, sharing the strings the parser produced, and statuses are one
+    byte each in an array of codes into STATUSES. A list of ``(front, back, status)``
+    tuples costs about 72 bytes per pair on top of the strings; this store costs about 18.
+    Iterating yields such tuples, built on the fly.
+
+    Example:
+        >>> results = ResultStore()
+        >>> index = results.append("hello", "hej", "error")
+        >>> results.set_status(index, "added")
+        >>> list(results), results.stats()
+        ([("hello", "hej", "added")], {"added": 1, "exists": 0, "error": 0})
+    """
+
+    __slots__ = ("strings", "statuses")
+
+    def __init__(self, rows: Optional[Iterable[Tuple[str, str, str]]] = None):
+        self.strings: List[str] = []
+        self.statuses = array("B")
+        for front, back, status in rows or ():
+            self.append(front, back, status)
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, str]]:
+        return self.rows()
+
+    def append(self, front: str, back: str, status: str) -> int:
+        """Record the outcome of the next pair and return its index."""
+        self.strings.append(front)
+        self.strings.append(back)
+        self.statuses.append(STATUS_CODES[status])
+        return len(self.statuses) - 1
+
+    def set_status(self, index: int, status: str) -> None:
+        """Change the outcome of a recorded pair."""
+        self.statuses[index] = STATUS_CODES[status]
+
+    def pair(self, index: int) -> Tuple[str, str]:
+        """Get the (front, back) pair recorded at an index."""
+        return self.strings[2 * index], self.strings[2 * index + 1]
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[str, str, str]]:
+        """Yield the ``(front, back, status)`` rows of a range of pairs."""
+        strings = self.strings
+        for index in range(start, len(self) if stop is None else stop):
+            yield strings[2 * index], strings[2 * index + 1], STATUSES[self.statuses[index]]
+
+    def status_names(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """Yield the statuses of a range of pairs."""
+        return (STATUSES[code] for code in self.statuses[start:stop])
+
+    def stats(self, statuses: Iterable[str] = IMPORT_STATUSES) -> Dict[str, int]:
+        """Count the pairs of each of the given statuses."""
+        return {status: self.statuses.count(STATUS_CODES[status]) for status in statuses}
+
+    def nbytes(self, include_strings: bool = False) -> int:
+        """Measure the memory used by the store, optionally including the strings it references."""
+        size = sys.getsizeof(self.strings) + sys.getsizeof(self.statuses)
+        if include_strings:
+            size += sum(sys.getsizeof(text) for text in self.strings)
+        return size
@@ -0,0 +1,118 @@
+"""Request scheduling module: retries with backoff and AIMD-adapted batch size and concurrency."""
+
+import random
+import threading
+from typing import Any, Dict, Optional
+
+from .config import Config
+
+# Actions that can be repeated without changing the outcome
+IDEMPOTENT_ACTIONS = frozenset(
+    {
+        "canAddNotes",
+        "createDeck",
+        "deckNames",
+        "deckNamesAndIds",
+        "deleteNotes",
+        "findNotes",
+        "getMediaFilesNames",
+        "notesInfo",
+        "notesModTime",
+        "storeMediaFile",
+        "updateNoteFields",
+        "version",
+    }
+)
+
+
+def is_idempotent(action: str, params: Optional[Dict[str, Any]] = None) -> bool:
+    """Check whether a request can safely be retried.
+
+    A multi request is idempotent when every action it contains is.
+    """
+    if action == "multi":
+        return all(is_idempotent(item.get("action", "")) for item in (params or {}).get("actions", []))
+    return action in IDEMPOTENT_ACTIONS
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient request failures."""
+
+    def __init__(
+        self,
+        attempts: Optional[int] = None,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        seed: Optional[int] = None,
+    ):
+        self.attempts = attempts if attempts is not None else Config.RETRIES + 1
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._random = random.Random(seed)
+
+    def delay(self, attempt: int) -> float:
+        """Get the pause before retrying after the given zero-based failed attempt."""
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class AIMDController:
+    """Additive-increase/multiplicative-decrease controller for a bounded integer.
+
+    The value grows by ``step`` after each fast success and is halved after a failure
+    or a response slower than ``target_latency``, converging on the highest value the
+    server sustains. Updates are thread-safe.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: Optional[int] = None,
+        step: int = 1,
+        target_latency: Optional[float] = None,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum if maximum is not None else initial
+        self.value = max(minimum, min(initial, self.maximum))
+        self.step = step
+        self.target_latency = target_latency if target_latency is not None else Config.TARGET_LATENCY
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fixed(cls, value: int) -> "AIMDController":
+        """Create a controller whose value never changes."""
+        return cls(value, minimum=value, maximum=value)
+
+    def record(self, latency: float, failed: bool = False) -> int:
+        """Adapt the value to the outcome of one request and return the new value."""
+        with self._lock:
+            if failed or latency > self.target_latency:
+                self.value = max(self.minimum, self.value // 2)
+            else:
+                self.value = min(self.maximum, self.value + self.step)
+            return self.value
+
+
+class AdaptiveLimiter:
+    """Asyncio concurrency limit that follows an AIMD controller."""
+
+    def __init__(self, controller: AIMDController):
+        # Imported here so the synchronous CLI path does not pay for asyncio at startup
+        import asyncio
+
+        self.controller = controller
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait until fewer requests than the current limit are in flight."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.controller.value)
+            self.in_flight += 1
+
+    async def release(self, latency: float, failed: bool = False) -> None:
+        """Release a slot and adapt the limit to the request's outcome."""
+        async with self._condition:
+            self.in_flight -= 1
+            self.controller.record(latency, failed)
+            self._condition.notify_all()
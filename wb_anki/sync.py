@@ -0,0 +1,122 @@
+"""Sync module bringing a deck in line with an input file through batched changes."""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from .dedup import normalize_front, normalize_text
+
+if TYPE_CHECKING:
+    from .anki_client import AnkiConnectClient
+    from .report import Report
+
+
+class SyncPlan:
+    """Three-way difference between the input pairs and the notes of a deck.
+
+    Attributes:
+        new: (front, back) pairs whose front is not in the deck
+        changed: (note ID, front, old back, new back) of notes whose Back differs from the input
+        missing: (note ID, front, back) of notes whose front is not in the input
+        unchanged: (front, back) pairs already in the deck as they are
+    """
+
+    def __init__(self) -> None:
+        self.new: List[Tuple[str, str]] = []
+        self.changed: List[Tuple[int, str, str, str]] = []
+        self.missing: List[Tuple[int, str, str]] = []
+        self.unchanged: List[Tuple[str, str]] = []
+
+    def describe(self) -> str:
+        """Summarize the plan in one line."""
+        return (
+            f"{len(self.new)} new, {len(self.changed)} changed, {len(self.unchanged)} unchanged, "
+            f"{len(self.missing)} missing from the input"
+        )
+
+
+def diff_deck(
+    word_pairs: Iterable[Tuple[str, str]], deck_notes: List[Tuple[int, str, str]], casefold: bool = True
+) -> SyncPlan:
+    """Compare word pairs with the notes of a deck.
+
+    Fronts are matched after normalization, casefolded unless disabled; backs are
+    compared after normalize_text. When several notes share a front, the first one
+    is matched and the others are left alone.
+
+    Args:
+        word_pairs: Deduplicated (front, back) pairs of the input
+        deck_notes: (note ID, front, back) of every note in the deck
+        casefold: Match fronts case-insensitively
+
+    Returns:
+        SyncPlan listing the notes to add, update and, optionally, delete
+    """
+    notes: Dict[str, Tuple[int, str, str]] = {}
+    for note_id, front, back in deck_notes:
+        notes.setdefault(normalize_front(front, casefold), (note_id, front, back))
+
+    plan = SyncPlan()
+    seen = set()
+    for front, back in word_pairs:
+        key = normalize_front(front, casefold)
+        seen.add(key)
+        note = notes.get(key)
+        if note is None:
+            plan.new.append((front, back))
+        elif normalize_text(back) != note[2]:
+            plan.changed.append((note[0], front, note[2], back))
+        else:
+            plan.unchanged.append((front, back))
+
+    plan.missing = [note for key, note in notes.items() if key not in seen]
+    return plan
+
+
+def apply_sync(
+    client: "AnkiConnectClient",
+    deck_name: str,
+    plan: SyncPlan,
+    batch_size: Optional[int] = None,
+    prune: bool = False,
+    report: Optional["Report"] = None,
+) -> Dict[str, int]:
+    """Apply a sync plan with batched addNotes, updateNoteFields and deleteNotes requests.
+
+    The number of requests depends on the number of changes, not on the size of the deck.
+    Notes missing from the input are only deleted with ``prune``.
+
+    Args:
+        client: AnkiConnect client
+        deck_name: Deck being synced
+        plan: Changes computed by diff_deck
+        batch_size: Number of notes added or updated per request
+        prune: Delete notes missing from the input
+        report: Report receiving one row per pair and deleted note
+
+    Returns:
+        Counts of each status
+    """
+    stats = {"added": 0, "exists": 0, "updated": 0, "deleted": 0, "error": 0}
+
+    def record(front: str, back: str, status: str) -> None:
+        stats[status] += 1
+        if report:
+            report.record(front, back, status)
+
+    for front, back in plan.unchanged:
+        record(front, back, "exists")
+
+    added = client.add_notes(deck_name, plan.new, batch_size) if plan.new else []
+    for (front, back), ok in zip(plan.new, added):
+        record(front, back, "added" if ok else "error")
+
+    updates = [(note_id, back) for note_id, _, _, back in plan.changed]
+    updated = client.update_backs(updates, batch_size) if updates else []
+    for (_, front, _, back), ok in zip(plan.changed, updated):
+        record(front, back, "updated" if ok else "error")
+
+    if prune and plan.missing:
+        deleted = client.delete_notes([note_id for note_id, _, _ in plan.missing])
+        for _, front, back in plan.missing:
+            record(front, back, "deleted" if deleted else "error")
+
+    return stats
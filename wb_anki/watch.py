@@ -0,0 +1,166 @@
+"""Watch module feeding lines dropped into an inbox to a long-running import."""
+
+import os
+import queue
+import stat
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+from .parser import collect_input_files
+
+# Seconds without new lines after which pending lines are imported
+DEBOUNCE_SECONDS = 2.0
+
+# Seconds between checks of the inbox for new lines
+POLL_INTERVAL = 0.5
+
+# Number of pending lines imported right away, without waiting for the debounce
+MAX_PENDING_LINES = 1000
+
+
+class InboxTail:
+    """Follow the files of an inbox directory, returning lines appended since the last read.
+
+    Only complete lines are returned; a trailing line without a newline waits for the
+    rest of it. A file that shrinks is assumed to have been truncated or replaced and
+    is read again from the start.
+
+    Example:
+        >>> inbox = InboxTail("inbox/")
+        >>> inbox.read()
+        ["hello - hej\\n"]
+    """
+
+    def __init__(self, directory: str, pattern: str = "*.txt"):
+        self.directory = directory
+        self.pattern = pattern
+        self.offsets: Dict[str, int] = {}
+        self.partial: Dict[str, bytes] = {}
+
+    def read(self) -> List[str]:
+        """Read the lines appended to the inbox files, in file name order."""
+        paths = collect_input_files((), self.directory, self.pattern)
+        for path in set(self.offsets) - set(paths):
+            del self.offsets[path]
+            self.partial.pop(path, None)
+
+        lines: List[str] = []
+        for path in paths:
+            lines.extend(self._read_file(path))
+        return lines
+
+    def _read_file(self, path: str) -> List[str]:
+        try:
+            size = os.path.getsize(path)
+            offset = self.offsets.get(path, 0)
+            if size < offset:
+                offset = 0
+                self.partial.pop(path, None)
+            if size == offset:
+                return []
+
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except OSError:
+            return []
+
+        self.offsets[path] = offset + len(data)
+        complete, newline, rest = (self.partial.pop(path, b"") + data).rpartition(b"\n")
+        if rest:
+            self.partial[path] = rest
+        if not newline:
+            return []
+        return (complete + newline).decode("utf-8", errors="replace").splitlines(keepends=True)
+
+
+class PipeReader:
+    """Read lines written to a named pipe from a background thread.
+
+    The pipe is reopened whenever its writer closes it, so any number of writers may
+    come and go while the reader runs.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lines: "queue.Queue[str]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="wb-anki-pipe", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                with open(self.path, "r", encoding="utf-8", errors="replace") as pipe:
+                    for line in pipe:
+                        self.lines.put(line)
+            except OSError:
+                time.sleep(POLL_INTERVAL)
+
+    def read(self) -> List[str]:
+        """Return the lines received since the last read."""
+        lines = []
+        while True:
+            try:
+                lines.append(self.lines.get_nowait())
+            except queue.Empty:
+                return lines
+
+
+def open_inbox(path: str, pattern: str = "*.txt") -> Union[InboxTail, PipeReader]:
+    """Open a directory or named pipe as a source of new input lines."""
+    if stat.S_ISFIFO(os.stat(path).st_mode):
+        return PipeReader(path)
+    return InboxTail(path, pattern)
+
+
+def watch_inbox(
+    inbox: Union[InboxTail, PipeReader],
+    handle: Callable[[List[str]], List[str]],
+    debounce: float = DEBOUNCE_SECONDS,
+    poll_interval: float = POLL_INTERVAL,
+    max_pending: int = MAX_PENDING_LINES,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Pass lines arriving in an inbox to ``handle`` in debounced batches.
+
+    Lines are collected until ``debounce`` seconds pass without new ones, or until
+    ``max_pending`` new lines are waiting, so a burst of writes becomes a single import.
+    Lines ``handle`` keeps wait for the next pause and do not count towards ``max_pending``.
+    Runs until ``stop`` is set or the process is interrupted; lines still pending
+    are handled before returning.
+
+    Args:
+        inbox: Source of new lines, see open_inbox
+        handle: Callback importing one batch of lines, returning the lines to keep
+            pending until the next pause
+        debounce: Seconds of quiet after which pending lines are handled
+        poll_interval: Seconds between reads of the inbox
+        max_pending: Number of pending lines handled without waiting for quiet
+        stop: Event ending the watch when set
+    """
+    stop = stop or threading.Event()
+    pending: List[str] = []
+    kept = 0
+    last_line = 0.0
+
+    try:
+        while True:
+            lines = inbox.read()
+            now = time.monotonic()
+            if lines:
+                pending.extend(lines)
+                last_line = now
+
+            stopping = stop.is_set()
+            if pending and (stopping or len(pending) - kept >= max_pending or now - last_line >= debounce):
+                pending = handle(pending)
+                kept = len(pending)
+                if pending:
+                    last_line = now
+            if stopping:
+                return
+            stop.wait(poll_interval)
+    except KeyboardInterrupt:
+        if pending:
+            handle(pending)